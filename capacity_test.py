@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Maximum Sustainable Throughput Search
+Steps up and then binary-searches offered load to find the highest RPS that holds a latency SLO
+"""
+
+import argparse
+import json
+
+from load_test import BASE_URL, DEFAULT_USERS, SCENARIOS, LoadTester
+
+# Configuration
+DEFAULT_SLO_P99_MS = 300.0
+DEFAULT_MAX_ERROR_RATE = 0.001
+DEFAULT_HOLD = 30.0
+DEFAULT_SETTLE = 5.0
+DEFAULT_START_RATE = 5.0
+DEFAULT_MAX_RATE = 5000.0
+MIN_RATE = 0.1
+DEFAULT_PRECISION = 0.05
+DEFAULT_CONCURRENCY = 200
+MIN_ACHIEVED_RATIO = 0.95
+DEFAULT_OUTPUT = "capacity.json"
+
+
+class CapacitySearch:
+    def __init__(self, tester, concurrency=DEFAULT_CONCURRENCY, slo_p99_ms=DEFAULT_SLO_P99_MS,
+                 max_error_rate=DEFAULT_MAX_ERROR_RATE, hold=DEFAULT_HOLD, settle=DEFAULT_SETTLE):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.slo_p99_ms = slo_p99_ms
+        self.max_error_rate = max_error_rate
+        self.hold = hold
+        self.settle = settle
+
+    def measure(self, scenario, rate):
+        """Hold one offered load level and judge it against the SLO"""
+        self.tester.reset_records()
+        start = self.tester.clock()
+        started = self.tester.run_load(scenario, self.settle + self.hold, self.concurrency, rate=rate)
+
+        # Only requests issued after the settle period count towards the level
+        measured_from = start + self.settle
+        records = self.tester.records.select(since=measured_from)
+        iterations = rate * self.hold
+        stats = records.summary()
+
+        level = {
+            "offered_rate": rate,
+            "rps": stats["rps"],
+            "requests_per_iteration": stats["count"] / iterations if iterations else 0.0,
+            "p50_ms": stats["p50_ms"],
+            "p99_ms": stats["p99_ms"],
+            "error_rate": stats["error_rate"] if records else 1.0
+        }
+        # Paced loops fall behind their schedule once the server stops keeping up
+        level["keeps_up"] = started >= rate * (self.settle + self.hold) * MIN_ACHIEVED_RATIO
+        level["passed"] = (bool(records) and level["keeps_up"]
+                           and level["p99_ms"] < self.slo_p99_ms
+                           and level["error_rate"] < self.max_error_rate)
+
+        status = "✅" if level["passed"] else "❌"
+        lagging = "" if level["keeps_up"] else " (fell behind offered load)"
+        print(f"   {status} {rate:.1f} it/s → {level['rps']:.1f} req/s, p99 {level['p99_ms']:.1f} ms, "
+              f"errors {level['error_rate'] * 100:.3f}%{lagging}")
+        return level
+
+    def search(self, scenario, start_rate=DEFAULT_START_RATE, max_rate=DEFAULT_MAX_RATE, precision=DEFAULT_PRECISION):
+        """Double the offered load until the SLO breaks (or halve it until one level holds), then binary-search the boundary"""
+        print(f"\n🎯 Capacity search for '{scenario}' (p99 < {self.slo_p99_ms:.0f} ms, "
+              f"errors < {self.max_error_rate * 100:.2f}%)")
+        levels = []
+        best = None
+        low, high = 0.0, None
+
+        rate = start_rate
+        while rate <= max_rate:
+            level = self.measure(scenario, rate)
+            levels.append(level)
+            if not level["passed"]:
+                high = rate
+                break
+            best, low = level, rate
+            rate *= 2
+
+        # The starting level already broke the SLO: step down until a level holds, keeping the last failure as the bound
+        rate = start_rate / 2
+        while best is None and rate >= MIN_RATE:
+            level = self.measure(scenario, rate)
+            levels.append(level)
+            if level["passed"]:
+                best, low = level, rate
+            else:
+                high = rate
+                rate /= 2
+
+        while high is not None and low and (high - low) / low > precision:
+            rate = (low + high) / 2
+            level = self.measure(scenario, rate)
+            levels.append(level)
+            if level["passed"]:
+                best, low = level, rate
+            else:
+                high = rate
+
+        return {
+            "scenario": scenario,
+            "slo_p99_ms": self.slo_p99_ms,
+            "max_error_rate": self.max_error_rate,
+            "max_sustainable_rps": best["rps"] if best else 0.0,
+            "max_sustainable_rate": best["offered_rate"] if best else 0.0,
+            "at_max": best,
+            "capped_by_max_rate": high is None,
+            "levels": levels
+        }
+
+
+def print_summary(results):
+    """Print capacity per scenario"""
+    print("\n" + "=" * 70)
+    print("📊 CAPACITY SUMMARY")
+    print("=" * 70)
+    print(f"{'Scenario':<16} {'Max RPS':>10} {'it/s':>8} {'p99 ms':>8} {'Errors':>8}")
+    for result in results:
+        best = result["at_max"] or {}
+        capped = " (max rate reached)" if result["capped_by_max_rate"] else ""
+        print(f"{result['scenario']:<16} {result['max_sustainable_rps']:>10.1f} {result['max_sustainable_rate']:>8.1f} "
+              f"{best.get('p99_ms', 0):>8.1f} {best.get('error_rate', 0) * 100:>7.3f}%{capped}")
+    print("\n🎯 CAPACITY SEARCH COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the maximum sustainable throughput under a latency SLO")
+    parser.add_argument("--scenarios", default="mixed", help=f"comma-separated from {', '.join(SCENARIOS)}")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--slo-p99-ms", type=float, default=DEFAULT_SLO_P99_MS)
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    parser.add_argument("--hold", type=float, default=DEFAULT_HOLD, help="measured seconds per load level")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE, help="unmeasured seconds before each level")
+    parser.add_argument("--start-rate", type=float, default=DEFAULT_START_RATE, help="initial scenario iterations/s")
+    parser.add_argument("--max-rate", type=float, default=DEFAULT_MAX_RATE)
+    parser.add_argument("--precision", type=float, default=DEFAULT_PRECISION)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+    unknown = [scenario for scenario in scenarios if scenario not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Capacity Search")
+    print("=" * 70)
+
+    print("\n📋 Setting up virtual users...")
+    if not tester.setup_users(args.users):
+        print("❌ No virtual users available, aborting capacity search")
+        return
+
+    search = CapacitySearch(tester, args.concurrency, args.slo_p99_ms, args.max_error_rate, args.hold, args.settle)
+    results = [search.search(scenario, args.start_rate, args.max_rate, args.precision) for scenario in scenarios]
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Capacity results written to {args.output}")
+    print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
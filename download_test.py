@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Media Download Throughput Benchmark
+Fetches media produced by story and message uploads from /uploads with full, Range and conditional requests
+"""
+
+import argparse
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from metrics_store import nearest_rank
+from media_upload_test import MediaUploadTester
+from run_manifest import RunManifest
+from seed_data import DEFAULT_SEED
+
+# Configuration
+DEFAULT_STORIES = 20
+DEFAULT_MESSAGES = 20
+DEFAULT_ROUNDS = 5
+DEFAULT_CONCURRENCY = 32
+DEFAULT_PAIRS = 4
+RANGE_BYTES = 256 * 1024
+READ_CHUNK = 64 * 1024
+MODES = ["full", "range", "conditional"]
+
+
+class DownloadTester:
+    def __init__(self, tester, seed=DEFAULT_SEED, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.rng = random.Random(f"{seed}:downloads")
+        # Static media is served outside the API prefix
+        self.media_root = tester.base_url.rsplit("/api", 1)[0]
+        self.urls = []
+        self.validators = {}
+        self.sizes = {}
+        self.headers_seen = {}
+        self.results = {}
+
+    def harvest(self, uploader, stories, messages):
+        """Produce media through photo/video stories and media/voice messages and collect their URLs"""
+        def create_story(index):
+            sender = uploader.pairs[index % len(uploader.pairs)][0]
+            name, mimetype, size = uploader.attachments(1)[0]
+            response = self.tester.request("POST", "POST /stories/create", "/stories/create", user=sender,
+                                           data={"privacy": "public"},
+                                           files={"media": (name, uploader.payload[:size], mimetype)})
+            url = response.json().get("data", {}).get("mediaUrl") if response is not None and response.status_code == 201 else None
+            return [url] if url else []
+
+        def send_message(index):
+            pair = uploader.pairs[index % len(uploader.pairs)]
+            if index % 2:
+                return uploader.send_voice(pair, 30)[1]
+            return uploader.send_media(pair, 1 + index % 4)[1]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            produced = list(pool.map(create_story, range(stories))) + list(pool.map(send_message, range(messages)))
+        self.urls = [url for urls in produced for url in urls]
+        self.tester.log_result("Downloads - Harvest", bool(self.urls),
+                               f"{len(self.urls)} media URLs from {stories} stories and {messages} messages")
+        return self.urls
+
+    def fetch(self, url, mode):
+        """Download one media URL; the recorded latency is time to first byte because the body is streamed"""
+        headers = {}
+        if mode == "range":
+            size = self.sizes.get(url, RANGE_BYTES)
+            offset = self.rng.randrange(max(1, size - RANGE_BYTES))
+            headers["Range"] = f"bytes={offset}-{offset + RANGE_BYTES - 1}"
+        elif mode == "conditional":
+            etag, last_modified = self.validators.get(url, (None, None))
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        start = self.tester.clock()
+        response = self.tester.request("GET", f"GET /uploads/:file [{mode}]", f"{self.media_root}{url}",
+                                       headers=headers, stream=True)
+        ttfb = self.tester.clock() - start
+        if response is None:
+            return {"status": 0, "ttfb": ttfb, "total": ttfb, "bytes": 0}
+        received = sum(len(chunk) for chunk in response.iter_content(READ_CHUNK))
+        total = self.tester.clock() - start
+        response.close()
+
+        if mode == "full" and response.status_code == 200:
+            self.validators[url] = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            self.sizes[url] = received
+            for header in ("Accept-Ranges", "ETag", "Cache-Control"):
+                self.headers_seen.setdefault(header, set()).add(
+                    re.sub(r'".*"', '"…"', response.headers.get(header, "missing")))
+        return {"status": response.status_code, "ttfb": ttfb, "total": total, "bytes": received}
+
+    def run(self, mode, rounds):
+        """Fetch every URL `rounds` times concurrently in one mode"""
+        items = self.urls * rounds
+        self.rng.shuffle(items)
+        start = self.tester.clock()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            fetches = list(pool.map(lambda url: self.fetch(url, mode), items))
+        span = self.tester.clock() - start
+
+        statuses = {}
+        for f in fetches:
+            statuses[f["status"]] = statuses.get(f["status"], 0) + 1
+        result = {
+            "count": len(fetches),
+            "ttfb_p50_ms": nearest_rank(sorted([f["ttfb"] * 1000 for f in fetches]), 50),
+            "ttfb_p99_ms": nearest_rank(sorted([f["ttfb"] * 1000 for f in fetches]), 99),
+            "total_p50_ms": nearest_rank(sorted([f["total"] * 1000 for f in fetches]), 50),
+            "total_p99_ms": nearest_rank(sorted([f["total"] * 1000 for f in fetches]), 99),
+            "mb_per_s": sum(f["bytes"] for f in fetches) / span / 1_000_000 if span else 0.0,
+            "statuses": dict(sorted(statuses.items()))
+        }
+        self.results[mode] = result
+        print(f"   {mode:<12} TTFB p50 {result['ttfb_p50_ms']:.1f} ms, total p50 {result['total_p50_ms']:.1f} ms, "
+              f"{result['mb_per_s']:.1f} MB/s, statuses {result['statuses']}")
+
+    def print_summary(self):
+        """Print per-mode throughput, TTFB and cache behaviour"""
+        print("\n" + "=" * 70)
+        print("📊 MEDIA DOWNLOAD SUMMARY")
+        print("=" * 70)
+        print(f"{'Mode':<12} {'Count':>6} {'TTFB p50':>9} {'TTFB p99':>9} {'Total p50':>10} {'Total p99':>10} "
+              f"{'MB/s':>7}  Statuses")
+        for mode, r in self.results.items():
+            print(f"{mode:<12} {r['count']:>6} {r['ttfb_p50_ms']:>9.1f} {r['ttfb_p99_ms']:>9.1f} {r['total_p50_ms']:>10.1f} "
+                  f"{r['total_p99_ms']:>10.1f} {r['mb_per_s']:>7.1f}  {r['statuses']}")
+        for header, values in sorted(self.headers_seen.items()):
+            print(f"   {header}: {', '.join(sorted(values))}")
+
+        if "range" in self.results:
+            r = self.results["range"]
+            partial = r["statuses"].get(206, 0)
+            self.tester.log_result("Downloads - Range Requests", partial == r["count"],
+                                   f"{partial}/{r['count']} Range requests answered with 206 Partial Content")
+        if "conditional" in self.results:
+            r = self.results["conditional"]
+            hits = r["statuses"].get(304, 0)
+            self.tester.log_result("Downloads - Conditional Requests", hits == r["count"],
+                                   f"ETag/304 hit rate {hits / r['count'] * 100 if r['count'] else 0:.1f}%")
+        cache_control = self.headers_seen.get("Cache-Control", set())
+        max_ages = [int(m) for value in cache_control for m in re.findall(r"max-age=(\d+)", value)]
+        cacheable = bool(max_ages) and min(max_ages) > 0
+        self.tester.log_result("Downloads - Cache-Control", cacheable,
+                               f"Cache-Control {', '.join(sorted(cache_control)) or 'not seen'}"
+                               + ("" if cacheable else "; clients revalidate or refetch on every view"))
+        print("\n🎯 MEDIA DOWNLOAD BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark media downloads from /uploads")
+    parser.add_argument("--stories", type=int, default=DEFAULT_STORIES, help="photo/video stories to create for media")
+    parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="media/voice messages to send for media")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="downloads of each URL per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated from full, range, conditional")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS, help="sender/recipient pairs of seeded users")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--manifest", nargs="?", const="", metavar="PATH",
+                        help="record created stories, messages and uploads for teardown.py")
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    if args.manifest is not None:
+        tester.manifest = RunManifest(tester.run_id, args.manifest or None)
+    print("🚀 Starting Media Download Benchmark")
+    print("=" * 70)
+
+    uploader = MediaUploadTester(tester, args.seed, args.concurrency)
+    if not uploader.setup(args.pairs):
+        return
+    benchmark = DownloadTester(tester, args.seed, args.concurrency)
+    harvested = benchmark.harvest(uploader, args.stories, args.messages)
+    if tester.manifest:
+        tester.manifest.close()
+    if not harvested:
+        return
+
+    modes = [m.strip() for m in args.modes.split(",")]
+    print(f"\n⬇️ Downloading {len(benchmark.urls)} media URLs × {args.rounds} rounds")
+    # Full downloads record the ETag and size that conditional and Range requests rely on
+    if "full" not in modes:
+        tester.recording = False
+        benchmark.run("full", 1)
+        tester.recording = True
+        benchmark.results.clear()
+    for mode in MODES:
+        if mode in modes:
+            benchmark.run(mode, args.rounds)
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
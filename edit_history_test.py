@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Message Edit-history Growth Benchmark
+Edits the same messages hundreds of times concurrently and tracks edit, history and conversation latency as embedded histories grow
+"""
+
+import argparse
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+
+# Configuration
+DEFAULT_CONVERSATIONS = 10
+DEFAULT_MESSAGES = 10
+DEFAULT_CHECKPOINTS = [0, 25, 50, 100, 200, 400]
+DEFAULT_CONCURRENCY = 16
+CONVERSATION_LIMIT = 50
+EDIT_TEXT_LENGTH = 60
+SLOWDOWN_LIMIT = 2.0
+MONGO_DOCUMENT_LIMIT = 16 * 1024 * 1024
+
+EDIT_ROUTE = "PUT /messages/:messageId/edit"
+HISTORY_ROUTE = "GET /messages/:messageId/history"
+CONVERSATION_ROUTE = "GET /messages/conversation/:userId"
+
+
+class EditHistoryTester:
+    def __init__(self, tester, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.rng = random.Random()
+        self.pairs = []
+        self.messages = []
+        self.edits = 0
+        self.results = []
+
+    def setup(self, conversations, per_conversation):
+        """Create sender/recipient pairs and the text messages that will be edited"""
+        users = self.tester.setup_users(2 * conversations, self.concurrency)
+        self.pairs = [(users[i], users[i + 1]) for i in range(0, len(users) - 1, 2)]
+
+        def send(task):
+            sender, recipient = task
+            response = self.tester.request("POST", "POST /messages/send", "/messages/send", user=sender,
+                                           json={"recipientId": self.tester.object_id(recipient),
+                                                 "text": "Edit history benchmark ✏️"})
+            if response is None or response.status_code != 201:
+                return None
+            return {"id": response.json().get("data", {}).get("id"), "sender": sender, "recipient": recipient}
+
+        tasks = [pair for pair in self.pairs for _ in range(per_conversation)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self.messages = [m for m in pool.map(send, tasks) if m and m["id"]]
+        self.tester.log_result("Edit History - Setup", len(self.messages) == len(tasks),
+                               f"{len(self.messages)}/{len(tasks)} messages in {len(self.pairs)} conversations")
+        return self.messages
+
+    def edit(self, message):
+        """Edit one message as its sender with fresh text"""
+        text = "".join(self.rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(EDIT_TEXT_LENGTH)).strip() or "edit"
+        self.tester.request("PUT", EDIT_ROUTE, f"/messages/{message['id']}/edit", user=message["sender"],
+                            json={"text": text})
+
+    def history(self, message):
+        """Read one message's edit history; returns (response size, history entries)"""
+        response = self.tester.request("GET", HISTORY_ROUTE, f"/messages/{message['id']}/history",
+                                       user=message["recipient"])
+        if response is None or response.status_code != 200:
+            return 0, 0
+        return len(response.content), len(response.json().get("editHistory") or [])
+
+    def conversation_bytes(self, pair):
+        """Load a conversation as the recipient's app does; returns the response size"""
+        sender, recipient = pair
+        response = self.tester.request("GET", CONVERSATION_ROUTE,
+                                       f"/messages/conversation/{self.tester.object_id(sender)}?limit={CONVERSATION_LIMIT}",
+                                       user=recipient)
+        return len(response.content) if response is not None and response.status_code == 200 else 0
+
+    def advance(self, target):
+        """Edit every message until it has `target` edits, shuffled so each message sees concurrent edits"""
+        tasks = [m for m in self.messages for _ in range(target - self.edits)]
+        self.rng.shuffle(tasks)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self.edit, tasks))
+        self.edits = target
+
+    def checkpoint(self, target):
+        """Bring every message to `target` edits, then measure history and conversation reads"""
+        mark = len(self.tester.records)
+        self.advance(target)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            histories = list(pool.map(self.history, self.messages))
+            conversation_sizes = list(pool.map(self.conversation_bytes, self.pairs))
+
+        records = self.tester.records[mark:]
+        result = {
+            "edits": target,
+            "edit": records.select(route=EDIT_ROUTE).summary(),
+            "history": records.select(route=HISTORY_ROUTE).summary(),
+            "conversation": records.select(route=CONVERSATION_ROUTE).summary(),
+            "history_bytes": sum(size for size, _ in histories) / len(histories) if histories else 0.0,
+            # The route pushes the previous text on every edit (and the original twice on the first), so n edits leave n + 1 entries
+            "missing_entries": sum(max(0, target + 1 - entries) for _, entries in histories) if target else 0,
+            "conversation_bytes": sum(conversation_sizes) / len(conversation_sizes) if conversation_sizes else 0.0
+        }
+        self.results.append(result)
+        edit = result["edit"]
+        edit_text = f"edit p50 {edit['p50_ms']:.1f} ms p99 {edit['p99_ms']:.1f} ms ({edit['errors']} errors), " if edit["count"] else ""
+        print(f"   {target:>5} edits: {edit_text}history p95 {result['history']['p95_ms']:.1f} ms, "
+              f"conversation p95 {result['conversation']['p95_ms']:.1f} ms, "
+              f"{result['history_bytes'] / 1024:.1f} KB/message")
+        return result
+
+    def print_summary(self):
+        """Print growth per checkpoint and where conversation loads degrade"""
+        print("\n" + "=" * 70)
+        print("📊 EDIT HISTORY SUMMARY")
+        print("=" * 70)
+        print(f"{'Edits':>6} {'Edit p50':>9} {'Edit p99':>9} {'Err':>5} {'Hist p95':>9} {'KB/msg':>8} "
+              f"{'Conv p50':>9} {'Conv p95':>9} {'Conv KB':>8}")
+        for r in self.results:
+            edit = r["edit"]
+            edit_cells = (f"{edit['p50_ms']:>9.1f} {edit['p99_ms']:>9.1f} {edit['errors']:>5}" if edit["count"]
+                          else f"{'-':>9} {'-':>9} {'-':>5}")
+            print(f"{r['edits']:>6} {edit_cells} {r['history']['p95_ms']:>9.1f} {r['history_bytes'] / 1024:>8.1f} "
+                  f"{r['conversation']['p50_ms']:>9.1f} {r['conversation']['p95_ms']:>9.1f} "
+                  f"{r['conversation_bytes'] / 1024:>8.1f}")
+
+        if len(self.results) < 2:
+            print("\n🎯 EDIT HISTORY BENCHMARK COMPLETE")
+            return
+        first, last = self.results[0], self.results[-1]
+        per_edit = (last["history_bytes"] - first["history_bytes"]) / (last["edits"] - first["edits"] or 1)
+        print(f"\nHistory grows {per_edit:.0f} bytes per edit (JSON)"
+              + (f"; a message reaches MongoDB's 16 MB document limit after ~{MONGO_DOCUMENT_LIMIT / per_edit:,.0f} edits"
+                 if per_edit > 0 else ""))
+
+        # toMessageJSON embeds editHistory, so every conversation load pays for every past edit
+        base = first["conversation"]["p95_ms"]
+        degraded = next((r for r in self.results if base and r["conversation"]["p95_ms"] > base * SLOWDOWN_LIMIT), None)
+        self.tester.log_result("Edit History - Conversation Load", degraded is None,
+                               f"conversation p95 ×{last['conversation']['p95_ms'] / base if base else 0:.1f} after "
+                               f"{last['edits']} edits/message" +
+                               (f"; exceeded ×{SLOWDOWN_LIMIT:.0f} at {degraded['edits']} edits" if degraded else ""))
+        errors = sum(r["edit"]["errors"] for r in self.results)
+        missing = last["missing_entries"]
+        self.tester.log_result("Edit History - Concurrent Edits", errors == 0 and missing == 0,
+                               f"{errors} failed edits, {missing} history entries missing after {last['edits']} edits "
+                               f"(lost updates from concurrent saves of the same message)")
+        print("\n🎯 EDIT HISTORY BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cost of growing embedded message edit histories")
+    parser.add_argument("--conversations", type=int, default=DEFAULT_CONVERSATIONS)
+    parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="messages per conversation")
+    parser.add_argument("--checkpoints", default=",".join(map(str, DEFAULT_CHECKPOINTS)),
+                        help="comma-separated edit counts per message at which to measure")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Edit History Benchmark")
+    print("=" * 70)
+
+    benchmark = EditHistoryTester(tester, args.concurrency)
+    print("\n📋 Creating conversations...")
+    if not benchmark.setup(args.conversations, args.messages):
+        print("❌ No messages available, aborting edit history benchmark")
+        return
+
+    print(f"\n✏️ Editing {len(benchmark.messages)} messages")
+    for target in sorted({int(c) for c in args.checkpoints.split(",")}):
+        benchmark.checkpoint(target)
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
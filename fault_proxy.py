@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Local Fault-injection Proxy for Tail-latency and Resilience Benchmarks
+Sits between the harness and the backend injecting per-route latency, jitter, bandwidth caps, resets and slow-loris responses
+"""
+
+import argparse
+import fnmatch
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from load_test import DEFAULT_CONCURRENCY, DEFAULT_USERS, SCENARIOS, LoadTester
+from metrics_store import RecordStore
+from traffic_replay import STRIPPED_HEADERS, read_body, route_template
+
+# Configuration
+UPSTREAM_URL = "http://localhost:3001"
+PROXY_PORT = 3003
+DEFAULT_DURATION = 30
+WRITE_CHUNK = 4096
+SLOWLORIS_CHUNK = 64
+
+# Named fault profiles: "ROUTE_GLOB:key=value,...;..." where keys are
+# latency/jitter (ms), bandwidth (kbit/s), reset (probability) and slowloris (seconds to drip the body)
+FAULT_PROFILES = {
+    "baseline": "",
+    "latency": "*:latency=100,jitter=50",
+    "jitter": "*:latency=50,jitter=300",
+    "bandwidth": "*:bandwidth=512",
+    "resets": "*:reset=0.05",
+    "slowloris": "GET /videos/feed:slowloris=10",
+    "degraded-messages": "* /messages/*:latency=1500,jitter=1000"
+}
+
+# Client timeout/retry patterns; "app" mirrors the Dio options in lib/services/api_service.dart
+CLIENT_POLICIES = {
+    "app": {"timeout": 30.0, "retries": 0, "backoff": 0.0},
+    "retry": {"timeout": 5.0, "retries": 2, "backoff": 0.2},
+    "aggressive": {"timeout": 1.0, "retries": 3, "backoff": 0.0}
+}
+
+
+def parse_rules(spec):
+    """Parse a fault spec into [(route glob, {fault: value})], first match wins"""
+    rules = []
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        pattern, _, faults = part.rpartition(":")
+        rules.append((pattern or "*", {k.strip(): float(v) for k, v in (f.split("=") for f in faults.split(","))}))
+    return rules
+
+
+class FaultProxy:
+    def __init__(self, upstream=UPSTREAM_URL, rules=None):
+        self.upstream = upstream.rstrip("/")
+        self.rules = rules or []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.counts = {"forwarded": 0, "reset": 0, "slowloris": 0}
+        self.server = None
+
+    def set_rules(self, rules):
+        """Swap the active fault rules and zero the counters"""
+        with self.lock:
+            self.rules = rules
+            self.counts = dict.fromkeys(self.counts, 0)
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def faults_for(self, route):
+        """Faults of the first rule whose glob matches the route template"""
+        return next((faults for pattern, faults in self.rules if fnmatch.fnmatch(route, pattern)), {})
+
+    def reset(self, handler):
+        """Abort the connection with a TCP RST"""
+        handler.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        handler.close_connection = True
+        handler.connection.close()
+
+    def write_body(self, handler, body, faults):
+        """Send the response body, dripped for slow-loris or paced to the bandwidth cap"""
+        if faults.get("slowloris"):
+            pieces = [body[i:i + SLOWLORIS_CHUNK] for i in range(0, len(body), SLOWLORIS_CHUNK)] or [b""]
+            delay = faults["slowloris"] / len(pieces)
+            for piece in pieces:
+                time.sleep(delay)
+                handler.wfile.write(piece)
+                handler.wfile.flush()
+            return
+        if faults.get("bandwidth"):
+            bytes_per_s = faults["bandwidth"] * 1000 / 8
+            for i in range(0, len(body), WRITE_CHUNK):
+                handler.wfile.write(body[i:i + WRITE_CHUNK])
+                handler.wfile.flush()
+                time.sleep(len(body[i:i + WRITE_CHUNK]) / bytes_per_s)
+            return
+        handler.wfile.write(body)
+
+    def forward(self, handler):
+        """Apply the route's faults around one upstream round trip"""
+        body = read_body(handler)
+        route = route_template(handler.command, handler.path.split("?", 1)[0])
+        faults = self.faults_for(route)
+
+        if faults.get("latency") or faults.get("jitter"):
+            base, jitter = faults.get("latency", 0.0), faults.get("jitter", 0.0)
+            time.sleep(max(0.0, random.uniform(base - jitter, base + jitter)) / 1000)
+
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        headers = {k: v for k, v in handler.headers.items() if k.lower() not in STRIPPED_HEADERS}
+        try:
+            response = self.local.session.request(handler.command, f"{self.upstream}{handler.path}",
+                                                  headers=headers, data=body, allow_redirects=False)
+        except requests.RequestException as e:
+            handler.send_error(502, str(e))
+            return
+        self.count("forwarded")
+
+        # Resets happen after the backend did the work, as when a mobile connection drops mid-response
+        if random.random() < faults.get("reset", 0.0):
+            self.count("reset")
+            self.reset(handler)
+            return
+
+        handler.send_response(response.status_code)
+        for k, v in response.headers.items():
+            if k.lower() not in STRIPPED_HEADERS:
+                handler.send_header(k, v)
+        handler.send_header("Content-Length", str(len(response.content)))
+        handler.end_headers()
+        if faults.get("slowloris"):
+            self.count("slowloris")
+        self.write_body(handler, response.content, faults)
+
+    def start(self, port=PROXY_PORT):
+        """Serve in a background thread"""
+        proxy = self
+
+        class FaultHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                try:
+                    proxy.forward(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = do_HEAD = do_GET
+
+        self.server = ThreadingHTTPServer(("0.0.0.0", port), FaultHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"💥 Fault proxy on :{port} → {self.upstream}")
+
+    def stop(self):
+        """Stop serving"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class FaultBenchmark:
+    def __init__(self, tester, proxy):
+        self.tester = tester
+        self.proxy = proxy
+        self.policy = CLIENT_POLICIES["app"]
+        self.logical = RecordStore()
+        self.lock = threading.Lock()
+        self.results = []
+        # Every scenario request goes through the client policy; attempts are recorded by the tester itself
+        self.send = tester.request
+        tester.request = self.request
+
+    def request(self, method, route, path, user=None, **kwargs):
+        """Issue one logical request under the active timeout/retry policy"""
+        policy = self.policy
+        kwargs.setdefault("timeout", policy["timeout"])
+        start = self.tester.clock()
+        for attempt in range(policy["retries"] + 1):
+            if attempt and policy["backoff"]:
+                time.sleep(policy["backoff"] * 2 ** (attempt - 1))
+            response = self.send(method, route, path, user=user, **kwargs)
+            if response is not None and response.status_code < 500:
+                break
+        with self.lock:
+            self.logical.append(start, route, response.status_code if response is not None else 0,
+                                self.tester.clock() - start)
+        return response
+
+    def measure(self, profile, policy, scenario, duration, concurrency):
+        """Run the scenario through one fault profile with one client policy"""
+        self.proxy.set_rules(parse_rules(FAULT_PROFILES.get(profile, profile)))
+        self.policy = CLIENT_POLICIES[policy]
+        self.tester.reset_records()
+        with self.lock:
+            self.logical = RecordStore()
+        self.tester.run_load(scenario, duration, concurrency)
+
+        logical = self.logical.summary()
+        attempts = self.tester.records.summary()
+        result = {
+            "profile": profile,
+            "policy": policy,
+            "logical": logical,
+            "attempts": attempts,
+            "attempt_amplification": attempts["count"] / logical["count"] if logical["count"] else 0.0,
+            "backend_amplification": self.proxy.counts["forwarded"] / logical["count"] if logical["count"] else 0.0,
+            "counts": dict(self.proxy.counts)
+        }
+        self.results.append(result)
+        print(f"   {profile:<18} {policy:<10} p99 {logical['p99_ms']:.0f} ms, errors {logical['error_rate'] * 100:.1f}%, "
+              f"{result['attempt_amplification']:.2f} attempts/request, {result['backend_amplification']:.2f} backend/request")
+
+    def print_summary(self):
+        """Print tail latency and load amplification per fault profile and client policy"""
+        print("\n" + "=" * 70)
+        print("📊 FAULT INJECTION SUMMARY")
+        print("=" * 70)
+        print(f"{'Profile':<18} {'Policy':<10} {'Requests':>8} {'p50 ms':>8} {'p99 ms':>9} {'Errors':>7} "
+              f"{'Attempts×':>9} {'Backend×':>9} {'Resets':>7}")
+        for r in self.results:
+            logical = r["logical"]
+            print(f"{r['profile']:<18} {r['policy']:<10} {logical['count']:>8} {logical['p50_ms']:>8.1f} "
+                  f"{logical['p99_ms']:>9.1f} {logical['error_rate'] * 100:>6.1f}% {r['attempt_amplification']:>9.2f} "
+                  f"{r['backend_amplification']:>9.2f} {r['counts']['reset']:>7}")
+
+        baseline = {r["policy"]: r for r in self.results if r["profile"] == "baseline"}
+        for r in self.results:
+            base = baseline.get(r["policy"])
+            if r["profile"] == "baseline" or not base or not base["logical"]["p99_ms"]:
+                continue
+            tail = r["logical"]["p99_ms"] / base["logical"]["p99_ms"]
+            self.tester.log_result(f"Faults - {r['profile']} / {r['policy']}", r["backend_amplification"] < 1.5,
+                                   f"p99 ×{tail:.1f} vs baseline, backend load ×{r['backend_amplification']:.2f}")
+        print("\n🎯 FAULT INJECTION BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject network and backend faults between the harness and the backend")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="run the fault proxy for other tools or the app")
+    serve.add_argument("--faults", default="baseline", help=f"profile ({', '.join(FAULT_PROFILES)}) or rule spec")
+    serve.add_argument("--upstream", default=UPSTREAM_URL)
+    serve.add_argument("--port", type=int, default=PROXY_PORT)
+
+    bench = subparsers.add_parser("bench", help="measure tail latency and retry amplification under faults")
+    bench.add_argument("--profiles", default="baseline,latency,resets,degraded-messages",
+                       help=f"comma-separated from {', '.join(FAULT_PROFILES)}")
+    bench.add_argument("--policies", default=",".join(CLIENT_POLICIES), help=f"comma-separated from {', '.join(CLIENT_POLICIES)}")
+    bench.add_argument("--scenario", default="mixed", choices=SCENARIOS)
+    bench.add_argument("--users", type=int, default=DEFAULT_USERS)
+    bench.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    bench.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per profile and policy")
+    bench.add_argument("--upstream", default=UPSTREAM_URL)
+    bench.add_argument("--port", type=int, default=PROXY_PORT)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        proxy = FaultProxy(args.upstream, parse_rules(FAULT_PROFILES.get(args.faults, args.faults)))
+        proxy.start(args.port)
+        print(f"   Faults: {FAULT_PROFILES.get(args.faults, args.faults) or 'none'} "
+              f"(point BASE_URL at http://localhost:{args.port}/api)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            proxy.stop()
+        return
+
+    proxy = FaultProxy(args.upstream)
+    proxy.start(args.port)
+    tester = LoadTester(f"http://localhost:{args.port}/api")
+    print("🚀 Starting Fault Injection Benchmark")
+    print("=" * 70)
+
+    print("\n📋 Setting up virtual users...")
+    if not tester.setup_users(args.users, args.concurrency):
+        print("❌ No virtual users available, aborting fault injection benchmark")
+        return
+
+    benchmark = FaultBenchmark(tester, proxy)
+    try:
+        for profile in (p.strip() for p in args.profiles.split(",")):
+            for policy in (p.strip() for p in args.policies.split(",")):
+                benchmark.measure(profile, policy, args.scenario, args.duration, args.concurrency)
+    finally:
+        proxy.stop()
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
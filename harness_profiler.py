@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Harness Self-profiler for Load Tests
+Accounts the client's own CPU per request by phase and warns when the load generator, not the server, is the bottleneck
+"""
+
+import os
+import threading
+import time
+
+# Configuration
+DEFAULT_INTERVAL = 0.5
+CLIENT_BOUND_PCT = 85.0  # of one core; Python threads share the GIL
+CLIENT_BOUND_SHARE = 0.2
+BUDGET_WARN_RATIO = 0.7
+# prepare: header/kwargs setup; http_client: requests/urllib3 CPU excluding time blocked on the socket;
+# bookkeeping: recording the sample plus payload/validation hooks; logging: log_result printing
+PHASES = ["prepare", "json_encode", "http_client", "json_decode", "bookkeeping", "logging"]
+
+
+class HarnessProfiler:
+    def __init__(self, clock, interval=DEFAULT_INTERVAL):
+        self.clock = clock
+        self.interval = interval
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.thread_totals = []
+        self.samples = []
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.clk_tck = os.sysconf("SC_CLK_TCK")
+        self.started = None
+        self.stopped = None
+
+    def totals(self):
+        """The calling thread's phase counters, registered on first use so no lock is taken per request"""
+        if not hasattr(self.local, "totals"):
+            self.local.totals = dict.fromkeys(PHASES + ["requests"], 0.0)
+            with self.lock:
+                self.thread_totals.append(self.local.totals)
+        return self.local.totals
+
+    def add(self, phase, since):
+        """Charge the thread CPU time used since `since` to phase; returns the new mark"""
+        now = time.thread_time()
+        self.totals()[phase] += now - since
+        return now
+
+    def count(self):
+        """Count one completed request"""
+        self.totals()["requests"] += 1
+
+    def timed_json(self, response):
+        """Wrap response.json so decoding done later by scenario code is charged to json_decode"""
+        decode = response.json
+
+        def json(**kwargs):
+            start = time.thread_time()
+            try:
+                return decode(**kwargs)
+            finally:
+                self.add("json_decode", start)
+        return json
+
+    def read_cpu_seconds(self):
+        """User+system CPU seconds consumed by this harness process"""
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.clk_tck
+
+    def loop(self):
+        """Sample harness process CPU at a fixed interval until stopped"""
+        last_t, last_cpu = self.clock(), self.read_cpu_seconds()
+        while not self.stop_event.wait(self.interval):
+            t, cpu = self.clock(), self.read_cpu_seconds()
+            self.samples.append({"t": t, "cpu": (cpu - last_cpu) / (t - last_t) * 100, "threads": threading.active_count()})
+            last_t, last_cpu = t, cpu
+
+    def start(self):
+        """Start sampling the harness process in a background thread"""
+        self.started = (self.clock(), self.read_cpu_seconds())
+        print(f"🩺 Profiling harness PID {os.getpid()} every {self.interval}s")
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the background thread"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        self.stopped = (self.clock(), self.read_cpu_seconds())
+
+    def merged(self):
+        """Phase totals summed across every thread"""
+        with self.lock:
+            return {key: sum(t[key] for t in self.thread_totals) for key in PHASES + ["requests"]}
+
+    def print_report(self, stats):
+        """Print per-request client CPU by phase and the client-bound verdict"""
+        print("\n🩺 HARNESS OVERHEAD")
+        totals = self.merged()
+        requests = int(totals["requests"])
+        if not requests or not self.started or not self.stopped:
+            print("No requests profiled")
+            return
+
+        accounted = sum(totals[phase] for phase in PHASES)
+        wall = self.stopped[0] - self.started[0]
+        process_cpu = self.stopped[1] - self.started[1]
+        mean_latency_us = stats["mean_ms"] * 1000
+
+        print(f"{'Phase':<14} {'CPU µs/req':>11} {'% of latency':>13}")
+        for phase in PHASES:
+            per_request = totals[phase] / requests * 1e6
+            print(f"{phase:<14} {per_request:>11.1f} {per_request / mean_latency_us * 100 if mean_latency_us else 0:>12.2f}%")
+        per_request = accounted / requests * 1e6
+        print(f"{'total':<14} {per_request:>11.1f} {per_request / mean_latency_us * 100 if mean_latency_us else 0:>12.2f}%")
+        print(f"Unaccounted process CPU (scenarios, threads, GC): {max(0.0, process_cpu - accounted) / requests * 1e6:.1f} µs/req")
+
+        # With the GIL, one core bounds how many requests per second the harness can drive
+        budget_rps = requests / process_cpu if process_cpu else 0.0
+        achieved_rps = requests / wall if wall else 0.0
+        usage = achieved_rps / budget_rps if budget_rps else 0.0
+        print(f"Harness CPU: {process_cpu / wall * 100 if wall else 0:.0f}% of one core; "
+              f"budget ~{budget_rps:.0f} req/s, achieved {achieved_rps:.1f} req/s ({usage * 100:.0f}% of budget)")
+
+        saturated = [s for s in self.samples if s["cpu"] >= CLIENT_BOUND_PCT]
+        share = len(saturated) / len(self.samples) if self.samples else 0.0
+        if share >= CLIENT_BOUND_SHARE or usage >= BUDGET_WARN_RATIO:
+            print(f"⚠️ CLIENT-BOUND: the harness was ≥ {CLIENT_BOUND_PCT:.0f}% CPU for {share * 100:.0f}% of the run "
+                  f"and used {usage * 100:.0f}% of its request budget; latencies include client queueing. "
+                  f"Spread load across more harness processes.")
+        else:
+            print(f"✅ Harness not saturated (≥ {CLIENT_BOUND_PCT:.0f}% CPU in {share * 100:.0f}% of samples)")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Hot-document Contention Benchmark for Reactions and Likes
+N clients react to or like the same story, message, video or comment at once, then final counts are verified
+"""
+
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from seed_data import DEFAULT_SEED, FAKE_VIDEO, user_spec
+
+# Configuration
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32, 64, 128]
+DEFAULT_ROUNDS = 3
+TARGETS = ["story_react", "message_react", "video_like", "comment_like"]
+REACTION_EMOJIS = ["❤️", "😂", "😮", "😢", "👍", "🔥"]
+
+
+class HotDocumentTester:
+    def __init__(self, tester, seed=DEFAULT_SEED):
+        self.tester = tester
+        self.seed = seed
+        self.owner = None
+        self.partner = None
+        self.contenders = []
+        self.results = []
+
+    def setup(self, max_level):
+        """Log in the target owner, a message partner and the contending clients"""
+        self.owner = self.tester.login_user(user_spec(self.seed, 0))
+        self.partner = self.tester.login_user(user_spec(self.seed, 1))
+        with ThreadPoolExecutor(max_workers=min(64, max_level)) as pool:
+            self.contenders = [u for u in pool.map(self.tester.login_user,
+                                                   (user_spec(self.seed, i) for i in range(2, 2 + max_level))) if u]
+        ready = self.owner is not None and self.partner is not None and len(self.contenders) == max_level
+        self.tester.log_result("Hot Document - Setup", ready, f"{len(self.contenders)}/{max_level} contending clients ready")
+        return ready
+
+    def create_target(self, target):
+        """Create a fresh document for one burst; returns (target_id, context) or None"""
+        owner = self.owner
+        if target == "story_react":
+            response = self.tester.request("POST", "POST /stories/create", "/stories/create", user=owner,
+                                           json={"content": "text", "text": "Hot story 🔥", "privacy": "public"})
+            return (response.json()["data"]["id"], None) if response is not None and response.status_code == 201 else None
+
+        if target == "message_react":
+            partner_id = self.tester.object_id(self.partner)
+            response = self.tester.request("POST", "POST /messages/send", "/messages/send", user=owner,
+                                           json={"recipientId": partner_id, "text": "React to this! 👀"})
+            return (response.json()["data"]["id"], partner_id) if response is not None and response.status_code == 201 else None
+
+        files = {"video": ("hot.mp4", FAKE_VIDEO, "video/mp4")}
+        response = self.tester.request("POST", "POST /videos/upload", "/videos/upload", user=owner,
+                                       data={"caption": "Hot video #contention", "allowComments": "true"}, files=files)
+        if response is None or response.status_code != 201:
+            return None
+        video_id = response.json().get("video", {}).get("id")
+        if video_id is None:
+            return None
+        if target == "video_like":
+            return video_id, None
+
+        response = self.tester.request("POST", "POST /comments/video/:videoId", f"/comments/video/{video_id}",
+                                       user=owner, json={"text": "Like this comment 👍"})
+        comment_id = response.json().get("comment", {}).get("id") if response is not None and response.status_code == 201 else None
+        return (comment_id, video_id) if comment_id else None
+
+    def contend(self, target, target_id, clients, barrier, index):
+        """One client's mutation, released together with every other client; returns its status (0 if it failed)"""
+        if target == "story_react":
+            route, path, body = "POST /stories/:storyId/react", f"/stories/{target_id}/react", {"emoji": REACTION_EMOJIS[index % 6]}
+        elif target == "message_react":
+            route, path, body = "POST /messages/:messageId/react", f"/messages/{target_id}/react", {"emoji": REACTION_EMOJIS[index % 6]}
+        elif target == "video_like":
+            route, path, body = "POST /videos/:videoId/like", f"/videos/{target_id}/like", None
+        else:
+            route, path, body = "POST /comments/:commentId/like", f"/comments/{target_id}/like", None
+        barrier.wait()
+        response = self.tester.request("POST", route, path, user=clients[index], json=body)
+        return response.status_code if response is not None else 0
+
+    def final_count(self, target, target_id, context):
+        """Read back the persisted reaction or like count"""
+        if target == "story_react":
+            response = self.tester.request("GET", "GET /stories/my-stories", "/stories/my-stories", user=self.owner)
+            stories = response.json().get("stories", []) if response is not None and response.status_code == 200 else []
+            story = next((s for s in stories if s.get("id") == target_id), None)
+            return len(story.get("reactions", [])) if story else None
+
+        if target == "message_react":
+            response = self.tester.request("GET", "GET /messages/conversation/:userId", f"/messages/conversation/{context}",
+                                           user=self.owner)
+            messages = response.json().get("messages", []) if response is not None and response.status_code == 200 else []
+            message = next((m for m in messages if m.get("id") == target_id), None)
+            return len(message.get("reactions", [])) if message else None
+
+        if target == "video_like":
+            response = self.tester.request("GET", "GET /videos/:videoId", f"/videos/{target_id}")
+            return response.json().get("video", {}).get("likesCount") if response is not None and response.status_code == 200 else None
+
+        response = self.tester.request("GET", "GET /comments/video/:videoId", f"/comments/video/{context}")
+        comments = response.json().get("comments", []) if response is not None and response.status_code == 200 else []
+        comment = next((c for c in comments if c.get("id") == target_id), None)
+        return comment.get("likesCount") if comment else None
+
+    def burst(self, target, level):
+        """Fire `level` simultaneous mutations at one fresh document and verify the outcome"""
+        created = self.create_target(target)
+        if created is None:
+            return None
+        target_id, context = created
+
+        # Only the two participants may react to a message, so they share the N requests
+        clients = [self.owner, self.partner] * ((level + 1) // 2) if target == "message_react" else self.contenders
+        expected = min(level, 2) if target == "message_react" else level
+
+        barrier = threading.Barrier(level)
+        mark = len(self.tester.records)
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            statuses = Counter(pool.map(lambda i: self.contend(target, target_id, clients, barrier, i), range(level)))
+        stats = self.tester.records[mark:].select(prefix="POST /").summary()
+
+        return {"stats": stats, "statuses": statuses, "level": level,
+                "acknowledged": sum(n for status, n in statuses.items() if 200 <= status < 300),
+                "expected": expected, "final": self.final_count(target, target_id, context)}
+
+    def run(self, targets, levels, rounds):
+        """Sweep contention levels for every target"""
+        for target in targets:
+            print(f"\n🔥 {target}")
+            for level in levels:
+                bursts = [b for b in (self.burst(target, level) for _ in range(rounds)) if b]
+                if not bursts:
+                    self.tester.log_result(f"Hot Document - {target} N={level}", False, "Could not create target document")
+                    continue
+                # Only a burst whose every write was acknowledged can show a lost update; refusals are reported on their own
+                complete = [b for b in bursts if b["acknowledged"] == b["level"]]
+                statuses = sum((b["statuses"] for b in bursts), Counter())
+                result = {
+                    "target": target,
+                    "level": level,
+                    "p50_ms": sum(b["stats"]["p50_ms"] for b in bursts) / len(bursts),
+                    "p99_ms": max(b["stats"]["p99_ms"] for b in bursts),
+                    "rps": sum(b["stats"]["rps"] for b in bursts) / len(bursts),
+                    "errors": sum(b["stats"]["errors"] for b in bursts),
+                    "finals": [b["final"] for b in bursts],
+                    "expected": bursts[0]["expected"],
+                    "statuses": dict(sorted(statuses.items())),
+                    "refused": sum(b["level"] - b["acknowledged"] for b in bursts),
+                    "verified": len(complete),
+                    "inconsistent": sum(1 for b in complete if b["final"] != b["expected"])
+                }
+                self.results.append(result)
+                print(f"   N={level:<4} p50 {result['p50_ms']:.1f} ms p99 {result['p99_ms']:.1f} ms "
+                      f"{result['rps']:.0f}/s errors {result['errors']} final {result['finals']} (expected {result['expected']}), "
+                      f"statuses {result['statuses']}")
+
+    def print_summary(self):
+        """Print contention table and lost-update verdicts"""
+        print("\n" + "=" * 70)
+        print("📊 HOT DOCUMENT CONTENTION SUMMARY")
+        print("=" * 70)
+        print(f"{'Target':<15} {'N':>5} {'p50 ms':>8} {'p99 ms':>8} {'Ops/s':>7} {'Errors':>7} {'Refused':>8} "
+              f"{'Verified':>9} {'Lost updates':>13}")
+        for r in self.results:
+            print(f"{r['target']:<15} {r['level']:>5} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['rps']:>7.0f} "
+                  f"{r['errors']:>7} {r['refused']:>8} {r['verified']:>9} {r['inconsistent']:>13}")
+        print("Verified: bursts with every write acknowledged, the only ones a lost update can be read from.")
+
+        for target in dict.fromkeys(r["target"] for r in self.results):
+            rows = [r for r in self.results if r["target"] == target]
+            refused = [r for r in rows if r["refused"] or r["errors"]]
+            if refused:
+                statuses = sum((Counter(r["statuses"]) for r in refused), Counter())
+                self.tester.log_result(f"Hot Document - {target} Writes", False,
+                                       f"{sum(r['refused'] for r in refused)} writes refused at N={[r['level'] for r in refused]} "
+                                       f"(statuses {dict(sorted(statuses.items()))})")
+            inconsistent = [r["level"] for r in rows if r["inconsistent"]]
+            if inconsistent:
+                self.tester.log_result(f"Hot Document - {target}", False,
+                                       f"final count diverged from acknowledged writes at N={inconsistent}")
+            elif not any(r["verified"] for r in rows):
+                self.tester.log_result(f"Hot Document - {target}", False,
+                                       "inconclusive: no burst had every write acknowledged")
+            else:
+                self.tester.log_result(f"Hot Document - {target}", True,
+                                       f"final counts matched in {sum(r['verified'] for r in rows)} fully acknowledged bursts")
+        print("\n🎯 HOT DOCUMENT BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent reactions and likes on a single document")
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"comma-separated from {', '.join(TARGETS)}")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)), help="comma-separated client counts N")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="fresh-document bursts per level")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="clients are this seed's seeded users")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Hot Document Contention Benchmark")
+    print("=" * 70)
+
+    benchmark = HotDocumentTester(tester, args.seed)
+    if not benchmark.setup(max(levels)):
+        return
+    benchmark.run([t.strip() for t in args.targets.split(",")], levels, args.rounds)
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
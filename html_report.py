@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Self-contained HTML Performance Report
+Renders a run's records as one static HTML file with inline SVG time series, per-route heatmaps and a baseline overlay
+"""
+
+import argparse
+import html
+import json
+import math
+import re
+from collections import Counter
+from datetime import datetime
+
+from metrics_store import NS_PER_S, nearest_rank
+
+# Configuration
+DEFAULT_REPORT = "load_report.html"
+MAX_WINDOWS = 120
+CHART_WIDTH = 900
+CHART_HEIGHT = 220
+MARGIN_LEFT = 60
+MARGIN_TOP = 24
+MARGIN_BOTTOM = 28
+MAX_HEATMAP_ROUTES = 12
+HEATMAP_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, math.inf]
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf]
+COLORS = {"rps": "#1c7ed6", "p50": "#2b8a3e", "p95": "#e67700", "p99": "#c92a2a", "errors": "#c92a2a"}
+DATA_TAG = re.compile(r'<script type="application/json" id="run-data">(.*?)</script>', re.S)
+
+STYLE = """
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2em auto; max-width: 960px; color: #212529; }
+h1 { font-size: 1.5em; } h2 { font-size: 1.2em; margin-top: 2em; border-bottom: 1px solid #dee2e6; } h3 { font-size: 1em; }
+table { border-collapse: collapse; width: 100%; font-size: 0.85em; }
+th, td { padding: 3px 8px; border-bottom: 1px solid #e9ecef; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.pass { color: #2b8a3e; } .fail { color: #c92a2a; } .empty, .meta { color: #868e96; font-size: 0.9em; }
+svg { display: block; margin: 0.5em 0; } svg text { font-size: 10px; fill: #495057; }
+"""
+
+
+def bucket_index(value, bounds):
+    """Index of the first bucket whose upper bound is at least value"""
+    return next(i for i, bound in enumerate(bounds) if value <= bound)
+
+
+def bucket_label(bounds, i):
+    """Label for a latency bucket"""
+    if math.isinf(bounds[i]):
+        return f">{bounds[i - 1]:g}"
+    return f"≤{bounds[i]:g}"
+
+
+def window_for(span):
+    """Window length (s) giving at most MAX_WINDOWS points"""
+    return max(1.0, math.ceil(span / MAX_WINDOWS))
+
+
+def timeline(records, window):
+    """Per-window throughput, latency percentiles and error statuses, plus per-route latency heatmaps"""
+    origin_ns = int(records.start_time() * NS_PER_S)
+    columns = records.columns
+    windows = {}
+    heatmaps = {}
+    for t_ns, latency_ns, status, route_id in zip(columns["t_ns"], columns["latency_ns"], columns["status"],
+                                                  columns["route_id"]):
+        i = int((t_ns - origin_ns) / NS_PER_S // window)
+        latency_ms = latency_ns / 1e6
+        w = windows.setdefault(i, {"latencies": [], "errors": Counter()})
+        w["latencies"].append(latency_ms)
+        if not 200 <= status < 400:
+            w["errors"][str(status)] += 1
+        cells = heatmaps.setdefault(route_id, Counter())
+        cells[(bucket_index(latency_ms, HEATMAP_BUCKETS_MS), i)] += 1
+
+    points = []
+    for i in range(max(windows) + 1 if windows else 0):
+        w = windows.get(i, {"latencies": [], "errors": Counter()})
+        ordered = sorted(w["latencies"])
+        points.append({"t": i * window, "rps": len(ordered) / window, "p50": nearest_rank(ordered, 50),
+                       "p95": nearest_rank(ordered, 95), "p99": nearest_rank(ordered, 99), "errors": dict(w["errors"])})
+    routes = {records.routes.names[route_id]: [[cells[(b, i)] for i in range(len(points))]
+                                               for b in range(len(HEATMAP_BUCKETS_MS))]
+              for route_id, cells in heatmaps.items()}
+    return points, routes
+
+
+def distribution(latencies_ms):
+    """Percentiles and a log-bucket histogram of a latency sample"""
+    ordered = sorted(latencies_ms)
+    histogram = [0] * len(HISTOGRAM_BUCKETS_MS)
+    for value in ordered:
+        histogram[bucket_index(value, HISTOGRAM_BUCKETS_MS)] += 1
+    return {"count": len(ordered), "p50": nearest_rank(ordered, 50), "p95": nearest_rank(ordered, 95),
+            "p99": nearest_rank(ordered, 99), "max": ordered[-1] if ordered else 0.0, "histogram": histogram}
+
+
+def run_data(records, test_results, meta, deliveries=None):
+    """Everything the report draws, as plain JSON embedded in the page for later baseline overlays"""
+    window = window_for(records.span())
+    points, heatmaps = timeline(records, window)
+    return {
+        "meta": meta,
+        "window": window,
+        "timeline": points,
+        "routes": {route: r.summary() for route, r in sorted(records.by_route().items())},
+        "heatmaps": heatmaps,
+        "deliveries": {name: distribution(values) for name, values in (deliveries or {}).items()},
+        "checks": [{"test": r["test"], "success": r["success"], "message": r["message"]} for r in test_results]
+    }
+
+
+def load_run_data(path):
+    """Run data embedded in an earlier report"""
+    with open(path) as f:
+        match = DATA_TAG.search(f.read())
+    if not match:
+        raise ValueError(f"{path} is not a report written by html_report.py")
+    return json.loads(match.group(1))
+
+
+def line_chart(series, unit, marker=None):
+    """Inline SVG line chart; series is [(label, color, [(x, y)], dashed)]"""
+    drawn = [s for s in series if s[2]]
+    if not drawn:
+        return '<p class="empty">No data</p>'
+    max_x = max(x for _, _, points, _ in drawn for x, _ in points) or 1.0
+    max_y = max(y for _, _, points, _ in drawn for _, y in points) * 1.1 or 1.0
+    plot_w = CHART_WIDTH - MARGIN_LEFT - 10
+    plot_h = CHART_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+
+    def sx(x):
+        return MARGIN_LEFT + x / max_x * plot_w
+
+    def sy(y):
+        return MARGIN_TOP + plot_h - y / max_y * plot_h
+
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" width="100%">']
+    for i in range(5):
+        y = max_y * i / 4
+        parts.append(f'<line x1="{MARGIN_LEFT}" x2="{MARGIN_LEFT + plot_w}" y1="{sy(y):.1f}" y2="{sy(y):.1f}" stroke="#e9ecef"/>'
+                     f'<text x="{MARGIN_LEFT - 6}" y="{sy(y) + 3:.1f}" text-anchor="end">{y:.0f} {unit}</text>'
+                     f'<text x="{sx(max_x * i / 4):.1f}" y="{CHART_HEIGHT - 8}" text-anchor="middle">{max_x * i / 4:.0f}s</text>')
+    if marker is not None:
+        parts.append(f'<line x1="{sx(marker):.1f}" x2="{sx(marker):.1f}" y1="{MARGIN_TOP}" y2="{MARGIN_TOP + plot_h}" '
+                     f'stroke="#868e96" stroke-dasharray="2,2"><title>steady state from {marker:.1f}s</title></line>')
+    legend_x = MARGIN_LEFT
+    for label, color, points, dashed in drawn:
+        dash = ' stroke-dasharray="6,4" opacity="0.6"' if dashed else ""
+        coords = " ".join(f"{sx(x):.1f},{sy(y):.1f}" for x, y in points)
+        parts.append(f'<polyline points="{coords}" fill="none" stroke="{color}" stroke-width="1.5"{dash}/>')
+        parts.append(f'<line x1="{legend_x}" x2="{legend_x + 16}" y1="10" y2="10" stroke="{color}" stroke-width="2"{dash}/>'
+                     f'<text x="{legend_x + 20}" y="13">{html.escape(label)}</text>')
+        legend_x += 30 + 6 * len(label)
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def error_chart(points, window):
+    """Inline SVG bar chart of errors per window, statuses in the tooltip"""
+    totals = [sum(p["errors"].values()) for p in points]
+    if not any(totals):
+        return '<p class="empty">No errors</p>'
+    plot_w = CHART_WIDTH - MARGIN_LEFT - 10
+    plot_h = CHART_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    bar_w = plot_w / len(points)
+    peak = max(totals)
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" width="100%">',
+             f'<text x="{MARGIN_LEFT - 6}" y="{MARGIN_TOP + 3}" text-anchor="end">{peak}</text>'
+             f'<text x="{MARGIN_LEFT - 6}" y="{MARGIN_TOP + plot_h}" text-anchor="end">0</text>']
+    for i, (point, total) in enumerate(zip(points, totals)):
+        if not total:
+            continue
+        height = total / peak * plot_h
+        statuses = ", ".join(f"{'no response' if status == '0' else status}: {n}" for status, n in sorted(point["errors"].items()))
+        parts.append(f'<rect x="{MARGIN_LEFT + i * bar_w:.1f}" y="{MARGIN_TOP + plot_h - height:.1f}" '
+                     f'width="{max(1.0, bar_w - 1):.1f}" height="{height:.1f}" fill="{COLORS["errors"]}">'
+                     f'<title>{point["t"]:.0f}–{point["t"] + window:.0f}s: {statuses}</title></rect>')
+    for i in range(5):
+        x = len(points) * window * i / 4
+        parts.append(f'<text x="{MARGIN_LEFT + plot_w * i / 4:.1f}" y="{CHART_HEIGHT - 8}" text-anchor="middle">{x:.0f}s</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def heatmap(cells, window):
+    """Inline SVG latency heatmap: time across, latency bucket up, shade by request count"""
+    columns = len(cells[0]) if cells else 0
+    peak = max((n for row in cells for n in row), default=0)
+    if not columns or not peak:
+        return '<p class="empty">No data</p>'
+    height = 16 * len(HEATMAP_BUCKETS_MS) + MARGIN_BOTTOM
+    plot_w = CHART_WIDTH - MARGIN_LEFT - 10
+    cell_w = plot_w / columns
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {height}" width="100%">']
+    for b, row in enumerate(cells):
+        y = (len(HEATMAP_BUCKETS_MS) - 1 - b) * 16
+        parts.append(f'<text x="{MARGIN_LEFT - 6}" y="{y + 12}" text-anchor="end">{bucket_label(HEATMAP_BUCKETS_MS, b)} ms</text>')
+        for i, n in enumerate(row):
+            if n:
+                parts.append(f'<rect x="{MARGIN_LEFT + i * cell_w:.1f}" y="{y}" width="{cell_w + 0.5:.1f}" height="16" '
+                             f'fill="#c92a2a" fill-opacity="{0.08 + 0.92 * math.sqrt(n / peak):.2f}">'
+                             f'<title>{i * window:.0f}s, {bucket_label(HEATMAP_BUCKETS_MS, b)} ms: {n}</title></rect>')
+    for i in range(5):
+        parts.append(f'<text x="{MARGIN_LEFT + plot_w * i / 4:.1f}" y="{height - 8}" text-anchor="middle">'
+                     f'{columns * window * i / 4:.0f}s</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def histogram(dist, baseline=None):
+    """Inline SVG histogram of a latency distribution, baseline outlined"""
+    counts = dist["histogram"]
+    base = baseline["histogram"] if baseline else None
+    total = dist["count"] or 1
+    shares = [n / total for n in counts]
+    base_shares = [n / (baseline["count"] or 1) for n in base] if base else []
+    peak = max(shares + base_shares) or 1.0
+    plot_w = CHART_WIDTH - MARGIN_LEFT - 10
+    plot_h = CHART_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    bar_w = plot_w / len(counts)
+    parts = [f'<svg viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" width="100%">']
+    for i, share in enumerate(shares):
+        height = share / peak * plot_h
+        parts.append(f'<rect x="{MARGIN_LEFT + i * bar_w + 2:.1f}" y="{MARGIN_TOP + plot_h - height:.1f}" '
+                     f'width="{bar_w - 4:.1f}" height="{height:.1f}" fill="{COLORS["rps"]}">'
+                     f'<title>{counts[i]} ({share * 100:.1f}%)</title></rect>'
+                     f'<text x="{MARGIN_LEFT + (i + 0.5) * bar_w:.1f}" y="{CHART_HEIGHT - 8}" text-anchor="middle">'
+                     f'{bucket_label(HISTOGRAM_BUCKETS_MS, i)} ms</text>')
+    for i, share in enumerate(base_shares):
+        height = share / peak * plot_h
+        parts.append(f'<rect x="{MARGIN_LEFT + i * bar_w + 2:.1f}" y="{MARGIN_TOP + plot_h - height:.1f}" '
+                     f'width="{bar_w - 4:.1f}" height="{height:.1f}" fill="none" stroke="#495057" stroke-dasharray="4,3"/>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def delta(current, baseline):
+    """Relative change as a signed percentage cell"""
+    if not baseline:
+        return "<td>-</td>"
+    change = (current - baseline) / baseline * 100
+    css = "fail" if change > 10 else "pass" if change < -10 else ""
+    return f'<td class="{css}">{change:+.0f}%</td>'
+
+
+def render(data, baseline=None):
+    """The complete report page"""
+    meta = data["meta"]
+    window = data["window"]
+    points = data["timeline"]
+    base_points = baseline["timeline"] if baseline else []
+    marker = meta.get("steady_from")
+    title = f"Load test report — run {meta.get('run_id', '')}"
+
+    def series(key, label, dashed=False, source=None):
+        return (label, COLORS[key.split("_")[0]], [(p["t"], p[key]) for p in (source or points)], dashed)
+
+    body = [f"<h1>{html.escape(title)}</h1>",
+            '<p class="meta">' + " · ".join(f"{html.escape(str(k))}: {html.escape(str(v))}" for k, v in meta.items())
+            + "</p>"]
+    if baseline:
+        body.append(f'<p class="meta">Baseline (dashed): run {html.escape(str(baseline["meta"].get("run_id", "?")))} '
+                    f'({html.escape(str(baseline["meta"].get("generated", "")))})</p>')
+
+    body.append(f"<h2>Throughput</h2><p class='meta'>{window:.0f}s windows by request start</p>")
+    throughput = [series("rps", "req/s")]
+    if base_points:
+        throughput.append(series("rps", "baseline req/s", True, base_points))
+    body.append(line_chart(throughput, "req/s", marker))
+
+    body.append("<h2>Latency percentiles</h2>")
+    latency = [series(key, key) for key in ("p50", "p95", "p99")]
+    if base_points:
+        latency += [series(key, f"baseline {key}", True, base_points) for key in ("p50", "p95", "p99")]
+    body.append(line_chart(latency, "ms", marker))
+
+    body.append("<h2>Errors</h2>")
+    body.append(error_chart(points, window))
+
+    base_routes = baseline["routes"] if baseline else {}
+    body.append("<h2>Routes</h2><table><tr><th>Route</th><th>Count</th><th>Errors</th><th>p50 ms</th><th>p95 ms</th>"
+                "<th>p99 ms</th><th>Max ms</th><th>Baseline p95</th><th>Δ p95</th></tr>")
+    for route, stats in data["routes"].items():
+        base = base_routes.get(route, {}).get("p95_ms")
+        body.append(f"<tr><td>{html.escape(route)}</td><td>{stats['count']}</td><td>{stats['errors']}</td>"
+                    f"<td>{stats['p50_ms']:.1f}</td><td>{stats['p95_ms']:.1f}</td><td>{stats['p99_ms']:.1f}</td>"
+                    f"<td>{stats['max_ms']:.1f}</td><td>{f'{base:.1f}' if base else '-'}</td>"
+                    f"{delta(stats['p95_ms'], base)}</tr>")
+    body.append("</table>")
+
+    body.append("<h2>Latency heatmaps</h2>")
+    busiest = sorted(data["heatmaps"].items(), key=lambda item: -data["routes"].get(item[0], {}).get("count", 0))
+    for route, cells in busiest[:MAX_HEATMAP_ROUTES]:
+        body.append(f"<h3>{html.escape(route)}</h3>{heatmap(cells, window)}")
+    if len(busiest) > MAX_HEATMAP_ROUTES:
+        body.append(f'<p class="empty">{len(busiest) - MAX_HEATMAP_ROUTES} quieter routes omitted</p>')
+
+    body.append("<h2>Socket delivery latency</h2>")
+    if not data["deliveries"]:
+        body.append('<p class="empty">No socket delivery measurements in this run</p>')
+    base_deliveries = baseline.get("deliveries", {}) if baseline else {}
+    for name, dist in data["deliveries"].items():
+        body.append(f"<h3>{html.escape(name)}</h3><p class='meta'>{dist['count']} deliveries · p50 {dist['p50']:.1f} ms · "
+                    f"p95 {dist['p95']:.1f} ms · p99 {dist['p99']:.1f} ms · max {dist['max']:.1f} ms</p>")
+        body.append(histogram(dist, base_deliveries.get(name)))
+
+    if data["checks"]:
+        body.append("<h2>Checks</h2><table>")
+        for check in data["checks"]:
+            css, label = ("pass", "PASS") if check["success"] else ("fail", "FAIL")
+            body.append(f'<tr><td>{html.escape(check["test"])}</td><td class="{css}">{label}</td>'
+                        f'<td style="text-align:left">{html.escape(str(check["message"]))}</td></tr>')
+        body.append("</table>")
+
+    # "</" is escaped so the embedded JSON cannot close the script element
+    embedded = json.dumps(data).replace("</", "<\\/")
+    return (f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f"<style>{STYLE}</style></head><body>\n" + "\n".join(body) +
+            f'\n<script type="application/json" id="run-data">{embedded}</script>\n</body></html>\n')
+
+
+def write_report(path, records, test_results, meta, deliveries=None, baseline_path=None):
+    """Write the report for a run; baseline_path is an earlier report to overlay"""
+    meta = {**meta, "generated": datetime.now().isoformat(timespec="seconds")}
+    baseline = load_run_data(baseline_path) if baseline_path else None
+    with open(path, "w") as f:
+        f.write(render(run_data(records, test_results, meta, deliveries), baseline))
+    print(f"📄 HTML report written to {path}" + (f" (baseline {baseline_path})" if baseline_path else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render a report, optionally against a different baseline report")
+    parser.add_argument("report")
+    parser.add_argument("--baseline", help="earlier report to overlay")
+    parser.add_argument("--output", help="default: overwrite the report")
+    args = parser.parse_args()
+
+    data = load_run_data(args.report)
+    baseline = load_run_data(args.baseline) if args.baseline else None
+    with open(args.output or args.report, "w") as f:
+        f.write(render(data, baseline))
+    print(f"📄 HTML report written to {args.output or args.report}")
+
+
+if __name__ == "__main__":
+    main()
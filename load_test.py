@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Load Testing Harness for the TikTok Clone Backend
+Drives concurrent virtual users through API scenarios and records per-request latency
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from harness_profiler import HarnessProfiler
+from html_report import DEFAULT_REPORT, write_report
+from metrics_store import RecordStore
+from network_profiles import DEFAULT_NETWORK_MIX, NETWORK_PROFILES, NetworkShaper
+from payload_profiler import DEFAULT_HISTORY, PayloadProfiler
+from request_tracing import DEFAULT_TRACE_FILE, RequestTracer, correlation_headers, print_slowest
+from resource_sampler import ResourceSampler
+from run_manifest import RunManifest
+from steady_state import DEFAULT_WARMUP, detect_steady_state, split_warmup
+from response_validator import DEFAULT_SAMPLE_RATE, ResponseValidator
+
+# Configuration
+BASE_URL = "http://localhost:3001/api"
+REQUEST_TIMEOUT = 30
+DEFAULT_USERS = 10
+DEFAULT_CONCURRENCY = 10
+DEFAULT_DURATION = 30
+LOAD_USER_PASSWORD = "LoadTest123"
+
+# Scenario weights used by the "mixed" scenario
+SCENARIO_WEIGHTS = {
+    "browse": 6,
+    "stories": 2,
+    "messaging": 2
+}
+# Scenarios run on their own rather than in the "mixed" weights
+SCENARIOS = [*SCENARIO_WEIGHTS, "media", "mixed"]
+STORY_PHOTO_BYTES = 400_000
+FEED_PAGES = 3
+
+
+class LoadTester:
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.users = []
+        self.records = RecordStore()
+        self.test_results = []
+        self.sampler = None
+        self.payload_profiler = None
+        self.validator = None
+        self.harness_profiler = None
+        self.tracer = None
+        self.network_shaper = None
+        self.manifest = None
+        self.warmup = DEFAULT_WARMUP
+        self.recording = True
+        self.t0 = time.perf_counter()
+
+    def clock(self):
+        """Seconds since the tester was created; shared timeline for all records and samples"""
+        return time.perf_counter() - self.t0
+
+    def session(self):
+        """Return the calling thread's HTTP session"""
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "timestamp": datetime.now().isoformat(),
+            "details": details
+        }
+        self.test_results.append(result)
+        cpu = time.thread_time() if self.harness_profiler else 0.0
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+        if self.harness_profiler:
+            self.harness_profiler.add("logging", cpu)
+
+    def record(self, route, status, start, latency, error=None):
+        """Append one latency record to the run timeline"""
+        if not self.recording:
+            return
+        with self.lock:
+            self.records.append(start, route, status, latency, error)
+        if self.network_shaper:
+            self.network_shaper.record(start, route, status, latency, error)
+
+    def reset_records(self):
+        """Swap in an empty record store and return the previous one"""
+        with self.lock:
+            records, self.records = self.records, RecordStore()
+        return records
+
+    def tag(self, scenario, virtual_user):
+        """Label the calling thread's requests with a scenario and virtual user"""
+        self.local.tags = (scenario, virtual_user)
+
+    def request(self, method, route, path, user=None, **kwargs):
+        """Issue a timed request and record it under its route template
+
+        `path` is relative to the API base URL unless it is already an absolute URL.
+        """
+        profiler = self.harness_profiler
+        cpu = time.thread_time() if profiler else 0.0
+        if user is not None:
+            kwargs["headers"] = {**user["headers"], **kwargs.get("headers", {})}
+        correlation = correlation_headers(self.run_id, *getattr(self.local, "tags", ("harness", "-")))
+        kwargs["headers"] = {**kwargs.get("headers", {}), **correlation}
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        if profiler and "json" in kwargs:
+            # Encode here instead of inside requests so the cost can be charged separately
+            cpu = profiler.add("prepare", cpu)
+            kwargs["data"] = json.dumps(kwargs.pop("json"), allow_nan=False).encode()
+            kwargs["headers"] = {"Content-Type": "application/json", **kwargs.get("headers", {})}
+            cpu = profiler.add("json_encode", cpu)
+        elif profiler:
+            cpu = profiler.add("prepare", cpu)
+
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        trace = self.tracer.begin(correlation) if self.tracer else None
+        start = self.clock()
+        try:
+            response = self.session().request(method, url, **kwargs)
+        except requests.RequestException as e:
+            if trace:
+                self.tracer.end(trace, method, route, url, 0, str(e))
+            if profiler:
+                cpu = profiler.add("http_client", cpu)
+            self.record(route, 0, start, self.clock() - start, str(e))
+            if profiler:
+                profiler.add("bookkeeping", cpu)
+                profiler.count()
+            return None
+        latency = self.clock() - start
+        if trace:
+            self.tracer.end(trace, method, route, url, response.status_code)
+            response.json = self.tracer.timed_json(trace, response)
+        if profiler:
+            cpu = profiler.add("http_client", cpu)
+            response.json = profiler.timed_json(response)
+        self.record(route, response.status_code, start, latency)
+        if self.manifest and response.status_code == 201:
+            self.manifest.observe(route, response, user)
+        if self.payload_profiler:
+            self.payload_profiler.observe(route, response)
+        if self.validator:
+            self.validator.submit(route, response)
+        if profiler:
+            profiler.add("bookkeeping", cpu)
+            profiler.count()
+        return response
+
+    def login_user(self, user_data):
+        """Register (or log in) one user and return its harness record"""
+        response = self.request("POST", "POST /auth/register", "/auth/register", json=user_data)
+        if response is None or response.status_code not in [200, 201]:
+            login_data = {"email": user_data["email"], "password": user_data["password"]}
+            response = self.request("POST", "POST /auth/login", "/auth/login", json=login_data)
+            if response is None or response.status_code != 200:
+                return None
+
+        result = response.json()
+        return {
+            "data": user_data,
+            "token": result.get("token"),
+            "user_id": result.get("user", {}).get("id"),
+            "headers": {"Authorization": f"Bearer {result.get('token')}"}
+        }
+
+    def object_id(self, user):
+        """Resolve a user's Mongo _id, which follow and message routes key on instead of the UUID"""
+        if "object_id" not in user:
+            username = user["data"]["username"]
+            response = self.request("GET", "GET /users/search", "/users/search",
+                                    params={"q": f"^{username}$", "limit": 1})
+            matches = response.json().get("users", []) if response is not None and response.status_code == 200 else []
+            user["object_id"] = next((u["_id"] for u in matches if u.get("username") == username), None)
+        return user["object_id"]
+
+    def setup_users(self, count, concurrency=DEFAULT_CONCURRENCY):
+        """Register and login the virtual users for this run"""
+        user_data = [
+            {
+                "username": f"load_{self.run_id}_{i}",
+                "email": f"load_{self.run_id}_{i}@example.com",
+                "password": LOAD_USER_PASSWORD,
+                "displayName": f"Load User {i}"
+            }
+            for i in range(count)
+        ]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            self.users = [u for u in pool.map(self.login_user, user_data) if u]
+
+        self.log_result("Load Users", len(self.users) == count, f"{len(self.users)}/{count} virtual users ready")
+        return self.users
+
+    def peer_of(self, user):
+        """Pick another virtual user to interact with"""
+        peers = [u for u in self.users if u is not user]
+        return random.choice(peers) if peers else user
+
+    def scenario_browse(self, user):
+        """Feed, stories tray, inbox and a profile visit as the app loads them"""
+        self.request("GET", "GET /videos/feed", "/videos/feed?page=1&limit=10", user=user)
+        self.request("GET", "GET /stories/following-stories", "/stories/following-stories", user=user)
+        self.request("GET", "GET /messages/conversations", "/messages/conversations", user=user)
+        username = self.peer_of(user)["data"]["username"]
+        self.request("GET", "GET /users/profile/:username", f"/users/profile/{username}", user=user)
+
+    def scenario_stories(self, user):
+        """Create a text story and view it back"""
+        story_data = {
+            "content": "text",
+            "text": f"Load test story {random.randint(0, 1_000_000)}",
+            "textColor": "#FFFFFF",
+            "backgroundColor": "#FF6B6B",
+            "privacy": "public"
+        }
+        response = self.request("POST", "POST /stories/create", "/stories/create", user=user, json=story_data)
+        if response is not None and response.status_code == 201:
+            story_id = response.json().get("data", {}).get("id")
+            viewer = self.peer_of(user)
+            self.request("POST", "POST /stories/:storyId/view", f"/stories/{story_id}/view", user=viewer)
+        self.request("GET", "GET /stories/my-stories", "/stories/my-stories", user=user)
+
+    def scenario_messaging(self, user):
+        """Send a text message to a peer and load the conversation"""
+        peer = self.peer_of(user)
+        peer_id = self.object_id(peer)
+        message_data = {"recipientId": peer_id, "text": "Load test message 💬"}
+        self.request("POST", "POST /messages/send", "/messages/send", user=user, json=message_data)
+        self.request("GET", "GET /messages/conversation/:userId", f"/messages/conversation/{peer_id}", user=user)
+
+    def scenario_media(self, user):
+        """Photo story upload, a photo message and feed pagination, the transfer-heavy paths on a phone"""
+        if not hasattr(self, "photo"):
+            self.photo = os.urandom(STORY_PHOTO_BYTES)
+        self.request("POST", "POST /stories/create", "/stories/create", user=user, data={"privacy": "public"},
+                     files={"media": ("story.jpg", self.photo, "image/jpeg")})
+        peer_id = self.object_id(self.peer_of(user))
+        self.request("POST", "POST /messages/send-media", "/messages/send-media", user=user,
+                     data={"recipientId": peer_id, "text": "Photo 📷"}, files=[("media", ("photo.jpg", self.photo, "image/jpeg"))])
+        for page in range(1, FEED_PAGES + 1):
+            response = self.request("GET", "GET /videos/feed", f"/videos/feed?page={page}&limit=10", user=user)
+            if response is None or response.status_code != 200 or not response.json().get("hasMore", True):
+                break
+
+    def scenario_mixed(self, user):
+        """Weighted mix of all scenarios"""
+        name = random.choices(list(SCENARIO_WEIGHTS), weights=list(SCENARIO_WEIGHTS.values()))[0]
+        getattr(self, f"scenario_{name}")(user)
+
+    def run_load(self, scenario, duration, concurrency, rate=None):
+        """Run one scenario from `concurrency` virtual-user loops for `duration` seconds
+
+        With `rate`, scenario iterations are paced to that many per second across all
+        loops (open-loop offered load) instead of running back-to-back. Returns the
+        number of iterations started.
+        """
+        iteration = getattr(self, f"scenario_{scenario}")
+        start = self.clock()
+        deadline = start + duration
+        schedule = {"next": start, "iterations": 0}
+
+        def next_slot():
+            """Reserve the next paced start time"""
+            with self.lock:
+                slot = schedule["next"]
+                schedule["next"] += 1.0 / rate
+            return slot
+
+        def worker(index):
+            user = self.users[index % len(self.users)]
+            self.tag(scenario, index)
+            if self.network_shaper:
+                self.network_shaper.assign(index)
+            while self.clock() < deadline:
+                if rate:
+                    slot = next_slot()
+                    if slot >= deadline:
+                        return
+                    delay = slot - self.clock()
+                    if delay > 0:
+                        time.sleep(delay)
+                with self.lock:
+                    schedule["iterations"] += 1
+                try:
+                    iteration(user)
+                except Exception as e:
+                    self.record(f"scenario {scenario}", 0, self.clock(), 0.0, str(e))
+
+        pacing = f" at {rate:.1f} iterations/s" if rate else ""
+        print(f"\n🔥 Running '{scenario}' for {duration}s with {concurrency} virtual users{pacing}...")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+        return schedule["iterations"]
+
+    def print_summary(self, payload_history=None):
+        """Print per-route latency summary"""
+        print("\n" + "=" * 70)
+        print("📊 LOAD TEST SUMMARY")
+        print("=" * 70)
+
+        if not self.records:
+            print("No requests recorded")
+            return
+
+        # Cold-start requests (JIT, connection pools, caches) are reported apart from the steady state
+        cold, steady, steady_from = split_warmup(self.records, self.warmup)
+        origin = self.records.start_time()
+        end = origin + self.records.span()
+        if steady_from is None:
+            window = f"whole run, {origin:.1f}–{end:.1f}s; no steady state detected"
+            print(f"⚠️ No steady state detected after the {self.warmup:.0f}s minimum warm-up; figures include cold start")
+        else:
+            window = f"steady state, {steady_from:.1f}–{end:.1f}s"
+            cold_stats, steady_stats = cold.summary(), steady.summary()
+            print(f"{'Phase':<34} {'Count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for label, stats in [(f"Cold start ({origin:.1f}–{steady_from:.1f}s)", cold_stats),
+                                 (f"Steady state ({steady_from:.1f}–{end:.1f}s)", steady_stats)]:
+                print(f"{label:<34} {stats['count']:>7} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+            print()
+
+        total = steady.summary()
+        print(f"Total Requests: {total['count']} ({window})")
+        print(f"Throughput: {total['rps']:.1f} req/s")
+        print(f"Errors: {total['errors']} ({total['error_rate'] * 100:.2f}%)")
+        print(f"Record store: {self.records.nbytes() / len(self.records):.0f} bytes/sample")
+
+        print(f"\n{'Route':<40} {'Count':>7} {'Err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for route, records in sorted(steady.by_route().items()):
+            stats = records.summary()
+            print(f"{route:<40} {stats['count']:>7} {stats['errors']:>5} "
+                  f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+
+        if self.sampler:
+            self.sampler.print_report(self.records)
+
+        if self.payload_profiler:
+            self.payload_profiler.print_report(payload_history)
+
+        if self.validator:
+            self.validator.print_report()
+
+        if self.harness_profiler:
+            self.harness_profiler.print_report(total)
+
+        if self.network_shaper:
+            self.network_shaper.print_report()
+
+        if self.tracer:
+            print_slowest(self.tracer.path)
+
+        print("\n🎯 LOAD TESTING COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the TikTok Clone backend")
+    parser.add_argument("--scenario", default="mixed", choices=SCENARIOS)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP,
+                        help="minimum seconds treated as cold start before steady-state detection")
+    parser.add_argument("--sample-resources", action="store_true",
+                        help="sample the local Node server's CPU, RSS, FDs and /health lag during the run")
+    parser.add_argument("--server-pid", type=int, help="Node server PID (default: process listening on the API port)")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--profile-payloads", action="store_true",
+                        help="record per-route response size, sampled gzip size and scenario JSON decode time")
+    parser.add_argument("--dataset-size", type=int,
+                        help="size of the seeded dataset (e.g. user count); saves payload sizes for growth analysis")
+    parser.add_argument("--payload-history", default=DEFAULT_HISTORY)
+    parser.add_argument("--profile-harness", action="store_true",
+                        help="account the harness's own CPU per request by phase and warn if the client is the bottleneck")
+    parser.add_argument("--trace-file", nargs="?", const=DEFAULT_TRACE_FILE, metavar="PATH",
+                        help=f"export client spans as OTLP/JSON lines (default {DEFAULT_TRACE_FILE})")
+    parser.add_argument("--validate", type=float, nargs="?", const=DEFAULT_SAMPLE_RATE, metavar="RATE",
+                        help=f"validate a sample of responses in the background (default rate {DEFAULT_SAMPLE_RATE})")
+    parser.add_argument("--network", nargs="?", const=DEFAULT_NETWORK_MIX, metavar="MIX",
+                        help=f"shape each virtual user's connection with a phone network profile, e.g. "
+                             f"{DEFAULT_NETWORK_MIX} (profiles: {', '.join(NETWORK_PROFILES)})")
+    parser.add_argument("--html-report", nargs="?", const=DEFAULT_REPORT, metavar="PATH",
+                        help=f"write a self-contained HTML report (default {DEFAULT_REPORT})")
+    parser.add_argument("--baseline-report", metavar="PATH", help="earlier HTML report to overlay as the baseline")
+    parser.add_argument("--manifest", nargs="?", const="", metavar="PATH",
+                        help="record created entities for teardown.py (default run_manifests/<run id>.jsonl)")
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    tester.warmup = args.warmup
+    if args.manifest is not None:
+        tester.manifest = RunManifest(tester.run_id, args.manifest or None)
+    if args.network:
+        tester.network_shaper = NetworkShaper(args.network)
+    if args.trace_file:
+        tester.tracer = RequestTracer(tester.run_id, args.trace_file)
+    if args.profile_payloads:
+        tester.payload_profiler = PayloadProfiler()
+    if args.validate:
+        tester.validator = ResponseValidator(args.validate)
+    print("🚀 Starting Backend Load Test")
+    print("=" * 70)
+
+    print("\n📋 Setting up virtual users...")
+    if not tester.setup_users(args.users, args.concurrency):
+        print("❌ No virtual users available, aborting load test")
+        return
+
+    if args.sample_resources:
+        tester.sampler = ResourceSampler(tester.clock, args.base_url, pid=args.server_pid,
+                                         interval=args.sample_interval)
+        tester.sampler.start()
+    if args.profile_harness:
+        # Created after user setup so only the measured run is charged
+        tester.harness_profiler = HarnessProfiler(tester.clock)
+        tester.harness_profiler.start()
+    try:
+        tester.run_load(args.scenario, args.duration, args.concurrency)
+    finally:
+        if tester.harness_profiler:
+            tester.harness_profiler.stop()
+        if tester.sampler:
+            tester.sampler.stop()
+        if tester.validator:
+            tester.validator.stop()
+        if tester.payload_profiler:
+            tester.payload_profiler.stop()
+        if tester.tracer:
+            tester.tracer.close()
+        if tester.manifest:
+            tester.manifest.close()
+
+    payload_history = None
+    if tester.payload_profiler and args.dataset_size:
+        payload_history = tester.payload_profiler.save(args.payload_history, args.dataset_size)
+    tester.print_summary(payload_history)
+
+    if args.html_report and tester.records:
+        steady_from = detect_steady_state(tester.records, tester.warmup)
+        meta = {
+            "run_id": tester.run_id,
+            "scenario": args.scenario,
+            "users": len(tester.users),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "base_url": args.base_url
+        }
+        if steady_from is not None:
+            meta["steady_from"] = round(steady_from - tester.records.start_time(), 1)
+        write_report(args.html_report, tester.records, tester.test_results, meta, baseline_path=args.baseline_report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Multi-file and Voice-message Upload Benchmark
+Sends 1–10 attachments per message and streamed voice clips under concurrency and measures upload cost on the server
+"""
+
+import argparse
+import json
+import os
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from resource_sampler import ResourceSampler
+from run_manifest import RunManifest
+from seed_data import DEFAULT_SEED, user_spec
+
+# Configuration
+DEFAULT_ATTACHMENTS = [1, 2, 5, 10]
+DEFAULT_VOICE_DURATIONS = [5, 15, 30, 60, 120]
+DEFAULT_REQUESTS = 40
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PAIRS = 8
+MAX_ATTACHMENTS = 10
+VOICE_BYTES_PER_SECOND = 3_000  # 24 kbps Opus, typical for voice notes
+VOICE_WAVEFORM_POINTS = 50
+STREAM_CHUNK = 16 * 1024
+SAMPLE_INTERVAL = 0.25
+
+# (extension, mimetype, bytes, weight) of a typical camera-roll selection
+ATTACHMENT_TYPES = [
+    ("jpg", "image/jpeg", 400_000, 6),
+    ("png", "image/png", 900_000, 2),
+    ("mp4", "video/mp4", 3_000_000, 2)
+]
+
+
+def multipart_stream(boundary, fields, file_field, filename, mimetype, payload, chunk=STREAM_CHUNK):
+    """Yield a multipart/form-data body in chunks so the file is sent with chunked transfer encoding"""
+    for name, value in fields.items():
+        yield f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+    yield (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+           f"Content-Type: {mimetype}\r\n\r\n").encode()
+    for offset in range(0, len(payload), chunk):
+        yield payload[offset:offset + chunk]
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+class MediaUploadTester:
+    def __init__(self, tester, seed=DEFAULT_SEED, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.seed = seed
+        self.concurrency = concurrency
+        self.rng = random.Random(f"{seed}:media")
+        self.payload = os.urandom(max(size for _, _, size, _ in ATTACHMENT_TYPES))
+        self.pairs = []
+        self.results = []
+
+    def setup(self, pair_count):
+        """Log in sender/recipient pairs and resolve each recipient's _id"""
+        def login_pair(index):
+            sender = self.tester.login_user(user_spec(self.seed, 2 * index))
+            recipient = self.tester.login_user(user_spec(self.seed, 2 * index + 1))
+            if sender is None or recipient is None or self.tester.object_id(recipient) is None:
+                return None
+            return sender, recipient
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self.pairs = [p for p in pool.map(login_pair, range(pair_count)) if p]
+        self.tester.log_result("Media Upload - Setup", len(self.pairs) == pair_count,
+                               f"{len(self.pairs)}/{pair_count} sender/recipient pairs ready")
+        return self.pairs
+
+    def attachments(self, count):
+        """Pick `count` attachments from the camera-roll mix"""
+        picks = self.rng.choices(ATTACHMENT_TYPES, weights=[t[3] for t in ATTACHMENT_TYPES], k=count)
+        return [(f"attachment_{i}.{ext}", mimetype, size) for i, (ext, mimetype, size, _) in enumerate(picks)]
+
+    def send_media(self, pair, count):
+        """Send one message with `count` attachments; returns (bytes sent, media URLs)"""
+        sender, recipient = pair
+        files = [("media", (name, self.payload[:size], mimetype)) for name, mimetype, size in self.attachments(count)]
+        response = self.tester.request("POST", "POST /messages/send-media", "/messages/send-media", user=sender,
+                                       data={"recipientId": self.tester.object_id(recipient),
+                                             "text": f"{count} attachments 📎"}, files=files)
+        sent = sum(len(f[1][1]) for f in files)
+        if response is None or response.status_code != 201:
+            return sent, []
+        data = response.json().get("data", {})
+        media = data.get("mediaGroup") or ([data["media"]] if data.get("media") else [])
+        return sent, [m.get("url") for m in media if m.get("url")]
+
+    def send_voice(self, pair, duration):
+        """Stream one voice note of `duration` seconds; returns (bytes sent, media URLs)"""
+        sender, recipient = pair
+        payload = self.payload[:duration * VOICE_BYTES_PER_SECOND]
+        waveform = [round(self.rng.random(), 2) for _ in range(VOICE_WAVEFORM_POINTS)]
+        boundary = uuid.uuid4().hex
+        fields = {"recipientId": self.tester.object_id(recipient), "duration": duration, "visualData": json.dumps(waveform)}
+        body = multipart_stream(boundary, fields, "voice", f"voice_{duration}s.ogg", "audio/ogg", payload)
+        response = self.tester.request("POST", "POST /messages/send-voice", "/messages/send-voice", user=sender,
+                                       data=body, headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+        if response is None or response.status_code != 201:
+            return len(payload), []
+        url = response.json().get("data", {}).get("voiceNote", {}).get("url")
+        return len(payload), [url] if url else []
+
+    def measure(self, kind, size, requests_per_level):
+        """Run one level (attachment count or voice duration) concurrently"""
+        route = "POST /messages/send-media" if kind == "attachments" else "POST /messages/send-voice"
+        send = self.send_media if kind == "attachments" else self.send_voice
+        sampler = self.tester.sampler
+        level_start = self.tester.clock()
+        mark = len(self.tester.records)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            outcomes = list(pool.map(lambda i: send(self.pairs[i % len(self.pairs)], size), range(requests_per_level)))
+        stats = self.tester.records[mark:].select(route=route).summary()
+
+        files_per_request = size if kind == "attachments" else 1
+        span = (self.tester.clock() - level_start) or 1.0
+        result = {
+            "kind": kind,
+            "size": size,
+            "stats": stats,
+            "mb_per_request": sum(sent for sent, _ in outcomes) / len(outcomes) / 1_000_000,
+            "files_per_s": stats["count"] * files_per_request / span,
+            "mb_per_s": sum(sent for sent, _ in outcomes) / span / 1_000_000,
+            "per_file_ms": stats["p50_ms"] / files_per_request,
+            "urls": [url for _, urls in outcomes for url in urls]
+        }
+
+        # Server memory and CPU while this level was in flight
+        if sampler and sampler.samples:
+            baseline = sampler.samples[sampler.nearest(level_start)]["rss_mb"]
+            window = [s for s in sampler.samples if s["t"] >= level_start]
+            if window:
+                result["rss_delta_mb"] = max(s["rss_mb"] for s in window) - baseline
+                result["cpu_pct"] = sum(s["cpu"] for s in window) / len(window)
+        self.results.append(result)
+
+        label = f"{size} files" if kind == "attachments" else f"{size}s voice"
+        print(f"   {label:<10} p50 {stats['p50_ms']:.1f} ms p99 {stats['p99_ms']:.1f} ms, "
+              f"{result['files_per_s']:.1f} files/s, {result['mb_per_s']:.1f} MB/s, errors {stats['errors']}")
+        return result
+
+    def print_summary(self):
+        """Print per-level upload throughput and server cost"""
+        print("\n" + "=" * 70)
+        print("📊 MEDIA UPLOAD SUMMARY")
+        print("=" * 70)
+        print(f"{'Level':<12} {'MB/req':>7} {'p50 ms':>8} {'p99 ms':>8} {'ms/file':>8} {'Files/s':>8} "
+              f"{'MB/s':>6} {'ΔRSS MB':>8} {'CPU %':>6} {'Errors':>7}")
+        for r in self.results:
+            label = f"{r['size']} files" if r["kind"] == "attachments" else f"{r['size']}s voice"
+            rss = f"{r['rss_delta_mb']:>8.1f}" if "rss_delta_mb" in r else f"{'-':>8}"
+            cpu = f"{r['cpu_pct']:>6.0f}" if "cpu_pct" in r else f"{'-':>6}"
+            print(f"{label:<12} {r['mb_per_request']:>7.2f} {r['stats']['p50_ms']:>8.1f} {r['stats']['p99_ms']:>8.1f} "
+                  f"{r['per_file_ms']:>8.1f} {r['files_per_s']:>8.1f} {r['mb_per_s']:>6.1f} {rss} {cpu} "
+                  f"{r['stats']['errors']:>7}")
+
+        for kind in ("attachments", "voice"):
+            levels = [r for r in self.results if r["kind"] == kind]
+            if levels:
+                errors = sum(r["stats"]["errors"] for r in levels)
+                self.tester.log_result(f"Media Upload - {kind.capitalize()}", errors == 0,
+                                       f"{sum(r['stats']['count'] for r in levels)} uploads, {errors} errors")
+        print("\n🎯 MEDIA UPLOAD BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-file media messages and streamed voice notes")
+    parser.add_argument("--attachments", default=",".join(map(str, DEFAULT_ATTACHMENTS)),
+                        help=f"comma-separated attachment counts (1–{MAX_ATTACHMENTS}); empty to skip")
+    parser.add_argument("--voice-durations", default=",".join(map(str, DEFAULT_VOICE_DURATIONS)),
+                        help="comma-separated voice note durations in seconds; empty to skip")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="uploads per level")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS, help="sender/recipient pairs of seeded users")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--sample-resources", action="store_true",
+                        help="sample the local Node server's RSS and CPU per level")
+    parser.add_argument("--server-pid", type=int, help="Node server PID (default: process listening on the API port)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--manifest", nargs="?", const="", metavar="PATH",
+                        help="record created stories, messages and uploads for teardown.py")
+    args = parser.parse_args()
+
+    attachment_levels = [min(MAX_ATTACHMENTS, int(n)) for n in args.attachments.split(",") if n]
+    voice_levels = [int(d) for d in args.voice_durations.split(",") if d]
+    tester = LoadTester(args.base_url)
+    if args.manifest is not None:
+        tester.manifest = RunManifest(tester.run_id, args.manifest or None)
+    print("🚀 Starting Media Upload Benchmark")
+    print("=" * 70)
+
+    benchmark = MediaUploadTester(tester, args.seed, args.concurrency)
+    if not benchmark.setup(args.pairs):
+        return
+
+    if args.sample_resources:
+        tester.sampler = ResourceSampler(tester.clock, args.base_url, pid=args.server_pid, interval=SAMPLE_INTERVAL)
+        tester.sampler.start()
+    try:
+        if attachment_levels:
+            print(f"\n📎 Multi-attachment messages ({args.requests} per level)")
+            for count in attachment_levels:
+                benchmark.measure("attachments", count, args.requests)
+        if voice_levels:
+            print(f"\n🎙️ Streamed voice notes ({args.requests} per level)")
+            for duration in voice_levels:
+                benchmark.measure("voice", duration, args.requests)
+    finally:
+        if tester.sampler:
+            tester.sampler.stop()
+        if tester.manifest:
+            tester.manifest.close()
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
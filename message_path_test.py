@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+REST vs Socket.io Messaging Path Benchmark
+Sends the same message volume through POST /messages/send and the send_message socket relay and compares ack, delivery and server cost
+"""
+
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+
+from html_report import write_report
+from load_test import BASE_URL, LoadTester
+from metrics_store import nearest_rank
+from resource_sampler import ResourceSampler
+
+# Configuration
+DEFAULT_MESSAGES = 500
+DEFAULT_PAIRS = 10
+DEFAULT_CONCURRENCY = 10
+DELIVERY_TIMEOUT = 10.0
+SAMPLE_INTERVAL = 0.5
+NONCE_PREFIX = "path-bench:"
+
+# REST persists then io.emit()s new_message to every socket; the socket relay only forwards to the joined recipient
+PATHS = {
+    "rest": "POST /messages/send",
+    "socket": "EMIT send_message"
+}
+
+
+class MessagePathTester:
+    def __init__(self, tester, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.socket_url = tester.base_url.rsplit("/api", 1)[0]
+        self.pairs = []
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.sent = {}
+        self.pending = set()
+        self.deliveries = {path: [] for path in PATHS}
+        self.overheard = dict.fromkeys(PATHS, 0)
+        self.nonces = itertools.count()
+        self.results = {}
+
+    def listen(self, user):
+        """Connect one user's socket, join under its _id and time every new_message it receives"""
+        client = socketio.Client(reconnection=False)
+        me = self.tester.object_id(user)
+
+        @client.on("new_message")
+        def new_message(data):
+            received = self.tester.clock()
+            text = (data.get("message") or data).get("text", "") if isinstance(data, dict) else ""
+            if not text.startswith(NONCE_PREFIX):
+                return
+            with self.lock:
+                if text not in self.sent:
+                    return
+                path, sent, recipient = self.sent[text]
+                if recipient != me:
+                    # REST broadcasts to every connected client, not only the recipient
+                    self.overheard[path] += 1
+                elif text in self.pending:
+                    self.pending.remove(text)
+                    self.deliveries[path].append((received - sent) * 1000)
+
+        client.connect(self.socket_url, transports=["websocket"])
+        client.emit("join", me)
+        self.clients[me] = client
+
+    def setup(self, pair_count):
+        """Create sender/recipient pairs and connect every user's socket"""
+        users = self.tester.setup_users(2 * pair_count, self.concurrency)
+        if len(users) < 2:
+            return []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self.listen, users))
+        self.pairs = [(users[i], users[i + 1]) for i in range(0, len(users) - 1, 2)]
+        self.tester.log_result("Message Paths - Setup", len(self.clients) == len(users),
+                               f"{len(self.pairs)} pairs, {len(self.clients)} sockets joined")
+        return self.pairs
+
+    def send(self, path, index):
+        """Send one message through a path; the nonce in the text matches it to its delivery"""
+        sender, recipient = self.pairs[index % len(self.pairs)]
+        recipient_id = self.tester.object_id(recipient)
+        text = f"{NONCE_PREFIX}{next(self.nonces)}"
+        start = self.tester.clock()
+        with self.lock:
+            self.sent[text] = (path, start, recipient_id)
+            self.pending.add(text)
+        if path == "rest":
+            self.tester.request("POST", PATHS[path], "/messages/send", user=sender,
+                                json={"recipientId": recipient_id, "text": text})
+            return
+        client = self.clients[self.tester.object_id(sender)]
+        try:
+            # The relay has no ack or persistence, so the sender only learns the frame was written
+            client.emit("send_message", {"recipientId": recipient_id, "senderId": self.tester.object_id(sender),
+                                         "text": text})
+            self.tester.record(PATHS[path], 200, start, self.tester.clock() - start)
+        except socketio.exceptions.SocketIOError as e:
+            self.tester.record(PATHS[path], 0, start, self.tester.clock() - start, str(e))
+
+    def measure(self, path, total):
+        """Send `total` messages through one path and wait for their deliveries"""
+        print(f"\n📨 {path}: sending {total} messages with {self.concurrency} concurrent senders...")
+        mark = len(self.tester.records)
+        start = self.tester.clock()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(lambda i: self.send(path, i), range(total)))
+        deadline = time.perf_counter() + DELIVERY_TIMEOUT
+        while time.perf_counter() < deadline:
+            with self.lock:
+                if not self.pending:
+                    break
+            time.sleep(0.05)
+        end = self.tester.clock()
+        with self.lock:
+            lost, self.pending = self.pending, set()
+
+        ack = self.tester.records[mark:].select(route=PATHS[path]).summary()
+        delivered = self.deliveries[path]
+        sampler = self.tester.sampler
+        window = [s["cpu"] for s in (sampler.samples if sampler else []) if start < s["t"] <= end]
+        cpu = sum(window) / len(window) if window else None
+        result = {
+            "ack": ack,
+            "delivered": len(delivered),
+            "lost": len(lost),
+            "overheard": self.overheard[path],
+            "delivery_p50": nearest_rank(sorted(delivered), 50),
+            "delivery_p95": nearest_rank(sorted(delivered), 95),
+            "delivery_p99": nearest_rank(sorted(delivered), 99),
+            "cpu": cpu,
+            "cpu_ms": cpu / 100 * (end - start) / total * 1000 if cpu is not None and total else None
+        }
+        self.results[path] = result
+        print(f"   ack p50 {ack['p50_ms']:.1f} ms, delivery p50 {result['delivery_p50']:.1f} ms "
+              f"p99 {result['delivery_p99']:.1f} ms, {result['delivered']}/{total} delivered, "
+              f"{result['overheard']} copies to other clients")
+        return result
+
+    def close(self):
+        """Disconnect every socket"""
+        for client in self.clients.values():
+            client.disconnect()
+
+    def print_summary(self):
+        """Print the per-path comparison"""
+        print("\n" + "=" * 70)
+        print("📊 MESSAGING PATH SUMMARY")
+        print("=" * 70)
+        print(f"{'Path':<8} {'Ack p50':>8} {'Ack p99':>8} {'Dlv p50':>8} {'Dlv p95':>8} {'Dlv p99':>8} "
+              f"{'Lost':>6} {'Overheard':>10} {'CPU ms/msg':>11}")
+        for path, r in self.results.items():
+            cpu_ms = f"{r['cpu_ms']:>11.2f}" if r["cpu_ms"] is not None else f"{'-':>11}"
+            print(f"{path:<8} {r['ack']['p50_ms']:>8.1f} {r['ack']['p99_ms']:>8.1f} {r['delivery_p50']:>8.1f} "
+                  f"{r['delivery_p95']:>8.1f} {r['delivery_p99']:>8.1f} {r['lost']:>6} {r['overheard']:>10} {cpu_ms}")
+        print("Ack: REST is the HTTP response after persisting; the socket relay has no ack, only the emit hand-off.")
+
+        for path, r in self.results.items():
+            self.tester.log_result(f"Message Paths - {path}", not r["lost"] and not r["overheard"],
+                                   f"{r['lost']} lost, {r['overheard']} delivered to clients other than the recipient")
+        if len(self.results) == len(PATHS) and all(r["delivered"] for r in self.results.values()):
+            faster = min(PATHS, key=lambda p: self.results[p]["delivery_p95"])
+            print(f"\n⚡ Lower delivery p95: {faster}; only REST persists the message and reaches offline recipients")
+        print("\n🎯 MESSAGING PATH BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare REST and Socket.io messaging paths")
+    parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="messages per path")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS, help="sender/recipient pairs, all connected")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--paths", default=",".join(PATHS), help=f"comma-separated from {', '.join(PATHS)}")
+    parser.add_argument("--server-pid", type=int, help="Node server PID (default: process listening on the API port)")
+    parser.add_argument("--html-report", metavar="PATH", help="also write an HTML report with delivery histograms")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Messaging Path Benchmark")
+    print("=" * 70)
+
+    benchmark = MessagePathTester(tester, args.concurrency)
+    print("\n📋 Connecting users...")
+    if not benchmark.setup(args.pairs):
+        print("❌ No sender/recipient pairs available, aborting messaging path benchmark")
+        return
+
+    tester.sampler = ResourceSampler(tester.clock, args.base_url, pid=args.server_pid, interval=SAMPLE_INTERVAL)
+    tester.sampler.start()
+    try:
+        for path in (p.strip() for p in args.paths.split(",")):
+            benchmark.measure(path, args.messages)
+    finally:
+        tester.sampler.stop()
+        benchmark.close()
+    benchmark.print_summary()
+
+    if args.html_report:
+        meta = {"run_id": tester.run_id, "benchmark": "messaging paths", "messages": args.messages,
+                "pairs": len(benchmark.pairs), "concurrency": args.concurrency, "base_url": args.base_url}
+        deliveries = {f"{path} → recipient": values for path, values in benchmark.deliveries.items() if values}
+        write_report(args.html_report, tester.records, tester.test_results, meta, deliveries)
+
+
+if __name__ == "__main__":
+    main()
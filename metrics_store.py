@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact Columnar Record Store for Load Tests
+Keeps per-request samples in typed arrays with interned route IDs, about 20 bytes per sample
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # aggregation falls back to pure Python
+    np = None
+
+# Configuration
+NS_PER_S = 1_000_000_000
+
+# Column typecodes: start and latency in integer nanoseconds, HTTP status, interned route ID
+COLUMNS = {
+    "t_ns": "q",
+    "latency_ns": "q",
+    "status": "H",
+    "route_id": "H"
+}
+
+
+def nearest_rank(ordered, pct):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not len(ordered):
+        return 0
+    return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))]
+
+
+class RouteTable:
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def intern(self, route):
+        """Return the numeric ID for a route template, assigning one on first use"""
+        route_id = self.ids.get(route)
+        if route_id is None:
+            route_id = self.ids[route] = len(self.names)
+            self.names.append(route)
+        return route_id
+
+
+class Record:
+    """One request, materialised from the columns on demand"""
+    __slots__ = ("t", "route", "status", "latency", "error")
+
+    def __init__(self, t, route, status, latency, error=None):
+        self.t = t
+        self.route = route
+        self.status = status
+        self.latency = latency
+        self.error = error
+
+
+class RecordStore:
+    def __init__(self, routes=None):
+        self.routes = routes if routes is not None else RouteTable()
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        # Errors are rare, so their messages are kept sparsely by row
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.columns["t_ns"])
+
+    def append(self, t, route, status, latency, error=None):
+        """Append one request; t and latency are in seconds on the tester clock"""
+        if error:
+            self.errors[len(self)] = error
+        self.columns["t_ns"].append(int(t * NS_PER_S))
+        self.columns["latency_ns"].append(int(latency * NS_PER_S))
+        self.columns["status"].append(status)
+        self.columns["route_id"].append(self.routes.intern(route))
+
+    def row(self, index):
+        """Materialise one row as a Record"""
+        c = self.columns
+        return Record(c["t_ns"][index] / NS_PER_S, self.routes.names[c["route_id"][index]], c["status"][index],
+                      c["latency_ns"][index] / NS_PER_S, self.errors.get(index))
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self.row(key if key >= 0 else len(self) + key)
+        start, stop, step = key.indices(len(self))
+        view = RecordStore(self.routes)
+        view.columns = {name: column[key] for name, column in self.columns.items()}
+        view.errors = {(i - start) // step: e for i, e in self.errors.items() if i in range(start, stop, step)}
+        return view
+
+    def take(self, rows):
+        """New store with only the given row indices"""
+        view = RecordStore(self.routes)
+        if not len(rows):
+            return view
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            view.columns = {name: array(column.typecode, self.column(name)[rows].tobytes())
+                            for name, column in self.columns.items()}
+            rows = rows.tolist()
+        else:
+            view.columns = {name: array(column.typecode, (column[i] for i in rows))
+                            for name, column in self.columns.items()}
+        view.errors = {new: self.errors[old] for new, old in enumerate(rows) if old in self.errors}
+        return view
+
+    def column(self, name):
+        """A column as a zero-copy numpy array when numpy is available, else the raw typed array"""
+        column = self.columns[name]
+        return np.frombuffer(column, dtype=column.typecode) if np is not None and len(column) else column
+
+    def select(self, route=None, prefix=None, since=None, until=None, min_latency=None):
+        """Rows matching an exact route or route prefix, starting in [since, until) and/or at least `min_latency` seconds long"""
+        route_ids = None
+        if route is not None or prefix is not None:
+            route_ids = [i for i, name in enumerate(self.routes.names)
+                         if (route is None or name == route) and (prefix is None or name.startswith(prefix))]
+        since_ns = None if since is None else int(since * NS_PER_S)
+        until_ns = None if until is None else int(until * NS_PER_S)
+        min_latency_ns = None if min_latency is None else int(min_latency * NS_PER_S)
+
+        if np is not None and len(self):
+            mask = np.ones(len(self), dtype=bool)
+            if route_ids is not None:
+                mask &= np.isin(self.column("route_id"), route_ids)
+            if since_ns is not None:
+                mask &= self.column("t_ns") >= since_ns
+            if until_ns is not None:
+                mask &= self.column("t_ns") < until_ns
+            if min_latency_ns is not None:
+                mask &= self.column("latency_ns") >= min_latency_ns
+            return self.take(np.flatnonzero(mask))
+
+        route_ids = None if route_ids is None else set(route_ids)
+        ids, starts, latencies = self.columns["route_id"], self.columns["t_ns"], self.columns["latency_ns"]
+        return self.take([i for i in range(len(self))
+                          if (route_ids is None or ids[i] in route_ids)
+                          and (since_ns is None or starts[i] >= since_ns)
+                          and (until_ns is None or starts[i] < until_ns)
+                          and (min_latency_ns is None or latencies[i] >= min_latency_ns)])
+
+    def by_route(self):
+        """Split the store into one store per route template"""
+        return {self.routes.names[route_id]: self.select(route=self.routes.names[route_id])
+                for route_id in sorted(set(self.columns["route_id"]))}
+
+    def latencies_ms(self):
+        """Sorted latencies in milliseconds"""
+        if np is not None and len(self):
+            return np.sort(self.column("latency_ns")) / 1e6
+        return sorted(latency / 1e6 for latency in self.columns["latency_ns"])
+
+    def error_count(self):
+        """Requests that failed or returned a non-2xx/3xx status"""
+        if np is not None and len(self):
+            status = self.column("status")
+            return int(((status < 200) | (status >= 400)).sum())
+        return sum(1 for status in self.columns["status"] if not 200 <= status < 400)
+
+    def start_time(self):
+        """Seconds of the earliest request start"""
+        if not len(self):
+            return 0.0
+        starts = self.column("t_ns")
+        return int(starts.min() if np is not None else min(starts)) / NS_PER_S
+
+    def span(self):
+        """Seconds from the first request start to the last request end"""
+        if not len(self):
+            return 0.0
+        starts, latencies = self.column("t_ns"), self.column("latency_ns")
+        if np is not None:
+            return int((starts + latencies).max() - starts.min()) / NS_PER_S
+        return (max(t + latency for t, latency in zip(starts, latencies)) - min(starts)) / NS_PER_S
+
+    def summary(self):
+        """Count, error rate, throughput and latency percentiles (ms)"""
+        count = len(self)
+        latencies = self.latencies_ms()
+        errors = self.error_count()
+        span = self.span()
+        total = float(latencies.sum() if np is not None and count else sum(latencies))
+        return {
+            "count": count,
+            "errors": errors,
+            "error_rate": errors / count if count else 0.0,
+            "rps": count / span if span else 0.0,
+            "mean_ms": total / count if count else 0.0,
+            "p50_ms": float(nearest_rank(latencies, 50)),
+            "p95_ms": float(nearest_rank(latencies, 95)),
+            "p99_ms": float(nearest_rank(latencies, 99)),
+            "max_ms": float(latencies[-1]) if count else 0.0
+        }
+
+    def nbytes(self):
+        """Memory held by the columns"""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
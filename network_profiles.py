@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Per-virtual-user Mobile Network Profiles
+Shapes each virtual user's connections client-side with the RTT, bandwidth and loss of a phone network class
+"""
+
+import io
+import math
+import random
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection
+
+from metrics_store import RecordStore
+
+# Configuration
+DEFAULT_NETWORK_MIX = "3g:2,lte:5,flaky-wifi:3"
+SHAPE_CHUNK = 8 * 1024
+PACKET_BYTES = 1460
+MIN_RTO = 0.2
+FOCUS_ROUTES = ["POST /stories/create", "POST /messages/send-media", "GET /videos/feed"]
+
+# rtt/jitter in ms, down/up in kbit/s, loss as per-packet probability (paid as a retransmission timeout)
+NETWORK_PROFILES = {
+    "wifi": {"rtt": 20, "jitter": 5, "down": 30_000, "up": 10_000, "loss": 0.0},
+    "lte": {"rtt": 60, "jitter": 20, "down": 12_000, "up": 4_000, "loss": 0.0},
+    "3g": {"rtt": 200, "jitter": 60, "down": 1_600, "up": 500, "loss": 0.0},
+    "flaky-wifi": {"rtt": 40, "jitter": 120, "down": 4_000, "up": 1_500, "loss": 0.02}
+}
+
+# The calling thread's profile; virtual users are pinned to threads so pooled connections stay shaped
+shaping = threading.local()
+
+
+def parse_mix(spec):
+    """Parse "3g:2,lte:5" into [(profile, weight)]; a bare name has weight 1"""
+    mix = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition(":")
+        if name not in NETWORK_PROFILES:
+            raise ValueError(f"unknown network profile {name!r}; choose from {', '.join(NETWORK_PROFILES)}")
+        mix.append((name, int(weight or 1)))
+    return mix
+
+
+def round_trip(profile):
+    """One RTT in seconds with jitter"""
+    return max(0.0, random.gauss(profile["rtt"], profile["jitter"])) / 1000
+
+
+class ShapedSocket:
+    """Socket wrapper pacing sends/receives to the profile's bandwidth and adding an RTT per response"""
+
+    def __init__(self, sock, profile):
+        self.sock = sock
+        self.profile = profile
+        self.awaiting_response = False
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+    def pace(self, size, kbps):
+        """Sleep for the wire time of `size` bytes plus any retransmission timeouts"""
+        delay = size * 8 / (kbps * 1000)
+        loss = self.profile["loss"]
+        if loss and random.random() < 1 - (1 - loss) ** math.ceil(size / PACKET_BYTES):
+            delay += max(MIN_RTO, 2 * self.profile["rtt"] / 1000)
+        time.sleep(delay)
+
+    def sendall(self, data, flags=0):
+        view = memoryview(data).cast("B")
+        for offset in range(0, len(view), SHAPE_CHUNK):
+            piece = view[offset:offset + SHAPE_CHUNK]
+            self.sock.sendall(piece, flags)
+            self.pace(len(piece), self.profile["up"])
+        self.awaiting_response = True
+
+    def send(self, data, flags=0):
+        self.sendall(data, flags)
+        return len(data)
+
+    def recv_into(self, buffer, nbytes=0, flags=0):
+        if self.awaiting_response:
+            self.awaiting_response = False
+            time.sleep(round_trip(self.profile))
+        view = memoryview(buffer).cast("B")
+        received = self.sock.recv_into(view[:min(nbytes or len(view), SHAPE_CHUNK)], 0, flags)
+        self.pace(received, self.profile["down"])
+        return received
+
+    def recv(self, bufsize, flags=0):
+        buffer = bytearray(min(bufsize, SHAPE_CHUNK))
+        return bytes(buffer[:self.recv_into(buffer, 0, flags)])
+
+    def makefile(self, mode="r", buffering=None, **kwargs):
+        # http.client reads responses through makefile("rb"); route it through recv_into above
+        return io.BufferedReader(socket.SocketIO(self, "rb"))
+
+
+def instrument_urllib3():
+    """Wrap urllib3's connect once so connections opened by a shaped thread pay a handshake RTT and are shaped"""
+    if getattr(HTTPConnection, "shaped", False):
+        return
+    original = HTTPConnection.connect
+
+    def connect(self, *args, **kwargs):
+        profile = getattr(shaping, "profile", None)
+        result = original(self, *args, **kwargs)
+        if profile is not None:
+            time.sleep(round_trip(profile))
+            self.sock = ShapedSocket(self.sock, profile)
+        return result
+    HTTPConnection.connect = connect
+    HTTPConnection.shaped = True
+
+
+class NetworkShaper:
+    def __init__(self, mix=DEFAULT_NETWORK_MIX):
+        instrument_urllib3()
+        self.mix = parse_mix(mix)
+        self.slots = [name for name, weight in self.mix for _ in range(weight)]
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.records = {name: RecordStore() for name, _ in self.mix}
+        self.assigned = dict.fromkeys(self.records, 0)
+
+    def assign(self, virtual_user):
+        """Give the calling thread's virtual user its network class; returns the class name"""
+        name = self.slots[virtual_user % len(self.slots)]
+        self.local.name = name
+        shaping.profile = NETWORK_PROFILES[name]
+        with self.lock:
+            self.assigned[name] += 1
+        return name
+
+    def record(self, start, route, status, latency, error=None):
+        """File a request under the calling thread's network class"""
+        name = getattr(self.local, "name", None)
+        if name is None:
+            return
+        with self.lock:
+            self.records[name].append(start, route, status, latency, error)
+
+    def print_report(self):
+        """Print latency per network class and for the upload/pagination routes"""
+        print("\n📶 LATENCY BY NETWORK CLASS")
+        print(f"{'Network':<12} {'VUs':>4} {'RTT ms':>7} {'Down kbps':>10} {'Up kbps':>8} "
+              f"{'Count':>7} {'Err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>9}")
+        for name, records in self.records.items():
+            profile = NETWORK_PROFILES[name]
+            stats = records.summary()
+            print(f"{name:<12} {self.assigned[name]:>4} {profile['rtt']:>7} {profile['down']:>10} {profile['up']:>8} "
+                  f"{stats['count']:>7} {stats['errors']:>5} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+                  f"{stats['p99_ms']:>9.1f}")
+
+        routes = [route for route in FOCUS_ROUTES if any(len(r.select(route=route)) for r in self.records.values())]
+        if not routes:
+            return
+        print(f"\n{'Route':<28} " + " ".join(f"{name + ' p50/p95':>22}" for name in self.records))
+        for route in routes:
+            cells = []
+            for records in self.records.values():
+                stats = records.select(route=route).summary()
+                cells.append(f"{stats['p50_ms']:>10.0f}/{stats['p95_ms']:<11.0f}" if stats["count"] else f"{'-':>22}")
+            print(f"{route:<28} " + " ".join(cells))
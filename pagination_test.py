@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Followers/Following Deep-pagination Crawler
+Walks every page of large creators' follower and following lists concurrently and charts page latency against offset
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from metrics_store import nearest_rank
+from seed_data import DEFAULT_SEED, user_spec
+from steady_state import linear_slope
+
+# Configuration
+DEFAULT_CREATORS = 10
+DEFAULT_LIMITS = [20, 100]
+DEFAULT_LISTS = ["followers", "following"]
+DEFAULT_CONCURRENCY = 10
+MAX_PAGES = 10_000
+CHART_BUCKETS = 12
+CHART_WIDTH = 40
+
+
+class PaginationCrawler:
+    def __init__(self, tester, seed=DEFAULT_SEED, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.seed = seed
+        self.concurrency = concurrency
+        self.creators = []
+        self.crawls = []
+
+    def resolve_creators(self, count):
+        """Look up the Mongo _id of the most-followed seeded users (the lowest indices)"""
+        creators = [{"data": user_spec(self.seed, i)} for i in range(count)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            ids = list(pool.map(self.tester.object_id, creators))
+        self.creators = [c for c, object_id in zip(creators, ids) if object_id]
+        self.tester.log_result("Pagination - Creators", len(self.creators) == count,
+                               f"{len(self.creators)}/{count} seeded creators resolved")
+        return self.creators
+
+    def crawl(self, creator, list_name, limit):
+        """Walk one list page by page until hasMore is false, as a client scrolling to the end would"""
+        route = f"GET /users/:userId/{list_name}"
+        path = f"/users/{creator['object_id']}/{list_name}"
+        pages = []
+        start = self.tester.clock()
+        for page in range(1, MAX_PAGES + 1):
+            mark = self.tester.clock()
+            response = self.tester.request("GET", route, path, params={"page": page, "limit": limit})
+            latency = self.tester.clock() - mark
+            if response is None or response.status_code != 200:
+                pages.append({"offset": (page - 1) * limit, "latency": latency, "items": 0, "ok": False})
+                break
+            body = response.json()
+            pages.append({"offset": (page - 1) * limit, "latency": latency, "items": len(body.get(list_name, [])), "ok": True})
+            if not body.get("hasMore"):
+                break
+
+        return {
+            "creator": creator["data"]["username"],
+            "list": list_name,
+            "limit": limit,
+            "pages": pages,
+            "items": sum(p["items"] for p in pages),
+            "complete": pages[-1]["ok"] if pages else False,
+            "crawl_s": self.tester.clock() - start
+        }
+
+    def run(self, lists, limits):
+        """Crawl every creator's lists concurrently, once per page size"""
+        for limit in limits:
+            for list_name in lists:
+                print(f"\n🕷️ Crawling {list_name} of {len(self.creators)} creators with limit={limit}...")
+                with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                    crawls = list(pool.map(lambda c: self.crawl(c, list_name, limit), self.creators))
+                self.crawls.extend(crawls)
+                largest = max(crawls, key=lambda c: c["items"], default=None)
+                if largest:
+                    print(f"   largest list {largest['items']} items in {len(largest['pages'])} pages, "
+                          f"{largest['crawl_s']:.1f} s")
+
+    def page_latencies(self, list_name, limit):
+        """Median page latency (ms) per page index across all creators"""
+        by_page = {}
+        for crawl in self.crawls:
+            if crawl["list"] == list_name and crawl["limit"] == limit:
+                for index, page in enumerate(crawl["pages"]):
+                    by_page.setdefault(index, []).append(page["latency"] * 1000)
+        return [nearest_rank(sorted(by_page[i]), 50) for i in sorted(by_page)]
+
+    def print_chart(self, list_name, limit):
+        """Text chart of page latency against offset"""
+        medians = self.page_latencies(list_name, limit)
+        if not medians:
+            return
+        size = max(1, -(-len(medians) // CHART_BUCKETS))
+        buckets = [medians[i:i + size] for i in range(0, len(medians), size)]
+        peak = max(max(b) for b in buckets) or 1.0
+        print(f"\n📈 {list_name} limit={limit}: p50 page latency vs offset")
+        for index, bucket in enumerate(buckets):
+            value = max(bucket)
+            offset = index * size * limit
+            print(f"   offset {offset:>8} {'█' * max(1, int(value / peak * CHART_WIDTH)):<{CHART_WIDTH}} {value:.1f} ms")
+
+    def print_summary(self, lists, limits):
+        """Print crawl totals per page size and the skip cost per 1k offset"""
+        for limit in limits:
+            for list_name in lists:
+                self.print_chart(list_name, limit)
+
+        print("\n" + "=" * 70)
+        print("📊 DEEP PAGINATION SUMMARY")
+        print("=" * 70)
+        print(f"{'List':<10} {'Limit':>6} {'Items':>8} {'Pages':>6} {'First ms':>9} {'Last ms':>9} "
+              f"{'ms/1k off':>10} {'Crawl s':>8}")
+        for list_name in lists:
+            for limit in limits:
+                crawls = [c for c in self.crawls if c["list"] == list_name and c["limit"] == limit]
+                if not crawls:
+                    continue
+                medians = self.page_latencies(list_name, limit)
+                # Per-page slope converted to the extra latency every 1,000 skipped entries adds
+                per_1k = linear_slope(medians) * 1000 / limit if len(medians) > 1 else 0.0
+                deepest = max(crawls, key=lambda c: c["items"])
+                print(f"{list_name:<10} {limit:>6} {deepest['items']:>8} {len(deepest['pages']):>6} "
+                      f"{medians[0]:>9.1f} {medians[-1]:>9.1f} {per_1k:>10.2f} {deepest['crawl_s']:>8.1f}")
+
+        incomplete = [c for c in self.crawls if not c["complete"]]
+        self.tester.log_result("Pagination - Crawl", not incomplete,
+                               f"{len(self.crawls) - len(incomplete)}/{len(self.crawls)} crawls reached the last page")
+        print("\n🎯 DEEP PAGINATION CRAWL COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl followers/following lists of large creators page by page")
+    parser.add_argument("--creators", type=int, default=DEFAULT_CREATORS, help="crawl the N most-followed seeded users")
+    parser.add_argument("--limits", default=",".join(map(str, DEFAULT_LIMITS)), help="comma-separated page sizes to compare")
+    parser.add_argument("--lists", default=",".join(DEFAULT_LISTS), help="followers, following or both")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed the dataset was generated with")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    limits = [int(limit) for limit in args.limits.split(",")]
+    lists = [name.strip() for name in args.lists.split(",")]
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Deep Pagination Crawl")
+    print("=" * 70)
+
+    crawler = PaginationCrawler(tester, args.seed, args.concurrency)
+    if not crawler.resolve_creators(args.creators):
+        return
+    crawler.run(lists, limits)
+    crawler.print_summary(lists, limits)
+
+
+if __name__ == "__main__":
+    main()
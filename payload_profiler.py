@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Response Payload Profiler for Load Tests
+Records per-route wire bytes, gzip-compressed size and JSON decode cost, and tracks growth with dataset size
+"""
+
+import gzip
+import json
+import math
+import os
+import queue
+import threading
+import time
+
+# Configuration
+GZIP_LEVEL = 6
+DEFAULT_GZIP_EVERY = 20
+QUEUE_SIZE = 1_000
+SUPERLINEAR_EXPONENT = 1.1
+DEFAULT_HISTORY = "payload_history.json"
+
+
+def growth_exponent(points):
+    """Least-squares slope of log(size) vs log(dataset size); 1.0 means linear growth"""
+    points = [(x, y) for x, y in points if x > 0 and y > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    xs = [math.log(x) for x, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+class PayloadProfiler:
+    def __init__(self, gzip_every=DEFAULT_GZIP_EVERY):
+        self.gzip_every = gzip_every
+        self.lock = threading.Lock()
+        self.routes = {}
+        # Compression runs on every Nth body per route, off the request path like response_validator
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def observe(self, route, response):
+        """Count one response body; compression is sampled and decode cost comes from the caller's response.json()"""
+        body = response.content
+        if not body:
+            return
+        # urllib3 reports bytes pulled off the socket, i.e. before Content-Encoding is undone
+        wire_bytes = response.raw.tell() if response.raw is not None else 0
+        with self.lock:
+            stats = self.routes.setdefault(route, {
+                "count": 0, "bytes": 0, "max_bytes": 0, "wire_bytes": 0, "gzip_sampled": 0, "sampled_bytes": 0,
+                "gzip_bytes": 0, "decoded": 0, "decode_ms": 0.0, "max_decode_ms": 0.0,
+                "encoding": response.headers.get("Content-Encoding", "identity")
+            })
+            stats["count"] += 1
+            stats["bytes"] += len(body)
+            stats["max_bytes"] = max(stats["max_bytes"], len(body))
+            stats["wire_bytes"] += wire_bytes or len(body)
+            sample = (stats["count"] - 1) % self.gzip_every == 0
+        if sample:
+            try:
+                self.queue.put_nowait((route, body))
+            except queue.Full:
+                pass
+        if "json" in response.headers.get("Content-Type", ""):
+            response.json = self.timed_json(route, response)
+
+    def timed_json(self, route, response):
+        """Wrap response.json so the decode scenario code already does is charged to the route"""
+        decode = response.json
+
+        def json(**kwargs):
+            start = time.perf_counter()
+            result = decode(**kwargs)
+            decode_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                stats = self.routes[route]
+                stats["decoded"] += 1
+                stats["decode_ms"] += decode_ms
+                stats["max_decode_ms"] = max(stats["max_decode_ms"], decode_ms)
+            return result
+        return json
+
+    def loop(self):
+        """Background worker compressing sampled bodies"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            route, body = item
+            gzip_bytes = len(gzip.compress(body, GZIP_LEVEL))
+            with self.lock:
+                stats = self.routes[route]
+                stats["gzip_sampled"] += 1
+                stats["sampled_bytes"] += len(body)
+                stats["gzip_bytes"] += gzip_bytes
+
+    def stop(self):
+        """Compress outstanding samples and stop the worker"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def summary(self):
+        """Per-route mean sizes and decode cost"""
+        result = {}
+        for route, stats in self.routes.items():
+            result[route] = {
+                "count": stats["count"],
+                "mean_bytes": stats["bytes"] / stats["count"],
+                "max_bytes": stats["max_bytes"],
+                "mean_wire_bytes": stats["wire_bytes"] / stats["count"],
+                # Sampled compression ratio applied to the mean body
+                "mean_gzip_bytes": (stats["bytes"] / stats["count"] * stats["gzip_bytes"] / stats["sampled_bytes"]
+                                    if stats["sampled_bytes"] else stats["bytes"] / stats["count"]),
+                "decoded": stats["decoded"],
+                "mean_decode_ms": stats["decode_ms"] / stats["decoded"] if stats["decoded"] else 0.0,
+                "max_decode_ms": stats["max_decode_ms"],
+                "encoding": stats["encoding"]
+            }
+        return result
+
+    def save(self, history_path, dataset_size):
+        """Append this run's per-route means to the payload history"""
+        history = self.load_history(history_path)
+        history.append({"dataset_size": dataset_size, "routes": self.summary()})
+        tmp_path = f"{history_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp_path, history_path)
+        return history
+
+    @staticmethod
+    def load_history(history_path):
+        """Load earlier runs' payload summaries"""
+        if not history_path or not os.path.exists(history_path):
+            return []
+        with open(history_path) as f:
+            return json.load(f)
+
+    def print_report(self, history=None):
+        """Print per-route payload table and flag superlinear growth across dataset sizes"""
+        print("\n📦 RESPONSE PAYLOADS")
+        summary = self.summary()
+        if not summary:
+            print("No response bodies profiled")
+            return
+
+        print(f"{'Route':<40} {'Mean KB':>8} {'Max KB':>8} {'Wire KB':>8} {'Gzip KB':>8} {'Decode ms':>10}")
+        for route, s in sorted(summary.items(), key=lambda item: -item[1]["mean_bytes"]):
+            decode = f"{s['mean_decode_ms']:>10.2f}" if s["decoded"] else f"{'-':>10}"
+            print(f"{route:<40} {s['mean_bytes'] / 1024:>8.1f} {s['max_bytes'] / 1024:>8.1f} "
+                  f"{s['mean_wire_bytes'] / 1024:>8.1f} {s['mean_gzip_bytes'] / 1024:>8.1f} {decode}")
+
+        uncompressed = [route for route, s in summary.items()
+                        if s["encoding"] == "identity" and s["mean_gzip_bytes"] < s["mean_bytes"] * 0.5]
+        if uncompressed:
+            print(f"\n  ⚠️ {len(uncompressed)} routes are sent uncompressed but would shrink >50% with gzip")
+
+        if not history:
+            return
+        print("\n📈 Payload growth vs dataset size:")
+        flagged = 0
+        for route in sorted(summary):
+            points = [(run["dataset_size"], run["routes"][route]["mean_bytes"])
+                      for run in history if route in run["routes"]]
+            exponent = growth_exponent(points)
+            if exponent is None:
+                continue
+            if exponent > SUPERLINEAR_EXPONENT:
+                flagged += 1
+                print(f"  ❌ {route}: size ∝ N^{exponent:.2f} (superlinear)")
+            else:
+                print(f"  ✅ {route}: size ∝ N^{exponent:.2f}")
+        if not flagged:
+            print("  No superlinear payload growth detected")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Request Correlation IDs and Client Span Export
+Tags harness requests with correlation/trace headers and exports client-side spans as OpenTelemetry (OTLP/JSON) lines
+"""
+
+import argparse
+import heapq
+import json
+import secrets
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+
+# Configuration
+DEFAULT_TRACE_FILE = "traces.jsonl"
+DEFAULT_SLOWEST_FRACTION = 0.001
+SERVICE_NAME = "tiktok-clone-load-harness"
+SPAN_KIND_CLIENT = 3
+STATUS_ERROR = 2
+MAX_SLOWEST_PRINTED = 20
+
+# Per-thread list collecting (phase, start, end) from the instrumented urllib3 connection
+phase_timings = threading.local()
+
+
+def correlation_headers(run_id, scenario, virtual_user):
+    """Fresh correlation headers for one request; the request ID doubles as the W3C trace ID"""
+    trace_id = secrets.token_hex(16)
+    span_id = secrets.token_hex(8)
+    return {
+        "X-Request-ID": trace_id,
+        "traceparent": f"00-{trace_id}-{span_id}-01",
+        "X-Load-Run": run_id,
+        "X-Load-Scenario": scenario,
+        "X-Virtual-User": str(virtual_user)
+    }
+
+
+def instrument_urllib3():
+    """Wrap urllib3's connection methods once so connect/send/wait land in the calling thread's trace"""
+    if getattr(HTTPConnection, "traced", False):
+        return
+    targets = [(HTTPConnection, "connect", "connect"), (HTTPSConnection, "connect", "connect"),
+               (HTTPConnection, "request", "send"), (HTTPConnection, "getresponse", "wait")]
+    for cls, name, phase in targets:
+        original = getattr(cls, name)
+
+        def traced(self, *args, _original=original, _phase=phase, **kwargs):
+            timings = getattr(phase_timings, "current", None)
+            if timings is None:
+                return _original(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return _original(self, *args, **kwargs)
+            finally:
+                timings.append((_phase, start, time.perf_counter()))
+        setattr(cls, name, traced)
+    HTTPConnection.traced = True
+
+
+def attribute(key, value):
+    """OTLP attribute"""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class RequestTracer:
+    def __init__(self, run_id, path=DEFAULT_TRACE_FILE):
+        instrument_urllib3()
+        self.run_id = run_id
+        self.path = path
+        self.file = open(path, "w")
+        self.lock = threading.Lock()
+        # Wall-clock anchor so perf_counter offsets become Unix nanoseconds
+        self.anchor_ns = time.time_ns() - int(time.perf_counter() * 1e9)
+        self.resource = {"attributes": [attribute("service.name", SERVICE_NAME), attribute("load.run_id", run_id)]}
+
+    def unix_ns(self, perf):
+        """Convert a perf_counter reading to Unix nanoseconds"""
+        return self.anchor_ns + int(perf * 1e9)
+
+    def begin(self, headers):
+        """Start collecting transport phases for the request carrying these correlation headers"""
+        _, trace_id, span_id, _ = headers["traceparent"].split("-")
+        phase_timings.current = []
+        return {"trace_id": trace_id, "span_id": span_id, "headers": headers, "start": time.perf_counter()}
+
+    def span(self, trace, name, start, end, root=False, attributes=None, error=None):
+        """One OTLP span in the request's trace; child spans hang off the request span"""
+        span = {
+            "traceId": trace["trace_id"],
+            "spanId": trace["span_id"] if root else secrets.token_hex(8),
+            "name": name,
+            "kind": SPAN_KIND_CLIENT,
+            "startTimeUnixNano": str(self.unix_ns(start)),
+            "endTimeUnixNano": str(self.unix_ns(end)),
+            "attributes": attributes or []
+        }
+        if not root:
+            span["parentSpanId"] = trace["span_id"]
+        if error:
+            span["status"] = {"code": STATUS_ERROR, "message": error}
+        return span
+
+    def write(self, spans):
+        """Append one OTLP/JSON ResourceSpans line"""
+        line = json.dumps({"resourceSpans": [{"resource": self.resource,
+                                              "scopeSpans": [{"scope": {"name": "load_test"}, "spans": spans}]}]})
+        with self.lock:
+            self.file.write(line + "\n")
+
+    def end(self, trace, method, route, url, status, error=None):
+        """Export the request span with connect/send/wait/receive children"""
+        end = time.perf_counter()
+        timings = phase_timings.current or []
+        phase_timings.current = None
+
+        headers = trace["headers"]
+        spans = [self.span(trace, route, trace["start"], end, root=True, error=error or (
+            f"HTTP {status}" if status >= 500 else None), attributes=[
+            attribute("http.request.method", method),
+            attribute("url.full", url),
+            attribute("http.response.status_code", status),
+            attribute("http.route", route),
+            attribute("request.id", headers["X-Request-ID"]),
+            attribute("load.scenario", headers["X-Load-Scenario"]),
+            attribute("load.virtual_user", headers["X-Virtual-User"])
+        ])]
+        spans += [self.span(trace, phase, start, finish) for phase, start, finish in timings]
+        last_wait = max((finish for phase, _, finish in timings if phase == "wait"), default=None)
+        if last_wait is not None:
+            spans.append(self.span(trace, "receive", last_wait, end))
+        self.write(spans)
+
+    def timed_json(self, trace, response):
+        """Wrap response.json so decoding done later by scenario code is exported as a decode span"""
+        decode = response.json
+
+        def json(**kwargs):
+            start = time.perf_counter()
+            try:
+                return decode(**kwargs)
+            finally:
+                self.write([self.span(trace, "decode", start, time.perf_counter())])
+        return json
+
+    def close(self):
+        """Flush and close the trace file"""
+        with self.lock:
+            self.file.close()
+
+
+def iter_spans(path):
+    """Stream every span in an OTLP/JSON lines file"""
+    with open(path) as f:
+        for line in f:
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    yield from scope["spans"]
+
+
+def duration_ms(span):
+    """Span duration in milliseconds"""
+    return (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+
+
+def slowest_requests(path, fraction=DEFAULT_SLOWEST_FRACTION):
+    """The slowest `fraction` of request spans with their child spans, without loading the whole file
+
+    Returns (total requests, [{"root": span, "children": [spans]}]) ordered slowest first.
+    """
+    total = sum(1 for span in iter_spans(path) if "parentSpanId" not in span)
+    if not total:
+        return 0, []
+    roots = heapq.nlargest(max(1, int(total * fraction)),
+                           (span for span in iter_spans(path) if "parentSpanId" not in span), key=duration_ms)
+    traces = {span["traceId"]: {"root": span, "children": []} for span in roots}
+    for span in iter_spans(path):
+        if "parentSpanId" in span and span["traceId"] in traces:
+            traces[span["traceId"]]["children"].append(span)
+    return total, [traces[span["traceId"]] for span in roots]
+
+
+def print_slowest(path, fraction=DEFAULT_SLOWEST_FRACTION):
+    """Print the slowest `fraction` of requests with their request IDs and phase breakdown"""
+    total, slowest = slowest_requests(path, fraction)
+    if not total:
+        print(f"No request spans in {path}")
+        return []
+
+    print(f"\n🐢 SLOWEST {fraction * 100:g}% OF {total} REQUESTS ({path})")
+    for trace in slowest[:MAX_SLOWEST_PRINTED]:
+        root = trace["root"]
+        attrs = {a["key"]: next(iter(a["value"].values())) for a in root["attributes"]}
+        phases = {}
+        for child in trace["children"]:
+            phases[child["name"]] = phases.get(child["name"], 0.0) + duration_ms(child)
+        breakdown = " ".join(f"{name} {ms:.1f}" for name, ms in phases.items())
+        print(f"  • {duration_ms(root):>8.1f} ms {root['name']} → {attrs.get('http.response.status_code')} "
+              f"X-Request-ID {attrs.get('request.id')} [{attrs.get('load.scenario')} vu {attrs.get('load.virtual_user')}] "
+              f"{breakdown}")
+    if len(slowest) > MAX_SLOWEST_PRINTED:
+        print(f"  … {len(slowest) - MAX_SLOWEST_PRINTED} more")
+    return slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the slowest requests in an exported trace file")
+    parser.add_argument("trace_file", nargs="?", default=DEFAULT_TRACE_FILE)
+    parser.add_argument("--fraction", type=float, default=DEFAULT_SLOWEST_FRACTION)
+    args = parser.parse_args()
+    print_slowest(args.trace_file, args.fraction)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Server-side Resource Sampler for Load Tests
+Samples the local Node server's CPU, RSS, open FDs and /health lag on the load test timeline
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+# Configuration
+DEFAULT_INTERVAL = 1.0
+HEALTH_TIMEOUT = 5
+CPU_SATURATION_PCT = 90.0
+FD_EXHAUSTION_RATIO = 0.9
+GC_RSS_DROP_RATIO = 0.05
+EVENT_LOOP_LAG_MS = 50.0
+SPIKE_PERCENTILE = 99
+
+
+def find_listening_pid(port):
+    """Find the PID of the local process listening on a TCP port via /proc"""
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    local_port = int(fields[1].rsplit(":", 1)[1], 16)
+                    if local_port == port and fields[3] == "0A":  # 0A = LISTEN
+                        inodes.add(fields[9])
+        except OSError:
+            continue
+
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            for fd in os.listdir(f"/proc/{pid}/fd"):
+                if os.readlink(f"/proc/{pid}/fd/{fd}") in targets:
+                    return int(pid)
+        except OSError:
+            continue
+    return None
+
+
+class ResourceSampler:
+    def __init__(self, clock, base_url, pid=None, interval=DEFAULT_INTERVAL):
+        self.clock = clock
+        self.health_url = f"{base_url}/health"
+        self.pid = pid or find_listening_pid(urlparse(base_url).port or 80)
+        self.interval = interval
+        self.session = requests.Session()
+        self.samples = []
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.clk_tck = os.sysconf("SC_CLK_TCK")
+        self.fd_limit = self.read_fd_limit()
+        self.last_cpu = None
+
+    def read_fd_limit(self):
+        """Read the soft open-files limit of the server process"""
+        try:
+            with open(f"/proc/{self.pid}/limits") as f:
+                for line in f:
+                    if line.startswith("Max open files"):
+                        return int(line.split()[3])
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def read_cpu_seconds(self):
+        """Total user+system CPU seconds consumed by the server process"""
+        with open(f"/proc/{self.pid}/stat") as f:
+            # The command name may contain spaces, so split after its closing paren
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.clk_tck
+
+    def read_rss_mb(self):
+        """Resident set size of the server process in MB"""
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+        return 0.0
+
+    def probe_health_ms(self):
+        """Time a /health round trip as an event-loop lag probe"""
+        start = time.perf_counter()
+        try:
+            self.session.get(self.health_url, timeout=HEALTH_TIMEOUT)
+        except requests.RequestException:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    def sample(self):
+        """Take one resource sample on the shared timeline"""
+        t = self.clock()
+        cpu_seconds = self.read_cpu_seconds()
+        cpu_pct = 0.0
+        if self.last_cpu:
+            last_t, last_seconds = self.last_cpu
+            if t > last_t:
+                cpu_pct = (cpu_seconds - last_seconds) / (t - last_t) * 100
+        self.last_cpu = (t, cpu_seconds)
+
+        return {
+            "t": t,
+            "cpu": cpu_pct,
+            "rss_mb": self.read_rss_mb(),
+            "fds": len(os.listdir(f"/proc/{self.pid}/fd")),
+            "health_ms": self.probe_health_ms()
+        }
+
+    def loop(self):
+        """Sample at a fixed interval until stopped"""
+        while not self.stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                self.samples.append(self.sample())
+            except OSError as e:
+                print(f"⚠️ Resource sampling stopped: {str(e)}")
+                return
+            self.stop_event.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if not self.pid:
+            print("⚠️ Node server process not found, resource sampling disabled")
+            return
+        print(f"📈 Sampling server PID {self.pid} every {self.interval}s")
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the background thread"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+
+    def nearest(self, t):
+        """Return the index of the sample closest to t"""
+        return min(range(len(self.samples)), key=lambda i: abs(self.samples[i]["t"] - t))
+
+    def attribute(self, t, latency):
+        """Attribute a latency spike to the server condition observed while it was in flight"""
+        window = [i for i, s in enumerate(self.samples) if t - self.interval <= s["t"] <= t + latency + self.interval]
+        if not window:
+            window = [self.nearest(t)]
+
+        causes = []
+        for i in window:
+            s = self.samples[i]
+            if s["cpu"] >= CPU_SATURATION_PCT:
+                causes.append("CPU saturation")
+            if self.fd_limit and s["fds"] >= self.fd_limit * FD_EXHAUSTION_RATIO:
+                causes.append("FD exhaustion")
+            previous = self.samples[i - 1] if i > 0 else None
+            rss_drop = previous and s["rss_mb"] < previous["rss_mb"] * (1 - GC_RSS_DROP_RATIO)
+            if rss_drop or (s["health_ms"] is not None and s["health_ms"] >= EVENT_LOOP_LAG_MS):
+                causes.append("GC / event-loop stall")
+
+        # Report causes in the order they were first seen
+        return list(dict.fromkeys(causes)) or ["unattributed"]
+
+    def print_report(self, records):
+        """Print resource summary and attribute latency spikes in records"""
+        print("\n📈 SERVER RESOURCES")
+        if not self.samples:
+            print("No resource samples collected")
+            return
+
+        cpu = [s["cpu"] for s in self.samples[1:]] or [0.0]
+        lag = [s["health_ms"] for s in self.samples if s["health_ms"] is not None] or [0.0]
+        print(f"Samples: {len(self.samples)} (PID {self.pid})")
+        print(f"CPU: avg {sum(cpu) / len(cpu):.1f}%  max {max(cpu):.1f}%")
+        print(f"RSS: min {min(s['rss_mb'] for s in self.samples):.1f} MB  max {max(s['rss_mb'] for s in self.samples):.1f} MB")
+        print(f"Open FDs: max {max(s['fds'] for s in self.samples)} (limit {self.fd_limit or 'unknown'})")
+        print(f"/health lag: avg {sum(lag) / len(lag):.1f} ms  max {max(lag):.1f} ms")
+
+        latencies = records.latencies_ms()
+        threshold = latencies[max(0, int(len(latencies) * SPIKE_PERCENTILE / 100) - 1)] / 1000
+        spikes = [r for r in records.select(min_latency=threshold) if r.latency > 0]
+        if not spikes:
+            return
+
+        counts = {}
+        for r in spikes:
+            for cause in self.attribute(r.t, r.latency):
+                counts[cause] = counts.get(cause, 0) + 1
+
+        print(f"\n🔎 Latency spikes (≥ p{SPIKE_PERCENTILE}, {threshold * 1000:.1f} ms): {len(spikes)}")
+        for cause, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  • {cause}: {count}")
+
+        print("\n  Slowest requests:")
+        for r in sorted(spikes, key=lambda r: -r.latency)[:10]:
+            s = self.samples[self.nearest(r.t)]
+            print(f"  • t={r.t:.2f}s {r.route} {r.latency * 1000:.1f} ms "
+                  f"[cpu {s['cpu']:.0f}%, rss {s['rss_mb']:.0f} MB, fds {s['fds']}] "
+                  f"→ {', '.join(self.attribute(r.t, r.latency))}")
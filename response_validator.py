@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Sampled Background Response Validation for Load Tests
+Runs per-route validation rules on a sample of responses off the request path
+"""
+
+import json
+import queue
+import random
+import threading
+import uuid
+
+from theme_backend_test import VALID_THEMES
+
+# Configuration
+DEFAULT_SAMPLE_RATE = 0.05
+QUEUE_SIZE = 10_000
+MAX_EXAMPLES = 3
+
+
+def is_uuid(value):
+    """True if value is a UUID string"""
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+def expect_status(*codes):
+    """Rule: response status is one of codes"""
+    def rule(status, body):
+        return None if status in codes else f"expected status {codes}, got {status}"
+    return rule
+
+
+def expect_uuid(*keys):
+    """Rule: the ID at body[keys...] is a UUID"""
+    def rule(status, body):
+        value = body
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        return None if is_uuid(value) else f"{'.'.join(keys)} is not a UUID: {value!r}"
+    return rule
+
+
+def expect_present(*keys):
+    """Rule: body[keys...] is present and non-empty"""
+    def rule(status, body):
+        value = body
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        return None if value else f"{'.'.join(keys)} missing"
+    return rule
+
+
+def expect_list(key):
+    """Rule: body[key] is a list"""
+    def rule(status, body):
+        return None if isinstance(body.get(key), list) else f"{key} is not a list"
+    return rule
+
+
+def expect_theme(*keys):
+    """Rule: the theme at body[keys...] is one of the supported themes"""
+    def rule(status, body):
+        value = body
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        return None if value in VALID_THEMES else f"invalid themePreference {value!r}"
+    return rule
+
+
+def when_success(*rules):
+    """Only apply rules to 2xx responses"""
+    def rule(status, body):
+        if not 200 <= status < 300:
+            return None
+        for inner in rules:
+            error = inner(status, body)
+            if error:
+                return error
+        return None
+    return rule
+
+
+# Validation rules per route template, mirroring the inline checks in backend_test.py
+VALIDATION_RULES = {
+    "GET /health": [expect_status(200)],
+    "POST /stories/create": [expect_status(201), when_success(expect_uuid("data", "id"))],
+    "GET /stories/my-stories": [expect_status(200), when_success(expect_list("stories"))],
+    "GET /stories/following-stories": [expect_status(200), when_success(expect_list("storiesGroups"))],
+    "POST /stories/:storyId/view": [expect_status(200)],
+    "GET /stories/:storyId/viewers": [when_success(expect_list("viewers"))],
+    "GET /messages/conversations": [expect_status(200), when_success(expect_list("conversations"))],
+    "POST /messages/send": [expect_status(201), when_success(expect_uuid("data", "id"))],
+    "POST /messages/send-media": [expect_status(201), when_success(expect_uuid("data", "id"))],
+    "GET /messages/conversation/:userId": [expect_status(200), when_success(expect_list("messages"))],
+    "GET /videos/feed": [expect_status(200), when_success(expect_list("videos"))],
+    "GET /users/theme": [expect_status(200), when_success(expect_theme("themePreference"))],
+    "PUT /users/theme": [when_success(expect_theme("themePreference"))],
+    "GET /users/profile/:username": [expect_status(200), when_success(expect_theme("user", "themePreference"))]
+}
+
+
+class ResponseValidator:
+    def __init__(self, sample_rate=DEFAULT_SAMPLE_RATE, rules=None):
+        self.sample_rate = sample_rate
+        self.rules = rules or VALIDATION_RULES
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def route_stats(self, route):
+        """Counters for one route"""
+        return self.stats.setdefault(route, {"sampled": 0, "checked": 0, "failed": 0, "dropped": 0, "examples": []})
+
+    def submit(self, route, response):
+        """Hand a sampled response to the background worker; never blocks the caller"""
+        if route not in self.rules or random.random() >= self.sample_rate:
+            return
+        try:
+            self.queue.put_nowait((route, response.status_code, response.content))
+            counter = "sampled"
+        except queue.Full:
+            counter = "dropped"
+        with self.lock:
+            self.route_stats(route)[counter] += 1
+
+    def check(self, route, status, content):
+        """Run every rule for route against one response"""
+        try:
+            body = json.loads(content) if content else {}
+        except ValueError:
+            body = None
+        errors = ["body is not JSON"] if body is None else [
+            e for e in (rule(status, body if isinstance(body, dict) else {}) for rule in self.rules[route]) if e
+        ]
+
+        with self.lock:
+            stats = self.route_stats(route)
+            stats["checked"] += 1
+            if errors:
+                stats["failed"] += 1
+                if len(stats["examples"]) < MAX_EXAMPLES:
+                    stats["examples"].append("; ".join(errors))
+
+    def loop(self):
+        """Background worker draining sampled responses"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            self.check(*item)
+
+    def stop(self):
+        """Drain outstanding samples and stop the worker"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def print_report(self):
+        """Print per-route validation counts"""
+        print(f"\n🧪 RESPONSE VALIDATION (sampled {self.sample_rate * 100:g}%)")
+        if not self.stats:
+            print("No responses sampled")
+            return
+
+        print(f"{'Route':<40} {'Checked':>8} {'Failed':>7} {'Dropped':>8}")
+        for route, stats in sorted(self.stats.items()):
+            print(f"{route:<40} {stats['checked']:>8} {stats['failed']:>7} {stats['dropped']:>8}")
+            for example in stats["examples"]:
+                print(f"   ❌ {example}")
+
+        failed = sum(s["failed"] for s in self.stats.values())
+        checked = sum(s["checked"] for s in self.stats.values())
+        status = "✅" if failed == 0 else "❌"
+        print(f"{status} {failed}/{checked} sampled responses failed validation")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Run Manifest of Created Entities
+Appends every story, message, video, upload and account a harness run creates so teardown.py can remove them
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+
+# Configuration
+DEFAULT_MANIFEST_DIR = "run_manifests"
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_backend", "uploads")
+MEDIA_KEYS = {"mediaUrl", "thumbnailUrl", "videoUrl", "url"}
+
+# Route template -> (entity kind, response key holding the created document)
+CREATED_ENTITIES = {
+    "POST /stories/create": ("stories", "data"),
+    "POST /messages/send": ("messages", "data"),
+    "POST /messages/send-media": ("messages", "data"),
+    "POST /messages/send-voice": ("messages", "data"),
+    "POST /videos/upload": ("videos", "video")
+}
+
+
+def media_urls(value):
+    """Every /uploads/ URL anywhere in a created document"""
+    if isinstance(value, dict):
+        return [url for key, v in value.items()
+                for url in ([v] if key in MEDIA_KEYS and isinstance(v, str) and "/uploads/" in v else media_urls(v))]
+    if isinstance(value, list):
+        return [url for v in value for url in media_urls(v)]
+    return []
+
+
+def load_manifest(path):
+    """Read a manifest; returns (entities, owner tokens, registered usernames)"""
+    entities, tokens, users = [], {}, []
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["kind"] == "user":
+                users.append(entry["username"])
+                continue
+            if "token" in entry:
+                tokens[entry["owner"]] = entry.pop("token")
+            entities.append(entry)
+    return entities, tokens, users
+
+
+class RunManifest:
+    def __init__(self, run_id, path=None):
+        self.path = path or os.path.join(DEFAULT_MANIFEST_DIR, f"{run_id}.jsonl")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Written line by line so an interrupted run can still be cleaned up
+        self.file = open(self.path, "a")
+        self.lock = threading.Lock()
+        self.owners = set()
+        self.counts = Counter()
+
+    def write(self, entry):
+        """Append one entry and flush it"""
+        with self.lock:
+            if "owner" in entry and entry["owner"] not in self.owners:
+                self.owners.add(entry["owner"])
+            else:
+                entry.pop("token", None)
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            self.counts[entry["kind"]] += 1
+
+    def observe(self, route, response, user):
+        """Record what a successful request created; the owner's token is kept once for deleting it later"""
+        if route == "POST /auth/register":
+            username = response.json().get("user", {}).get("username")
+            if username:
+                self.write({"kind": "user", "username": username})
+            return
+        entity = CREATED_ENTITIES.get(route)
+        if entity is None or user is None:
+            return
+        kind, key = entity
+        data = response.json().get(key) or {}
+        if not data.get("id"):
+            return
+        self.write({"kind": kind, "id": str(data["id"]), "owner": user["data"]["username"], "token": user["token"],
+                    "files": list(dict.fromkeys(media_urls(data)))})
+
+    def close(self):
+        """Close the manifest and report what it tracked"""
+        with self.lock:
+            self.file.close()
+        tracked = ", ".join(f"{count} {kind}" for kind, count in sorted(self.counts.items())) or "nothing"
+        print(f"🗂️ Run manifest {self.path}: {tracked} (clean up with: python teardown.py clean {self.path})")
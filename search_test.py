@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+User Search Query-corpus Benchmark
+Runs a realistic mix of /users/search queries against a seeded population and reports latency per query class
+"""
+
+import argparse
+import random
+import string
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from seed_data import DEFAULT_SEED, FIRST_NAMES, LAST_NAMES
+
+# Configuration
+DEFAULT_POPULATION = 1_000_000
+DEFAULT_QUERIES = 5_000
+DEFAULT_CONCURRENCY = 16
+DEFAULT_LIMIT = 20
+ZIPF_EXPONENT = 1.1
+SCAN_RATIO = 0.8
+REGEX_RATIO = 10
+REGEX_MAX_MS = 1_000
+
+# Share of the corpus per query class
+QUERY_MIX = {
+    "prefix": 30,
+    "popular": 35,
+    "miss": 15,
+    "unicode": 10,
+    "regex": 5,
+    "invalid": 5
+}
+
+UNICODE_QUERIES = ["Léa", "LÉA", "Zoë", "zoë", "Björn", "João", "Müller", "MÜLLER", "Ivanova", "陈伟", "ユキ", "🔥🔥"]
+
+# Valid patterns with heavy backtracking; q is handed to new RegExp() unescaped
+REGEX_QUERIES = ["(a+)+$", "(.*a){12}", "^(\\w+\\s?)*$", ".*.*.*.*.*z", "(e|ee)+x", "([a-z]+)*!"]
+
+# Patterns the RegExp constructor rejects
+INVALID_QUERIES = ["[", "((", "*em", "a{2,1}", "\\", "(?<", "[z-a]"]
+
+
+def zipf_choice(rng, items, exponent=ZIPF_EXPONENT):
+    """Pick from items ordered by popularity with a Zipfian rank distribution"""
+    weights = [1.0 / (rank + 1) ** exponent for rank in range(len(items))]
+    return rng.choices(items, weights=weights)[0]
+
+
+class SearchBenchmark:
+    def __init__(self, tester, seed=DEFAULT_SEED, population=DEFAULT_POPULATION, limit=DEFAULT_LIMIT):
+        self.tester = tester
+        self.seed = seed
+        self.population = population
+        self.limit = limit
+        self.rng = random.Random(f"{seed}:search")
+        self.full_names = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+        self.results = {}
+
+    def make_query(self, query_class):
+        """Generate one query of the given class"""
+        rng = self.rng
+        if query_class == "prefix":
+            if rng.random() < 0.5:
+                index = str(rng.randrange(self.population))
+                return f"s{self.seed}_{index[:rng.randint(1, len(index))]}"
+            name = rng.choice(FIRST_NAMES)
+            return name[:rng.randint(2, len(name))]
+        if query_class == "popular":
+            return zipf_choice(rng, self.full_names if rng.random() < 0.5 else FIRST_NAMES)
+        if query_class == "miss":
+            return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        if query_class == "unicode":
+            return rng.choice(UNICODE_QUERIES)
+        if query_class == "regex":
+            return rng.choice(REGEX_QUERIES)
+        return rng.choice(INVALID_QUERIES)
+
+    def build_corpus(self, total):
+        """Interleave query classes so every class runs under the same background load"""
+        weight_sum = sum(QUERY_MIX.values())
+        corpus = [(query_class, self.make_query(query_class))
+                  for query_class, weight in QUERY_MIX.items()
+                  for _ in range(max(1, total * weight // weight_sum))]
+        self.rng.shuffle(corpus)
+        return corpus
+
+    def check_population(self):
+        """Confirm the last seeded user is searchable before benchmarking"""
+        username = f"s{self.seed}_{self.population - 1}"
+        response = self.tester.request("GET", "GET /users/search", "/users/search", params={"q": f"^{username}$", "limit": 1})
+        found = response is not None and response.status_code == 200 and any(
+            u.get("username") == username for u in response.json().get("users", []))
+        self.tester.log_result("Search - Population", found,
+                               f"seeded user {username} {'found' if found else 'not found'}; "
+                               f"seed with: python seed_data.py --seed {self.seed} --users {self.population}")
+        return found
+
+    def search(self, item):
+        """Issue one search query; returns (class, status, users returned)"""
+        query_class, query = item
+        response = self.tester.request("GET", f"GET /users/search [{query_class}]", "/users/search",
+                                       params={"q": query, "page": 1, "limit": self.limit})
+        if response is None:
+            return query_class, 0, 0
+        returned = len(response.json().get("users", [])) if response.status_code == 200 else 0
+        return query_class, response.status_code, returned
+
+    def run(self, total, concurrency):
+        """Run the whole corpus concurrently and summarize each class"""
+        corpus = self.build_corpus(total)
+        print(f"\n🔎 Running {len(corpus)} queries with {concurrency} concurrent clients...")
+        mark = len(self.tester.records)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(self.search, corpus))
+
+        records = self.tester.records[mark:]
+        for query_class in QUERY_MIX:
+            route = f"GET /users/search [{query_class}]"
+            stats = records.select(route=route).summary()
+            matched = [returned for c, _, returned in outcomes if c == query_class]
+            stats["mean_returned"] = sum(matched) / len(matched) if matched else 0.0
+            stats["statuses"] = dict(sorted(Counter(status for c, status, _ in outcomes if c == query_class).items()))
+            self.results[query_class] = stats
+
+    def print_summary(self):
+        """Print per-class latency table and the index-vs-scan verdict"""
+        print("\n" + "=" * 70)
+        print(f"📊 USER SEARCH SUMMARY ({self.population:,} seeded users)")
+        print("=" * 70)
+        print(f"{'Class':<10} {'Count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Max ms':>9} {'Hits':>6}  Statuses")
+        for query_class, stats in self.results.items():
+            print(f"{query_class:<10} {stats['count']:>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+                  f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>9.1f} {stats['mean_returned']:>6.1f}  {stats['statuses']}")
+
+        # An index answers a miss almost immediately; a collection scan makes misses as slow as hits
+        miss = self.results.get("miss", {}).get("p50_ms", 0.0)
+        hits = max(self.results.get(c, {}).get("p50_ms", 0.0) for c in ("prefix", "popular"))
+        if hits:
+            scanning = miss >= hits * SCAN_RATIO
+            self.tester.log_result("Search - Index Usage", not scanning,
+                                   f"miss p50 {miss:.1f} ms vs hit p50 {hits:.1f} ms "
+                                   f"({'collection scan' if scanning else 'index-backed'})")
+
+        regex = self.results.get("regex", {})
+        if regex.get("count"):
+            # Without a hit baseline fall back to an absolute ceiling rather than failing against 0 ms
+            limit = hits * REGEX_RATIO if hits else REGEX_MAX_MS
+            self.tester.log_result("Search - Pathological Regex", regex["max_ms"] < limit and not regex["errors"],
+                                   f"max {regex['max_ms']:.1f} ms (limit {limit:.1f} ms), "
+                                   f"{regex['errors']} errors/timeouts")
+        invalid = self.results.get("invalid", {})
+        if invalid.get("count"):
+            self.tester.log_result("Search - Invalid Regex", 500 not in invalid["statuses"],
+                                   f"malformed patterns returned status {sorted(invalid['statuses'])}")
+        print("\n🎯 USER SEARCH BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /users/search with a realistic query corpus")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--population", type=int, default=DEFAULT_POPULATION, help="number of seeded users to expect")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed the population was generated with")
+    parser.add_argument("--skip-population-check", action="store_true")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting User Search Benchmark")
+    print("=" * 70)
+
+    benchmark = SearchBenchmark(tester, args.seed, args.population, args.limit)
+    if not args.skip_population_check and not benchmark.check_population():
+        return
+    benchmark.run(args.queries, args.concurrency)
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
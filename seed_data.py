@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Seeder for Benchmarks
+Streams a deterministic, seedable dataset into the backend through the load harness API client
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+
+# Configuration
+DEFAULT_SEED = 42
+DEFAULT_CONCURRENCY = 32
+DEFAULT_CHECKPOINT = "seed_checkpoint.json"
+CHECKPOINT_EVERY = 2.0
+MAX_RETRIES = 3
+RETRY_PASSES = 2
+FOLLOW_POOL_FACTOR = 3
+BACKOFF_START = 0.5
+BACKOFF_MAX = 30.0
+TOKEN_CACHE_SIZE = 10_000
+SEED_PASSWORD = "SeedData123"
+
+# Default dataset shape; scale with --scale
+DEFAULT_COUNTS = {
+    "users": 10_000,
+    "follows": 200_000,
+    "videos": 20_000,
+    "comments": 100_000,
+    "stories": 20_000,
+    "messages": 100_000
+}
+
+STAGES = ["users", "follows", "videos", "comments", "stories", "messages"]
+
+FIRST_NAMES = [
+    "Emma", "Liam", "Olivia", "Noah", "Ava", "Mateo", "Sofia", "Lucas", "Mia", "Ethan",
+    "Aiko", "Kenji", "Priya", "Arjun", "Fatima", "Omar", "Chloe", "Léa", "Zoë", "Björn",
+    "Sarah", "Mike", "Emily", "David", "Anna", "Yuki", "Chen", "Ana", "João", "Nadia"
+]
+LAST_NAMES = [
+    "Johnson", "Chen", "Davis", "Garcia", "Smith", "Müller", "Rossi", "Kim", "Nguyen", "Patel",
+    "Silva", "Kowalski", "Tanaka", "Haddad", "Okafor", "Novak", "Ivanova", "Dubois", "Larsen", "Cohen"
+]
+CAPTION_WORDS = [
+    "sunset", "beach", "dance", "cooking", "travel", "music", "vibes", "weekend", "coffee",
+    "workout", "cat", "dog", "city", "friends", "throwback", "art", "fashion", "gaming"
+]
+
+# Minimal MP4 header; the backend only checks the extension and mimetype
+FAKE_VIDEO = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom" + b"\x00" * 1024
+
+
+def skewed_index(rng, n, skew=3.0):
+    """Pick an index in [0, n) with a power-law bias toward low indices (popular entities)"""
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def rng_for(seed, stage, index):
+    """Independent deterministic RNG per entity, so any index can be regenerated on resume"""
+    return random.Random(f"{seed}:{stage}:{index}")
+
+
+def user_spec(seed, index):
+    """Deterministic registration payload for seeded user `index`"""
+    rng = rng_for(seed, "users", index)
+    first = FIRST_NAMES[skewed_index(rng, len(FIRST_NAMES), 2.0)]
+    last = LAST_NAMES[skewed_index(rng, len(LAST_NAMES), 2.0)]
+    username = f"s{seed}_{index}"
+    return {
+        "username": username,
+        "email": f"{username}@seed.example.com",
+        "password": SEED_PASSWORD,
+        "displayName": f"{first} {last}"
+    }
+
+
+class DatasetSeeder:
+    def __init__(self, tester, seed, counts, checkpoint_path, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.seed = seed
+        self.counts = counts
+        self.checkpoint_path = checkpoint_path
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+        self.backoff = 0.0
+        self.pause_until = 0.0
+        self.state = {"seed": seed, "counts": counts, "stage": STAGES[0], "next_index": 0, "failed": {}}
+        self.video_ids = {}
+        self.load_checkpoint()
+
+    def load_checkpoint(self):
+        """Resume from an existing checkpoint for the same seed and dataset shape"""
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        if state.get("seed") != self.seed or state.get("counts") != self.counts:
+            raise ValueError(f"Checkpoint {self.checkpoint_path} was written for a different seed or dataset shape")
+        self.state = state
+
+        if os.path.exists(self.ids_path("videos")):
+            with open(self.ids_path("videos")) as f:
+                for line in f:
+                    index, video_id = line.split()
+                    self.video_ids[int(index)] = video_id
+        print(f"♻️ Resuming at stage '{state['stage']}' index {state['next_index']}")
+
+    def save_checkpoint(self):
+        """Atomically persist progress"""
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def ids_path(self, stage):
+        """Append-only index→ID file for entities later stages reference"""
+        return f"{self.checkpoint_path}.{stage}.ids"
+
+    def user(self, index):
+        """Harness user record for seeded user `index`, logging in on token cache miss"""
+        with self.lock:
+            if index in self.tokens:
+                self.tokens.move_to_end(index)
+                return self.tokens[index]
+
+        user = self.tester.login_user(user_spec(self.seed, index))
+        if user is None:
+            return None
+        with self.lock:
+            self.tokens[index] = user
+            if len(self.tokens) > TOKEN_CACHE_SIZE:
+                self.tokens.popitem(last=False)
+        return user
+
+    def owner(self, stage, index, n_users):
+        """Acting user for entity `index`; contiguous blocks share an owner to keep token cache hits high"""
+        return min(n_users - 1, index * n_users // max(1, self.counts[stage]))
+
+    def throttle(self, response):
+        """Back off when the server sheds load; reset once requests succeed again"""
+        overloaded = response is None or response.status_code == 429 or response.status_code >= 500
+        with self.lock:
+            if overloaded:
+                self.backoff = min(BACKOFF_MAX, self.backoff * 2 or BACKOFF_START)
+                self.pause_until = max(self.pause_until, time.monotonic() + self.backoff)
+            else:
+                self.backoff = 0.0
+        return not overloaded
+
+    def wait_for_capacity(self):
+        """Block while a back-off pause is active"""
+        while True:
+            with self.lock:
+                delay = self.pause_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def seed_users(self, index):
+        """Register one user"""
+        spec = user_spec(self.seed, index)
+        response = self.tester.request("POST", "POST /auth/register", "/auth/register", json=spec)
+        if response is not None and response.status_code == 400 and "already" in response.text:
+            return True
+        self.throttle(response)
+        if response is None or response.status_code != 201:
+            return False
+        result = response.json()
+        with self.lock:
+            self.tokens[index] = {
+                "data": spec,
+                "token": result.get("token"),
+                "user_id": result.get("user", {}).get("id"),
+                "headers": {"Authorization": f"Bearer {result.get('token')}"}
+            }
+            if len(self.tokens) > TOKEN_CACHE_SIZE:
+                self.tokens.popitem(last=False)
+        return True
+
+    def follow_target(self, index, follower, n_users):
+        """Target for follow `index`, distinct within its follower's block; None when the block outgrows the users
+
+        POST /users/follow toggles, so a repeated (follower, target) pair would unfollow.
+        """
+        total = self.counts["follows"]
+        block_start = -(-follower * total // n_users)
+        block_size = -(-(follower + 1) * total // n_users) - block_start
+        rng = rng_for(self.seed, "follows", f"targets:{follower}")
+        pool = {skewed_index(rng, n_users) for _ in range(FOLLOW_POOL_FACTOR * block_size)} - {follower}
+        if len(pool) < block_size:
+            pool = set(range(n_users)) - {follower}
+        targets = rng.sample(sorted(pool), min(block_size, len(pool)))
+        position = index - block_start
+        return targets[position] if position < len(targets) else None
+
+    def seed_follows(self, index):
+        """Follow a popularity-skewed creator unless a retry or earlier run already did"""
+        n_users = self.counts["users"]
+        follower_index = self.owner("follows", index, n_users)
+        target_index = self.follow_target(index, follower_index, n_users)
+        if target_index is None:
+            return True
+        follower = self.user(follower_index)
+        target = self.user(target_index)
+        if follower is None or target is None:
+            return False
+        response = self.tester.request("GET", "GET /users/profile/:username",
+                                       f"/users/profile/{target['data']['username']}", user=follower)
+        if not self.throttle(response) or response.status_code != 200:
+            return False
+        if response.json().get("user", {}).get("isFollowing"):
+            return True
+        target_id = self.tester.object_id(target)
+        if target_id is None:
+            return False
+        response = self.tester.request("POST", "POST /users/follow/:userId", f"/users/follow/{target_id}", user=follower)
+        # A toggle that reports not-following undid a follow the profile check raced with; the retry re-checks
+        return self.throttle(response) and response.status_code == 200 and response.json().get("isFollowing") is True
+
+    def seed_videos(self, index):
+        """Upload one small video"""
+        rng = rng_for(self.seed, "videos", index)
+        creator = self.user(self.owner("videos", index, self.counts["users"]))
+        if creator is None:
+            return False
+        caption = " ".join(f"#{w}" if rng.random() < 0.3 else w for w in rng.sample(CAPTION_WORDS, 4))
+        files = {"video": (f"seed_{index}.mp4", FAKE_VIDEO, "video/mp4")}
+        response = self.tester.request("POST", "POST /videos/upload", "/videos/upload", user=creator,
+                                       data={"caption": caption, "allowComments": "true"}, files=files)
+        if not self.throttle(response) or response.status_code != 201:
+            return False
+        video_id = response.json().get("video", {}).get("id")
+        with self.lock:
+            self.video_ids[index] = video_id
+            with open(self.ids_path("videos"), "a") as f:
+                f.write(f"{index} {video_id}\n")
+        return True
+
+    def seed_comments(self, index):
+        """Comment on a popularity-skewed video"""
+        rng = rng_for(self.seed, "comments", index)
+        if not self.video_ids:
+            return False
+        video_index = skewed_index(rng, self.counts["videos"])
+        video_id = self.video_ids.get(video_index) or next(iter(self.video_ids.values()))
+        commenter = self.user(self.owner("comments", index, self.counts["users"]))
+        if commenter is None:
+            return False
+        text = f"{rng.choice(CAPTION_WORDS)} {rng.choice(['🔥', '😂', '❤️', '👏', ''])}".strip()
+        response = self.tester.request("POST", "POST /comments/video/:videoId", f"/comments/video/{video_id}",
+                                       user=commenter, json={"text": text})
+        return self.throttle(response) and response.status_code == 201
+
+    def seed_stories(self, index):
+        """Create one text story"""
+        rng = rng_for(self.seed, "stories", index)
+        creator = self.user(self.owner("stories", index, self.counts["users"]))
+        if creator is None:
+            return False
+        story_data = {
+            "content": "text",
+            "text": " ".join(rng.sample(CAPTION_WORDS, 3)),
+            "backgroundColor": f"#{rng.randrange(0x1000000):06X}",
+            "privacy": "public"
+        }
+        response = self.tester.request("POST", "POST /stories/create", "/stories/create", user=creator, json=story_data)
+        return self.throttle(response) and response.status_code == 201
+
+    def seed_messages(self, index):
+        """Send one text message to a popularity-skewed recipient"""
+        n_users = self.counts["users"]
+        rng = rng_for(self.seed, "messages", index)
+        sender = self.user(self.owner("messages", index, n_users))
+        recipient = self.user(skewed_index(rng, n_users))
+        if sender is None or recipient is None:
+            return False
+        recipient_id = self.tester.object_id(recipient)
+        if recipient_id is None:
+            return False
+        message_data = {"recipientId": recipient_id, "text": " ".join(rng.sample(CAPTION_WORDS, 5))}
+        response = self.tester.request("POST", "POST /messages/send", "/messages/send", user=sender, json=message_data)
+        return self.throttle(response) and response.status_code == 201
+
+    def run_stage(self, stage, start):
+        """Stream one stage with bounded in-flight work and a contiguous completion watermark
+
+        Failed indices pass the watermark but are checkpointed and retried in later passes and on resume.
+        """
+        total = self.counts[stage]
+        seed_one = getattr(self, f"seed_{stage}")
+        in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+        done = set()
+        watermark = start
+        failed = set(self.state["failed"].get(stage) or [])
+        retried = len(failed)
+        last_save = time.monotonic()
+        started = time.monotonic()
+
+        def task(index):
+            try:
+                for _ in range(MAX_RETRIES):
+                    self.wait_for_capacity()
+                    if seed_one(index):
+                        return True
+                return False
+            except Exception:
+                return False
+
+        def finished(index, future):
+            nonlocal watermark, last_save
+            in_flight.release()
+            with self.lock:
+                if future.result():
+                    failed.discard(index)
+                else:
+                    failed.add(index)
+                if index >= watermark:
+                    done.add(index)
+                    while watermark in done:
+                        done.remove(watermark)
+                        watermark += 1
+                self.state["next_index"] = watermark
+                if time.monotonic() - last_save >= CHECKPOINT_EVERY:
+                    last_save = time.monotonic()
+                    self.state["failed"][stage] = sorted(failed)
+                    self.save_checkpoint()
+                    rate = (watermark - start) / (last_save - started)
+                    print(f"   {stage}: {watermark}/{total} ({rate:.0f}/s, {len(failed)} failed)")
+
+        def submit(indices):
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for index in indices:
+                    in_flight.acquire()
+                    future = pool.submit(task, index)
+                    future.add_done_callback(lambda f, i=index: finished(i, f))
+
+        print(f"\n🌱 Seeding {stage}: {start}/{total} already done"
+              + (f", retrying {retried} failed" if retried else ""))
+        submit([*sorted(failed), *range(start, total)])
+        for _ in range(RETRY_PASSES):
+            if not failed:
+                break
+            print(f"   {stage}: retrying {len(failed)} failed")
+            submit(sorted(failed))
+
+        self.state["failed"][stage] = sorted(failed)
+        self.log_stage(stage, total - start + retried, len(failed), time.monotonic() - started)
+
+    def log_stage(self, stage, count, failed, elapsed):
+        """Report stage completion"""
+        self.tester.log_result(f"Seed - {stage}", failed == 0,
+                               f"{count} seeded in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f}/s), {failed} failed")
+
+    def run(self):
+        """Seed every remaining stage, resuming from the checkpoint"""
+        print(f"🚀 Seeding dataset (seed {self.seed}) into {self.tester.base_url}")
+        print("=" * 70)
+        for stage in STAGES[STAGES.index(self.state["stage"]):]:
+            start = self.state["next_index"] if stage == self.state["stage"] else 0
+            self.state["stage"] = stage
+            self.state["next_index"] = start
+            self.run_stage(stage, start)
+            self.save_checkpoint()
+
+        self.state["stage"] = "done"
+        self.state["next_index"] = 0
+        self.save_checkpoint()
+        print("\n🎯 SEEDING COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a deterministic synthetic dataset")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every default entity count")
+    for stage in STAGES:
+        parser.add_argument(f"--{stage}", type=int, help=f"number of {stage} (default {DEFAULT_COUNTS[stage]} × scale)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    counts = {stage: getattr(args, stage) or int(DEFAULT_COUNTS[stage] * args.scale) for stage in STAGES}
+    tester = LoadTester(args.base_url)
+    tester.recording = False
+
+    seeder = DatasetSeeder(tester, args.seed, counts, args.checkpoint, args.concurrency)
+    if seeder.state["stage"] == "done":
+        print(f"✅ Dataset already seeded according to {args.checkpoint}")
+        return
+    seeder.run()
+
+
+if __name__ == "__main__":
+    main()
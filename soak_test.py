@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Long-duration Soak Test with Leak and Drift Detection
+Runs a steady mixed workload for hours in bounded memory and flags monotonic growth
+"""
+
+import argparse
+import os
+import threading
+import time
+from collections import deque
+
+from load_test import BASE_URL, DEFAULT_CONCURRENCY, DEFAULT_USERS, SCENARIOS, LoadTester
+from resource_sampler import ResourceSampler
+from run_manifest import UPLOADS_DIR
+from steady_state import kendall_tau, linear_slope
+
+# Configuration
+DEFAULT_DURATION = 4 * 60 * 60
+DEFAULT_WINDOW = 60
+DEFAULT_TREND_EVERY = 10
+MAX_WINDOWS = 2_000
+MIN_TREND_WINDOWS = 5
+TREND_TAU = 0.6
+TREND_MIN_GROWTH = 0.10
+
+TREND_METRICS = {
+    "p50_ms": "latency p50",
+    "p99_ms": "latency p99",
+    "server_rss_mb": "server RSS",
+    "uploads_mb": "uploads directory",
+    "harness_rss_mb": "harness RSS"
+}
+
+
+def directory_size_mb(path):
+    """Total size of all files under path in MB"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total / (1024 * 1024)
+
+
+def harness_rss_mb():
+    """Resident set size of this harness process in MB"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+class SoakTester:
+    def __init__(self, tester, window=DEFAULT_WINDOW, uploads_dir=UPLOADS_DIR):
+        self.tester = tester
+        self.window = window
+        self.uploads_dir = uploads_dir
+        self.windows = deque(maxlen=MAX_WINDOWS)
+
+    def close_window(self, index, seconds=None):
+        """Summarise and discard the records collected since the last window; seconds marks a short final one"""
+        stats = self.tester.reset_records().summary()
+        summary = {
+            "index": index,
+            "t": self.tester.clock(),
+            "seconds": seconds or self.window,
+            "partial": seconds is not None,
+            "requests": stats["count"],
+            "rps": stats["count"] / (seconds or self.window),
+            "error_rate": stats["error_rate"],
+            "p50_ms": stats["p50_ms"],
+            "p99_ms": stats["p99_ms"],
+            "uploads_mb": directory_size_mb(self.uploads_dir),
+            "harness_rss_mb": harness_rss_mb(),
+            "server_rss_mb": None
+        }
+
+        sampler = self.tester.sampler
+        samples = sampler.samples[:] if sampler else []
+        if samples:
+            summary["server_rss_mb"] = max(s["rss_mb"] for s in samples)
+            # Trim in place only what was read; the sampler thread keeps appending to the same list
+            del sampler.samples[:len(samples) - 1]
+
+        self.windows.append(summary)
+        return summary
+
+    def trends(self):
+        """Fit a trend to every metric and flag sustained monotonic growth"""
+        results = {}
+        for metric in TREND_METRICS:
+            # A short final window has percentiles from fewer samples, so it is reported but not fitted
+            values = [w[metric] for w in self.windows if w[metric] is not None and not w["partial"]]
+            if len(values) < MIN_TREND_WINDOWS:
+                continue
+            tau = kendall_tau(values)
+            slope = linear_slope(values)
+            baseline = values[0] or 1e-9
+            growth = (values[-1] - values[0]) / baseline
+            results[metric] = {
+                "tau": tau,
+                "slope_per_hour": slope * 3600 / self.window,
+                "growth": growth,
+                "flagged": tau >= TREND_TAU and slope > 0 and growth >= TREND_MIN_GROWTH
+            }
+        return results
+
+    def print_trends(self):
+        """Print the current trend check"""
+        full = sum(1 for w in self.windows if not w["partial"])
+        print(f"\n📉 Trend check over {full} windows:")
+        for metric, trend in self.trends().items():
+            status = "❌ GROWING" if trend["flagged"] else "✅ stable"
+            print(f"  {status}: {TREND_METRICS[metric]} τ={trend['tau']:+.2f} "
+                  f"slope={trend['slope_per_hour']:+.2f}/h growth={trend['growth'] * 100:+.1f}%")
+
+    def run(self, scenario, duration, concurrency, trend_every=DEFAULT_TREND_EVERY):
+        """Drive a continuous workload and close a summary window every `window` seconds"""
+        self.tester.reset_records()
+        load = threading.Thread(target=self.tester.run_load, args=(scenario, duration, concurrency), daemon=True)
+        load.start()
+
+        index = 0
+        next_close = time.monotonic() + self.window
+        try:
+            while load.is_alive():
+                load.join(max(0.0, next_close - time.monotonic()))
+                if time.monotonic() < next_close:
+                    continue
+                self.print_window(self.close_window(index))
+                index += 1
+                next_close += self.window
+                if index % trend_every == 0:
+                    self.print_trends()
+        finally:
+            # Requests since the last boundary (run end or interrupt) are summarised as a partial window
+            seconds = self.window - max(0.0, next_close - time.monotonic())
+            if len(self.tester.records) and seconds > 0:
+                self.print_window(self.close_window(index, seconds))
+
+    def print_window(self, w):
+        """Print one window summary line"""
+        label = f"window {w['index']}" + (f" (partial, {w['seconds']:.1f}s)" if w["partial"] else "")
+        print(f"⏱️ {label}: {w['rps']:.1f} req/s, p50 {w['p50_ms']:.1f} ms, p99 {w['p99_ms']:.1f} ms, "
+              f"errors {w['error_rate'] * 100:.2f}%, server RSS {w['server_rss_mb'] or 0:.0f} MB, "
+              f"uploads {w['uploads_mb']:.1f} MB, harness RSS {w['harness_rss_mb']:.0f} MB")
+
+    def print_summary(self):
+        """Print final soak verdict"""
+        print("\n" + "=" * 70)
+        print("📊 SOAK TEST SUMMARY")
+        print("=" * 70)
+        partial = [w for w in self.windows if w["partial"]]
+        print(f"Windows: {len(self.windows) - len(partial)} × {self.window}s"
+              + (f" + partial {partial[-1]['seconds']:.1f}s (not trend-fitted)" if partial else ""))
+        print(f"Total Requests: {sum(w['requests'] for w in self.windows)}")
+        self.print_trends()
+
+        flagged = [TREND_METRICS[m] for m, t in self.trends().items() if t["flagged"]]
+        for metric in flagged:
+            self.tester.log_result(f"Soak - {metric}", False, "monotonic growth detected")
+        if not flagged:
+            self.tester.log_result("Soak - Drift", True, "no monotonic growth detected")
+        print("\n🎯 SOAK TESTING COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the TikTok Clone backend")
+    parser.add_argument("--scenario", default="mixed", choices=SCENARIOS)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="seconds per summary window")
+    parser.add_argument("--trend-every", type=int, default=DEFAULT_TREND_EVERY, help="windows between trend checks")
+    parser.add_argument("--uploads-dir", default=UPLOADS_DIR)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--server-pid", type=int)
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Backend Soak Test")
+    print("=" * 70)
+
+    print("\n📋 Setting up virtual users...")
+    if not tester.setup_users(args.users, args.concurrency):
+        print("❌ No virtual users available, aborting soak test")
+        return
+
+    tester.sampler = ResourceSampler(tester.clock, args.base_url, pid=args.server_pid)
+    tester.sampler.start()
+    soak = SoakTester(tester, args.window, args.uploads_dir)
+    try:
+        soak.run(args.scenario, args.duration, args.concurrency, args.trend_every)
+    except KeyboardInterrupt:
+        print("\n⚠️ Soak interrupted, reporting collected windows")
+    finally:
+        tester.sampler.stop()
+
+    soak.print_summary()
+
+
+if __name__ == "__main__":
+    main()
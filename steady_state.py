@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Warm-up Exclusion and Steady-state Detection
+Splits a run's records into a cold-start phase and the steady state found by rolling percentile stability,
+and fits monotonic trends across a long run's windows
+"""
+
+from bisect import bisect_left
+
+from metrics_store import NS_PER_S
+
+try:
+    import numpy as np
+except ImportError:  # windows are bisected in pure Python
+    np = None
+
+# Configuration
+DEFAULT_WARMUP = 5.0
+DEFAULT_WINDOW = 2.0
+STABLE_WINDOWS = 3
+STABLE_TOLERANCE = 0.2
+STABLE_PERCENTILE = 95
+MIN_WINDOW_REQUESTS = 20
+
+
+def rolling_windows(records, window=DEFAULT_WINDOW):
+    """Summaries of consecutive fixed-length windows from the first request start; [(start, end, stats)]"""
+    if not len(records):
+        return []
+    first = records.start_time()
+    end = first + records.span()
+    # Rows are appended as requests finish, so sort once by start and bisect each window's bounds
+    starts = records.column("t_ns")
+    if np is not None:
+        order = np.argsort(starts, kind="stable")
+        ordered = starts[order]
+        bounds = lambda lo_ns, hi_ns: np.searchsorted(ordered, [lo_ns, hi_ns], side="left")
+    else:
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        ordered = [starts[i] for i in order]
+        bounds = lambda lo_ns, hi_ns: (bisect_left(ordered, lo_ns), bisect_left(ordered, hi_ns))
+    windows = []
+    start = first
+    while start < end:
+        lo, hi = bounds(int(start * NS_PER_S), int((start + window) * NS_PER_S))
+        windows.append((start, start + window, records.take(order[lo:hi]).summary()))
+        start += window
+    return windows
+
+
+def detect_steady_state(records, warmup=DEFAULT_WARMUP, window=DEFAULT_WINDOW):
+    """Start time (s) of the first run of stable windows after the minimum warm-up, or None if never stable
+
+    A window run is stable when every window has enough requests and its p95 is within
+    STABLE_TOLERANCE of the run's median p95.
+    """
+    windows = rolling_windows(records, window)
+    if not windows:
+        return None
+    origin = windows[0][0]
+    key = f"p{STABLE_PERCENTILE}_ms"
+    for i in range(len(windows) - STABLE_WINDOWS + 1):
+        start = windows[i][0]
+        if start - origin < warmup:
+            continue
+        run = [stats for _, _, stats in windows[i:i + STABLE_WINDOWS]]
+        if any(stats["count"] < MIN_WINDOW_REQUESTS for stats in run):
+            continue
+        values = sorted(stats[key] for stats in run)
+        median = values[len(values) // 2]
+        if median and all(abs(v - median) <= STABLE_TOLERANCE * median for v in values):
+            return start
+    return None
+
+
+def split_warmup(records, warmup=DEFAULT_WARMUP, window=DEFAULT_WINDOW):
+    """Return (cold, steady, steady_from); steady is the whole run when no steady state was found"""
+    steady_from = detect_steady_state(records, warmup, window)
+    if steady_from is None:
+        return records[:0], records, None
+    return records.select(until=steady_from), records.select(since=steady_from), steady_from
+
+
+def count_inversions(values):
+    """Merge sort values, returning (sorted list, number of pairs i < j with values[j] < values[i])"""
+    if len(values) < 2:
+        return list(values), 0
+    mid = len(values) // 2
+    left, left_count = count_inversions(values[:mid])
+    right, right_count = count_inversions(values[mid:])
+    merged = []
+    inversions = left_count + right_count
+    i = j = 0
+    while i < len(left) and j < len(right):
+        # Ties take the left element first so equal values are never counted as inversions
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            inversions += len(left) - i
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged, inversions
+
+
+def kendall_tau(values):
+    """Kendall rank correlation between window index and value; +1 means strictly increasing"""
+    n = len(values)
+    pairs = n * (n - 1) // 2
+    if not pairs:
+        return 0.0
+    # Window indices never tie, so discordant pairs are the inversions of values and the rest are
+    # concordant apart from tied values; O(n log n) rather than comparing every pair
+    ordered, discordant = count_inversions(list(values))
+    tied = 0
+    run = 1
+    for previous, value in zip(ordered, ordered[1:]):
+        if value == previous:
+            run += 1
+        else:
+            tied += run * (run - 1) // 2
+            run = 1
+    tied += run * (run - 1) // 2
+    concordant = pairs - discordant - tied
+    return (concordant - discordant) / pairs
+
+
+def linear_slope(values):
+    """Least-squares slope of values per window"""
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    var_x = sum((x - mean_x) ** 2 for x in range(n))
+    return sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / var_x if var_x else 0.0
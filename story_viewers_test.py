@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Story Viewers Scaling Benchmark
+Drives 10^3–10^5 distinct viewers onto one story and measures view writes and viewer-list reads as it grows
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from load_test import BASE_URL, LoadTester
+from seed_data import DEFAULT_SEED, user_spec
+
+# Configuration
+DEFAULT_VIEWERS = 10_000
+DEFAULT_CONCURRENCY = 64
+DEFAULT_LIST_SAMPLES = 5
+CHECKPOINTS = [1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000]
+
+
+def read_cells(read):
+    """p50 and KB cells for a sampled read, or n/a and its statuses when not every sample returned 200"""
+    if read["statuses"] != [200]:
+        return "n/a", "/".join(map(str, read["statuses"])) or "none"
+    return f"{read['p50_ms']:.1f}", f"{read['bytes'] / 1024:.0f}"
+
+
+class StoryViewersTester:
+    def __init__(self, tester, seed=DEFAULT_SEED, concurrency=DEFAULT_CONCURRENCY, list_samples=DEFAULT_LIST_SAMPLES):
+        self.tester = tester
+        self.seed = seed
+        self.concurrency = concurrency
+        self.list_samples = list_samples
+        self.creator = None
+        self.story_id = None
+        self.results = []
+        self.successful_views = 0
+
+    def create_story(self):
+        """Log in the creator and post the story every viewer will hit"""
+        self.creator = self.tester.login_user({
+            "username": f"viral_creator_{self.seed}",
+            "email": f"viral_creator_{self.seed}@example.com",
+            "password": "ViralCreator123",
+            "displayName": "Viral Creator"
+        })
+        if self.creator is None:
+            self.tester.log_result("Story Viewers - Setup", False, "Creator login failed")
+            return False
+
+        story_data = {"content": "text", "text": "Going viral 🚀", "backgroundColor": "#FF6B6B", "privacy": "public"}
+        response = self.tester.request("POST", "POST /stories/create", "/stories/create", user=self.creator, json=story_data)
+        if response is None or response.status_code != 201:
+            self.tester.log_result("Story Viewers - Setup", False, f"Story creation failed: {response.text if response is not None else 'no response'}")
+            return False
+        self.story_id = response.json()["data"]["id"]
+        self.tester.log_result("Story Viewers - Setup", True, f"Story created with UUID: {self.story_id}")
+        return True
+
+    def view(self, viewer):
+        """One viewer opens the story"""
+        response = self.tester.request("POST", "POST /stories/:storyId/view", f"/stories/{self.story_id}/view", user=viewer)
+        return response is not None and response.status_code == 200
+
+    def measure_reads(self):
+        """Sample the viewers list and the creator's own stories, both of which embed the viewers array"""
+        reads = {}
+        for route, path in [("GET /stories/:storyId/viewers", f"/stories/{self.story_id}/viewers"),
+                            ("GET /stories/my-stories", "/stories/my-stories")]:
+            mark = len(self.tester.records)
+            sizes, returned, statuses = [], 0, set()
+            for _ in range(self.list_samples):
+                response = self.tester.request("GET", route, path, user=self.creator)
+                if response is None:
+                    continue
+                statuses.add(response.status_code)
+                sizes.append(len(response.content))
+                if response.status_code == 200:
+                    body = response.json()
+                    if "viewers" in body:
+                        returned = len(body["viewers"])
+                    else:
+                        story = next((s for s in body.get("stories", []) if s.get("id") == self.story_id), {})
+                        returned = story.get("viewsCount", 0)
+            stats = self.tester.records[mark:].summary()
+            stats.update({"bytes": max(sizes, default=0), "returned": returned, "statuses": sorted(statuses)})
+            reads[route] = stats
+        return reads
+
+    def run(self, total_viewers):
+        """Grow the viewer count checkpoint by checkpoint"""
+        checkpoints = [c for c in CHECKPOINTS if c < total_viewers] + [total_viewers]
+        viewed = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for checkpoint in checkpoints:
+                print(f"\n👥 Logging in viewers {viewed}–{checkpoint}...")
+                viewers = [v for v in pool.map(self.tester.login_user,
+                                               (user_spec(self.seed, i) for i in range(viewed, checkpoint))) if v]
+
+                print(f"👁️ {len(viewers)} concurrent views...")
+                mark = len(self.tester.records)
+                self.successful_views += sum(pool.map(self.view, viewers))
+                views = self.tester.records[mark:].select(route="POST /stories/:storyId/view").summary()
+                viewed = checkpoint
+
+                reads = self.measure_reads()
+                self.results.append({"viewers": checkpoint, "views": views, "reads": reads})
+                viewer_list = reads["GET /stories/:storyId/viewers"]
+                if viewer_list["statuses"] == [200]:
+                    list_text = f"viewers list p50 {viewer_list['p50_ms']:.1f} ms, {viewer_list['bytes'] / 1024:.0f} KB"
+                else:
+                    list_text = f"viewers list not measured (status {viewer_list['statuses']})"
+                print(f"   view p50 {views['p50_ms']:.1f} ms p99 {views['p99_ms']:.1f} ms ({views['rps']:.0f}/s), {list_text}")
+
+    def verify(self):
+        """Compare the story's viewsCount with the number of views the server acknowledged"""
+        reads = self.measure_reads()
+        views_count = reads["GET /stories/my-stories"]["returned"]
+        self.tester.log_result("Story Viewers - viewsCount", views_count == self.successful_views,
+                               f"viewsCount {views_count} vs {self.successful_views} acknowledged views")
+        statuses = reads["GET /stories/:storyId/viewers"]["statuses"]
+        self.tester.log_result("Story Viewers - Viewers List", statuses == [200],
+                               f"creator's viewers list returned status {statuses}")
+
+    def print_summary(self):
+        """Print viewer scaling table"""
+        print("\n" + "=" * 70)
+        print("📊 STORY VIEWERS SCALING SUMMARY")
+        print("=" * 70)
+        print(f"{'Viewers':>8} {'View p50':>9} {'View p99':>9} {'Views/s':>8} "
+              f"{'List p50':>9} {'List KB':>8} {'Mine p50':>9} {'Mine KB':>8}")
+        for result in self.results:
+            views = result["views"]
+            list_p50, list_kb = read_cells(result["reads"]["GET /stories/:storyId/viewers"])
+            mine_p50, mine_kb = read_cells(result["reads"]["GET /stories/my-stories"])
+            print(f"{result['viewers']:>8} {views['p50_ms']:>9.1f} {views['p99_ms']:>9.1f} {views['rps']:>8.0f} "
+                  f"{list_p50:>9} {list_kb:>8} {mine_p50:>9} {mine_kb:>8}")
+        print("n/a: a sampled read returned a non-200 status (shown in the KB column), so its latency is not viewer scaling.")
+        print("\n🎯 STORY VIEWERS BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark story views and viewer lists as one story goes viral")
+    parser.add_argument("--viewers", type=int, default=DEFAULT_VIEWERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--list-samples", type=int, default=DEFAULT_LIST_SAMPLES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="viewers are this seed's seeded users")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Story Viewers Scaling Benchmark")
+    print("=" * 70)
+
+    benchmark = StoryViewersTester(tester, args.seed, args.concurrency, args.list_samples)
+    if not benchmark.create_story():
+        return
+    benchmark.run(args.viewers)
+    benchmark.verify()
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()
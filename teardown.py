@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Bulk Teardown and Dataset Snapshots Between Benchmark Runs
+Deletes everything a run's manifest tracked concurrently and saves/restores database and uploads snapshots
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from load_test import BASE_URL, LoadTester
+from run_manifest import DEFAULT_MANIFEST_DIR, UPLOADS_DIR, load_manifest
+
+# Configuration
+DEFAULT_CONCURRENCY = 32
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+BACKEND_ENV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_backend", ".env")
+
+
+def mongodb_uri():
+    """MONGODB_URI from the environment or the backend's .env"""
+    if os.environ.get("MONGODB_URI"):
+        return os.environ["MONGODB_URI"]
+    try:
+        with open(BACKEND_ENV) as f:
+            for line in f:
+                key, _, value = line.strip().partition("=")
+                if key == "MONGODB_URI":
+                    return value
+    except OSError:
+        pass
+    return None
+
+
+def link_or_copy(src, dst):
+    """Hard-link a file into a snapshot, copying when links are not possible"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class Teardown:
+    def __init__(self, tester, uploads_dir=UPLOADS_DIR, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.uploads_dir = uploads_dir
+        self.concurrency = concurrency
+        self.outcomes = Counter()
+        self.files_removed = 0
+        self.bytes_freed = 0
+        self.accounts = 0
+
+    def delete(self, entity, token):
+        """Delete one created entity as its owner; 404 counts as already gone, a 403 on a story as forbidden"""
+        kind, entity_id = entity["kind"], entity["id"]
+        body = {"json": {"deleteFor": "everyone"}} if kind == "messages" else {}
+        response = self.tester.request("DELETE", f"DELETE /{kind}/:id", f"/{kind}/{entity_id}",
+                                       user={"headers": {"Authorization": f"Bearer {token}"}}, **body)
+        if response is None:
+            return kind, "failed"
+        if response.status_code == 200:
+            return kind, "deleted"
+        if response.status_code == 404:
+            return kind, "gone"
+        # DELETE /stories/:id compares the String creator with the ObjectId user id, so owners are refused
+        return kind, "forbidden" if response.status_code == 403 and kind == "stories" else "failed"
+
+    def remove_file(self, url):
+        """Remove an uploaded file from the local uploads directory"""
+        path = urlparse(url).path
+        if not path.startswith("/uploads/"):
+            return
+        local = os.path.realpath(os.path.join(self.uploads_dir, path[len("/uploads/"):]))
+        if not local.startswith(os.path.realpath(self.uploads_dir) + os.sep):
+            return
+        try:
+            size = os.path.getsize(local)
+            os.remove(local)
+        except OSError:
+            return
+        self.files_removed += 1
+        self.bytes_freed += size
+
+    def clean(self, path):
+        """Delete everything one manifest tracked; the manifest is removed once nothing failed"""
+        entities, tokens, users = load_manifest(path)
+        self.accounts += len(users)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            outcomes = list(pool.map(lambda e: self.delete(e, tokens.get(e["owner"])), entities))
+        self.outcomes.update(outcomes)
+        # Media of entities that are still live stays, so the manifest kept on failure still matches the uploads
+        for entity, (_, outcome) in zip(entities, outcomes):
+            if outcome in ("deleted", "gone"):
+                for url in entity["files"]:
+                    self.remove_file(url)
+        failed = sum(1 for _, outcome in outcomes if outcome not in ("deleted", "gone"))
+        self.tester.log_result(f"Teardown - {os.path.basename(path)}", not failed,
+                               f"{len(entities) - failed}/{len(entities)} entities removed, {len(users)} accounts tracked")
+        if not failed:
+            os.remove(path)
+
+    def print_summary(self, elapsed):
+        """Print deletions per kind, freed uploads and what only a snapshot restore can undo"""
+        print("\n" + "=" * 70)
+        print("📊 TEARDOWN SUMMARY")
+        print("=" * 70)
+        print(f"{'Kind':<10} {'Deleted':>8} {'Gone':>6} {'403':>6} {'Failed':>7}")
+        for kind in sorted({kind for kind, _ in self.outcomes}):
+            print(f"{kind:<10} {self.outcomes[(kind, 'deleted')]:>8} {self.outcomes[(kind, 'gone')]:>6} "
+                  f"{self.outcomes[(kind, 'forbidden')]:>6} {self.outcomes[(kind, 'failed')]:>7}")
+        forbidden = sum(n for (_, outcome), n in self.outcomes.items() if outcome == "forbidden")
+        if forbidden:
+            print(f"⚠️ {forbidden} stories refused with 403: the route's owner check compares a String creator with "
+                  f"an ObjectId, so they stay live with their media; their manifests are kept")
+        total = sum(self.outcomes.values())
+        print(f"\n{total} deletes in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s), "
+              f"{self.files_removed} files removed ({self.bytes_freed / 1024 / 1024:.1f} MB)")
+        # The DELETE routes only flag documents (isDeleted / isActive) and there is no account deletion route
+        print(f"⚠️ Deleted documents stay in MongoDB as soft deletes and {self.accounts} accounts remain; "
+              f"restore a snapshot for an identical dataset: python teardown.py snapshot restore NAME")
+        print("\n🎯 TEARDOWN COMPLETE")
+
+
+def save_snapshot(name, uri, uploads_dir=UPLOADS_DIR, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Dump the database and hard-link the uploads directory into snapshots/NAME"""
+    target = os.path.join(snapshot_dir, name)
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.makedirs(target)
+    start = time.perf_counter()
+    subprocess.run(["mongodump", f"--uri={uri}", f"--archive={os.path.join(target, 'mongo.archive.gz')}", "--gzip"],
+                   check=True)
+    if os.path.isdir(uploads_dir):
+        shutil.copytree(uploads_dir, os.path.join(target, "uploads"), copy_function=link_or_copy)
+    print(f"📸 Snapshot '{name}' saved to {target} in {time.perf_counter() - start:.1f}s")
+
+
+def restore_snapshot(name, uri, uploads_dir=UPLOADS_DIR, snapshot_dir=DEFAULT_SNAPSHOT_DIR, concurrency=DEFAULT_CONCURRENCY):
+    """Replace the database collections and the uploads directory with snapshots/NAME"""
+    source = os.path.join(snapshot_dir, name)
+    if not os.path.isdir(source):
+        print(f"❌ No snapshot '{name}' in {snapshot_dir}")
+        return False
+    start = time.perf_counter()
+    subprocess.run(["mongorestore", f"--uri={uri}", "--drop", f"--archive={os.path.join(source, 'mongo.archive.gz')}",
+                    "--gzip", f"--numParallelCollections={min(concurrency, 8)}",
+                    f"--numInsertionWorkersPerCollection={concurrency}"], check=True)
+    if os.path.isdir(os.path.join(source, "uploads")):
+        shutil.rmtree(uploads_dir, ignore_errors=True)
+        shutil.copytree(os.path.join(source, "uploads"), uploads_dir, copy_function=link_or_copy)
+    print(f"♻️ Snapshot '{name}' restored in {time.perf_counter() - start:.1f}s "
+          f"(restart the backend if it caches anything in memory)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean up after benchmark runs and reset the dataset")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    clean = subparsers.add_parser("clean", help="delete everything recorded in run manifests")
+    clean.add_argument("manifests", nargs="*", help=f"manifest files (default: all in {DEFAULT_MANIFEST_DIR}/)")
+    clean.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    clean.add_argument("--uploads-dir", default=UPLOADS_DIR)
+    clean.add_argument("--base-url", default=BASE_URL)
+
+    snapshot = subparsers.add_parser("snapshot", help="save or restore a database and uploads snapshot")
+    snapshot.add_argument("action", choices=["save", "restore"])
+    snapshot.add_argument("name")
+    snapshot.add_argument("--mongodb-uri", default=mongodb_uri(), help="default: MONGODB_URI or node_backend/.env")
+    snapshot.add_argument("--uploads-dir", default=UPLOADS_DIR)
+    snapshot.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR)
+    snapshot.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        tool = "mongodump" if args.action == "save" else "mongorestore"
+        if not args.mongodb_uri:
+            print("❌ No MongoDB URI; pass --mongodb-uri or set MONGODB_URI")
+            return
+        if not shutil.which(tool):
+            print(f"❌ {tool} not found; install the MongoDB Database Tools")
+            return
+        if args.action == "save":
+            save_snapshot(args.name, args.mongodb_uri, args.uploads_dir, args.snapshot_dir)
+        else:
+            restore_snapshot(args.name, args.mongodb_uri, args.uploads_dir, args.snapshot_dir, args.concurrency)
+        return
+
+    manifests = args.manifests or sorted(glob.glob(os.path.join(DEFAULT_MANIFEST_DIR, "*.jsonl")))
+    if not manifests:
+        print(f"Nothing to clean: no manifests in {DEFAULT_MANIFEST_DIR}/")
+        return
+
+    tester = LoadTester(args.base_url)
+    print(f"🧹 Cleaning up {len(manifests)} run manifest(s)")
+    print("=" * 70)
+    teardown = Teardown(tester, args.uploads_dir, args.concurrency)
+    start = time.perf_counter()
+    for path in manifests:
+        teardown.clean(path)
+    teardown.print_summary(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Unit Tests for the Columnar Record Store
+Covers percentile ranks, route interning and row selection without a running backend
+"""
+
+import pytest
+
+from metrics_store import RecordStore, RouteTable, nearest_rank
+
+
+def make_store():
+    """Six requests over two routes, one second apart, one of them failed"""
+    store = RecordStore()
+    store.append(0.0, "GET /videos/feed", 200, 0.010)
+    store.append(1.0, "GET /videos/feed", 200, 0.030)
+    store.append(2.0, "POST /stories/create", 201, 0.050)
+    store.append(3.0, "GET /videos/feed", 500, 0.020, error="boom")
+    store.append(4.0, "POST /stories/create", 201, 0.040)
+    store.append(5.0, "GET /users/profile/:username", 0, 0.060, error="timeout")
+    return store
+
+
+def test_nearest_rank():
+    ordered = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+    assert nearest_rank(ordered, 50) == 50
+    assert nearest_rank(ordered, 95) == 100
+    assert nearest_rank(ordered, 100) == 100
+    assert nearest_rank(ordered, 0) == 10
+    assert nearest_rank([7], 99) == 7
+    assert nearest_rank([], 50) == 0
+
+
+def test_route_table_interns_once():
+    routes = RouteTable()
+    assert routes.intern("GET /a") == 0
+    assert routes.intern("GET /b") == 1
+    assert routes.intern("GET /a") == 0
+    assert routes.names == ["GET /a", "GET /b"]
+
+
+def test_views_share_the_route_table():
+    store = make_store()
+    view = store.select(route="GET /videos/feed")
+    assert view.routes is store.routes
+    assert [r.route for r in view] == ["GET /videos/feed"] * 3
+
+
+def test_rows_round_trip():
+    store = make_store()
+    assert len(store) == 6
+    row = store[3]
+    assert (row.t, row.route, row.status, row.error) == (3.0, "GET /videos/feed", 500, "boom")
+    assert row.latency == pytest.approx(0.020)
+    assert store[-1].error == "timeout"
+    assert store[0].error is None
+
+
+def test_select_filters():
+    store = make_store()
+    assert [r.t for r in store.select(prefix="POST ")] == [2.0, 4.0]
+    assert [r.t for r in store.select(since=1.0, until=4.0)] == [1.0, 2.0, 3.0]
+    assert [r.t for r in store.select(min_latency=0.040)] == [2.0, 4.0, 5.0]
+    assert [r.t for r in store.select(route="GET /videos/feed", since=2.0)] == [3.0]
+    assert len(store.select(route="GET /missing")) == 0
+
+
+def test_take_keeps_errors_aligned():
+    store = make_store()
+    view = store.take([5, 0, 3])
+    assert [r.t for r in view] == [5.0, 0.0, 3.0]
+    assert [r.error for r in view] == ["timeout", None, "boom"]
+    assert len(store.take([])) == 0
+
+
+def test_slicing():
+    store = make_store()
+    head = store[:2]
+    assert [r.t for r in head] == [0.0, 1.0]
+    stepped = store[1::2]
+    assert [r.t for r in stepped] == [1.0, 3.0, 5.0]
+    assert [r.error for r in stepped] == [None, "boom", "timeout"]
+    assert len(store[:0]) == 0
+
+
+def test_summary():
+    stats = make_store().summary()
+    assert stats["count"] == 6
+    assert stats["errors"] == 2
+    assert stats["error_rate"] == pytest.approx(2 / 6)
+    assert stats["mean_ms"] == pytest.approx(35.0)
+    assert stats["p50_ms"] == pytest.approx(30.0)
+    assert stats["p99_ms"] == pytest.approx(60.0)
+    assert stats["max_ms"] == pytest.approx(60.0)
+    # First start at 0 s, last request ends at 5.06 s
+    assert stats["rps"] == pytest.approx(6 / 5.06)
+
+
+def test_empty_summary():
+    stats = RecordStore().summary()
+    assert stats["count"] == 0
+    assert stats["rps"] == 0.0
+    assert stats["p99_ms"] == 0.0
+
+
+def test_time_bounds():
+    store = make_store()[2:]
+    assert store.start_time() == 2.0
+    assert store.span() == pytest.approx(3.06)
@@ -0,0 +1,53 @@
+"""
+Unit Tests for the Response Payload Profiler
+Checks the size growth fit and the sampled compression and decode accounting
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from payload_profiler import PayloadProfiler, growth_exponent
+
+
+def fake_response(payload):
+    body = json.dumps(payload).encode()
+    return SimpleNamespace(content=body, raw=None, headers={"Content-Type": "application/json"},
+                           json=lambda **kwargs: json.loads(body, **kwargs))
+
+
+def test_growth_exponent_linear():
+    assert growth_exponent([(1_000, 5_000), (10_000, 50_000), (100_000, 500_000)]) == pytest.approx(1.0)
+
+
+def test_growth_exponent_constant_and_quadratic():
+    assert growth_exponent([(10, 800), (100, 800), (1_000, 800)]) == pytest.approx(0.0)
+    assert growth_exponent([(10, 100), (100, 10_000)]) == pytest.approx(2.0)
+
+
+def test_growth_exponent_needs_two_sizes():
+    assert growth_exponent([]) is None
+    assert growth_exponent([(100, 5), (100, 9)]) is None
+    # Non-positive points cannot be log-scaled and are dropped before fitting
+    assert growth_exponent([(0, 5), (100, 0), (1_000, 50)]) is None
+
+
+def test_sampled_gzip_and_decode_accounting():
+    profiler = PayloadProfiler(gzip_every=3)
+    payload = {"videos": [{"id": i, "title": "clip " * 20} for i in range(10)]}
+    responses = [fake_response(payload) for _ in range(7)]
+    for response in responses:
+        profiler.observe("GET /videos/feed", response)
+    # Only the responses scenario code decodes are charged
+    responses[0].json()
+    responses[1].json()
+    profiler.stop()
+
+    stats = profiler.summary()["GET /videos/feed"]
+    assert stats["count"] == 7
+    assert stats["mean_bytes"] == len(responses[0].content)
+    assert profiler.routes["GET /videos/feed"]["gzip_sampled"] == 3
+    assert stats["mean_gzip_bytes"] < stats["mean_bytes"]
+    assert stats["decoded"] == 2
+    assert stats["max_decode_ms"] >= stats["mean_decode_ms"] > 0.0
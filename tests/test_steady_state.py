@@ -0,0 +1,124 @@
+"""
+Unit Tests for Warm-up Exclusion and Steady-state Detection
+Builds synthetic runs with a known cold start and checks where the steady state is found, plus the trend fits
+"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from metrics_store import RecordStore
+from steady_state import count_inversions, detect_steady_state, kendall_tau, linear_slope, rolling_windows, split_warmup
+
+RATE = 20
+
+
+def make_run(seconds, latency_at):
+    """RATE requests per second for `seconds`, latency in seconds given by latency_at(t)"""
+    store = RecordStore()
+    for i in range(seconds * RATE):
+        t = i / RATE
+        store.append(t, "GET /videos/feed", 200, latency_at(t))
+    return store
+
+
+def cold_start(t):
+    return 0.5 if t < 6 else 0.01
+
+
+def test_rolling_windows_cover_the_run():
+    store = make_run(10, lambda t: 0.01)
+    windows = rolling_windows(store, window=2.0)
+    assert [(start, end) for start, end, _ in windows] == [(0.0, 2.0), (2.0, 4.0), (4.0, 6.0), (6.0, 8.0), (8.0, 10.0)]
+    assert [stats["count"] for _, _, stats in windows] == [2 * RATE] * 5
+
+
+def test_rolling_windows_bucket_by_start_not_append_order():
+    store = RecordStore()
+    # Rows arrive in completion order, so a slow early request is appended after faster later ones
+    store.append(1.5, "GET /a", 200, 0.1)
+    store.append(0.2, "GET /a", 200, 3.0)
+    store.append(2.5, "GET /a", 200, 0.1)
+    windows = rolling_windows(store, window=1.0)
+    # Windows start at the earliest request and run until the last one ends at 3.2 s
+    assert [start for start, _, _ in windows] == pytest.approx([0.2, 1.2, 2.2])
+    assert [stats["count"] for _, _, stats in windows] == [1, 1, 1]
+    assert windows[0][2]["max_ms"] == pytest.approx(3000.0)
+
+
+def test_rolling_windows_empty():
+    assert rolling_windows(RecordStore()) == []
+
+
+def test_detects_end_of_cold_start():
+    assert detect_steady_state(make_run(20, cold_start), warmup=5.0, window=2.0) == 6.0
+
+
+def test_respects_minimum_warmup():
+    # Stable from the first request, but nothing before the minimum warm-up counts
+    assert detect_steady_state(make_run(20, lambda t: 0.01), warmup=5.0, window=2.0) == 6.0
+
+
+def test_never_stable():
+    oscillating = make_run(20, lambda t: 0.01 if int(t) % 4 < 2 else 0.2)
+    assert detect_steady_state(oscillating, warmup=0.0, window=2.0) is None
+
+
+def test_sparse_windows_are_not_stable():
+    store = RecordStore()
+    for i in range(20):
+        store.append(float(i), "GET /a", 200, 0.01)
+    assert detect_steady_state(store, warmup=0.0, window=2.0) is None
+
+
+def test_split_warmup():
+    store = make_run(20, cold_start)
+    cold, steady, steady_from = split_warmup(store, warmup=5.0, window=2.0)
+    assert steady_from == 6.0
+    assert len(cold) == 6 * RATE
+    assert len(steady) == 14 * RATE
+    assert steady.summary()["max_ms"] == pytest.approx(10.0)
+
+
+def test_split_warmup_without_steady_state():
+    store = make_run(20, lambda t: 0.01 if int(t) % 4 < 2 else 0.2)
+    cold, steady, steady_from = split_warmup(store, warmup=0.0, window=2.0)
+    assert steady_from is None
+    assert len(cold) == 0
+    assert len(steady) == len(store)
+
+
+def pairwise_tau(values):
+    """Reference Kendall tau comparing every pair"""
+    signs = [(b > a) - (b < a) for a, b in combinations(values, 2)]
+    return sum(signs) / len(signs) if signs else 0.0
+
+
+def test_count_inversions():
+    assert count_inversions([3, 1, 2]) == ([1, 2, 3], 2)
+    assert count_inversions([2, 2, 1]) == ([1, 2, 2], 2)
+    assert count_inversions([1, 1, 1]) == ([1, 1, 1], 0)
+    assert count_inversions([]) == ([], 0)
+
+
+def test_kendall_tau_extremes():
+    assert kendall_tau([1, 2, 3, 4, 5]) == 1.0
+    assert kendall_tau([5, 4, 3, 2, 1]) == -1.0
+    assert kendall_tau([3, 3, 3, 3]) == 0.0
+    assert kendall_tau([7]) == 0.0
+    assert kendall_tau([]) == 0.0
+
+
+def test_kendall_tau_matches_pairwise_with_ties():
+    rng = random.Random(1)
+    for _ in range(200):
+        values = [rng.randint(0, 6) for _ in range(rng.randint(2, 60))]
+        assert kendall_tau(values) == pytest.approx(pairwise_tau(values))
+
+
+def test_linear_slope():
+    assert linear_slope([1.0, 3.0, 5.0, 7.0]) == pytest.approx(2.0)
+    assert linear_slope([4.0, 4.0, 4.0]) == 0.0
+    assert linear_slope([10.0, 8.0, 9.0, 7.0]) == pytest.approx(-0.8)
+    assert linear_slope([5.0]) == 0.0
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Traffic Capture and Time-scaled Replay of Client Sessions
+Records real app sessions through a local proxy and replays them concurrently at 1×, 10× or 100× speed
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from load_test import BASE_URL, LoadTester
+
+# Configuration
+UPSTREAM_URL = "http://localhost:3001"
+PROXY_PORT = 3002
+DEFAULT_RECORDING = "traffic_recording.jsonl"
+RECORDING_FORMAT = "tiktok-clone-traffic"
+RECORDING_VERSION = 1
+MAX_REPLAY_SESSIONS = 500
+SENSITIVE_KEYS = {"password", "token", "email", "authorization", "jwt", "secret"}
+REDACTED = "<redacted>"
+# RFC 7230 §6.1 hop-by-hop headers, never forwarded by a proxy
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+    "transfer-encoding", "upgrade"
+}
+# End-to-end headers the proxy also drops: requests sets Host and Content-Length for the upstream call
+# and decodes gzip bodies, so the relayed body no longer matches the original framing or encoding
+STRIPPED_HEADERS = HOP_BY_HOP_HEADERS | {"content-encoding", "content-length", "host"}
+# UUIDs, Mongo ObjectIds and numeric IDs in URL paths
+ID_SEGMENT = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{24}|\d+)$", re.I)
+# Created IDs anywhere in a path, query or body value
+ID_TOKEN = re.compile(r"\b([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{24})\b", re.I)
+# Parameterised routes whose values are not ID-shaped; one route per value would overflow the route table
+ROUTE_TEMPLATES = [
+    (re.compile(r"^/users/profile/[^/]+$"), "/users/profile/:username"),
+    (re.compile(r"^/uploads/"), "/uploads/*")
+]
+
+
+def read_body(handler):
+    """Read a request body sent with Content-Length or chunked transfer encoding"""
+    if handler.headers.get("Transfer-Encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int(handler.rfile.readline().split(b";")[0].strip(), 16)
+            if size == 0:
+                handler.rfile.readline()
+                return body
+            body += handler.rfile.read(size)
+            handler.rfile.readline()
+    length = int(handler.headers.get("Content-Length") or 0)
+    return handler.rfile.read(length) if length else b""
+
+
+def route_template(method, path):
+    """Collapse ID and known parameter segments so requests aggregate per route, e.g. GET /stories/:id/viewers"""
+    if path.startswith("/api/"):
+        path = path[len("/api"):]
+    for pattern, template in ROUTE_TEMPLATES:
+        if pattern.match(path):
+            return f"{method} {template}"
+    segments = [":id" if ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def redact(value):
+    """Replace sensitive fields anywhere in a decoded body"""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SENSITIVE_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def body_shape(content_type, body):
+    """Describe a request body without keeping sensitive values or file contents"""
+    if not body:
+        return None
+    if "application/json" in content_type:
+        try:
+            return {"json": redact(json.loads(body))}
+        except ValueError:
+            return {"raw_size": len(body)}
+    if "application/x-www-form-urlencoded" in content_type:
+        return {"form": redact(dict(parse_qsl(body.decode("utf-8", "replace"))))}
+    if "multipart/form-data" in content_type:
+        message = BytesParser(policy=policy.default).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        fields, files = {}, []
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            filename = part.get_filename()
+            payload = part.get_payload(decode=True) or b""
+            if filename:
+                files.append({"name": name, "filename": filename,
+                              "content_type": part.get_content_type(), "size": len(payload)})
+            else:
+                fields[name] = payload.decode("utf-8", "replace")
+        return {"multipart": {"fields": redact(fields), "files": files}}
+    return {"raw_size": len(body)}
+
+
+def created_id(body):
+    """ID of the entity a response created, so replay can remap later references to it"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    for key in ("data", "video", "comment", "story", "message"):
+        entity = data.get(key)
+        if isinstance(entity, dict) and entity.get("id"):
+            return str(entity["id"])
+    return None
+
+
+class TrafficRecorder:
+    def __init__(self, upstream=UPSTREAM_URL, output=DEFAULT_RECORDING):
+        self.upstream = upstream.rstrip("/")
+        self.output = open(output, "a")
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.t0 = time.perf_counter()
+        self.sessions = {}
+        self.write({"format": RECORDING_FORMAT, "version": RECORDING_VERSION,
+                    "started_at": datetime.now().isoformat(), "upstream": self.upstream})
+
+    def write(self, entry):
+        """Append one JSON line to the recording"""
+        with self.lock:
+            self.output.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.output.flush()
+
+    def session_for(self, headers, client):
+        """Sessions are keyed by bearer token hash, or by client address before login"""
+        auth = headers.get("Authorization", "")
+        key = hashlib.sha256(auth.encode()).hexdigest()[:16] if auth else f"anon-{client[0]}"
+        with self.lock:
+            session = self.sessions.setdefault(key, {"id": f"s{len(self.sessions) + 1}", "seq": 0})
+            session["seq"] += 1
+            return session["id"], session["seq"]
+
+    def forward(self, handler):
+        """Forward one request upstream, relay the response and record it"""
+        body = read_body(handler)
+        headers = {k: v for k, v in handler.headers.items() if k.lower() not in STRIPPED_HEADERS}
+        session_id, seq = self.session_for(handler.headers, handler.client_address)
+
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = self.local.session.request(handler.command, f"{self.upstream}{handler.path}",
+                                                  headers=headers, data=body, allow_redirects=False)
+        except requests.RequestException as e:
+            handler.send_error(502, str(e))
+            return
+        latency = time.perf_counter() - start
+
+        try:
+            handler.send_response(response.status_code)
+            for k, v in response.headers.items():
+                if k.lower() not in STRIPPED_HEADERS:
+                    handler.send_header(k, v)
+            handler.send_header("Content-Length", str(len(response.content)))
+            handler.end_headers()
+            handler.wfile.write(response.content)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up; the upstream exchange still happened, so it is still recorded
+            handler.close_connection = True
+
+        url = urlsplit(handler.path)
+        self.write({
+            "session": session_id,
+            "seq": seq,
+            "t": round(start - self.t0, 6),
+            "method": handler.command,
+            "path": url.path,
+            "query": url.query,
+            "content_type": handler.headers.get("Content-Type", ""),
+            "authenticated": bool(handler.headers.get("Authorization")),
+            "body": body_shape(handler.headers.get("Content-Type", ""), body),
+            "status": response.status_code,
+            "latency_ms": round(latency * 1000, 3),
+            "response_bytes": len(response.content),
+            "created_id": created_id(response.content) if handler.command == "POST" else None
+        })
+
+    def serve(self, port=PROXY_PORT):
+        """Run the recording proxy until interrupted"""
+        recorder = self
+
+        class ProxyHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                recorder.forward(self)
+
+            do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = do_HEAD = do_GET
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), ProxyHandler)
+        print(f"🎙️ Recording proxy on :{port} → {self.upstream} (point AppConstants.baseUrl at http://<host>:{port}/api)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n💾 Recorded {sum(s['seq'] for s in self.sessions.values())} requests "
+                  f"in {len(self.sessions)} sessions")
+        finally:
+            server.server_close()
+            self.output.close()
+
+
+def load_recording(path):
+    """Group recorded requests into per-session, ordered lists"""
+    sessions = {}
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            if "format" in entry:
+                if entry["format"] != RECORDING_FORMAT or entry["version"] > RECORDING_VERSION:
+                    raise ValueError(f"Unsupported recording format in {path}")
+                continue
+            sessions.setdefault(entry["session"], []).append(entry)
+    for requests_ in sessions.values():
+        requests_.sort(key=lambda e: e["seq"])
+    return sessions
+
+
+class TrafficReplayer:
+    def __init__(self, tester, sessions, speed=1.0):
+        self.tester = tester
+        self.sessions = sessions
+        self.speed = speed
+        self.id_map = {}
+        self.lock = threading.Lock()
+        self.skipped = 0
+
+    def remap(self, value):
+        """Substitute IDs created during recording with the IDs created during replay, value by value"""
+        if isinstance(value, str):
+            return ID_TOKEN.sub(lambda m: self.id_map.get(m.group(0), m.group(0)), value)
+        if isinstance(value, dict):
+            return {k: self.remap(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.remap(v) for v in value]
+        return value
+
+    def build_kwargs(self, entry):
+        """Rebuild request arguments from a recorded body shape"""
+        body = self.remap(entry["body"]) if entry["body"] else None
+        kwargs = {}
+        if entry["query"]:
+            kwargs["params"] = parse_qsl(self.remap(entry["query"]))
+        if not body:
+            return kwargs
+        if "json" in body:
+            kwargs["json"] = body["json"]
+        elif "form" in body:
+            kwargs["data"] = body["form"]
+        elif "multipart" in body:
+            kwargs["data"] = body["multipart"]["fields"]
+            kwargs["files"] = [(f["name"], (f["filename"], b"\0" * f["size"], f["content_type"]))
+                               for f in body["multipart"]["files"]]
+        else:
+            kwargs["data"] = b"\0" * body["raw_size"]
+        return kwargs
+
+    def replay_session(self, start, entries, user):
+        """Re-issue one session in order, preserving scaled inter-request think times"""
+        self.tester.tag("replay", user["data"]["username"])
+        for entry in entries:
+            # Sessions log in with harness users instead of replaying redacted credentials
+            if entry["path"].startswith("/api/auth/"):
+                with self.lock:
+                    self.skipped += 1
+                continue
+            delay = start + entry["t"] / self.speed - self.tester.clock()
+            if delay > 0:
+                time.sleep(delay)
+
+            path = self.remap(entry["path"])
+            if path.startswith("/api/"):
+                path = path[len("/api"):]
+            else:
+                # Static media such as /uploads/... is served outside the API prefix
+                path = f"{self.tester.base_url.rsplit('/api', 1)[0]}{path}"
+            response = self.tester.request(entry["method"], route_template(entry["method"], entry["path"]), path,
+                                           user=user if entry["authenticated"] else None, **self.build_kwargs(entry))
+            if response is not None and entry.get("created_id"):
+                new_id = created_id(response.content)
+                if new_id:
+                    with self.lock:
+                        self.id_map[entry["created_id"]] = new_id
+
+    def run(self):
+        """Replay every session concurrently on the original timeline, scaled by speed"""
+        entries = list(self.sessions.values())
+        users = self.tester.users
+        recording_start = min(e[0]["t"] for e in entries)
+        for session in entries:
+            for entry in session:
+                entry["t"] -= recording_start
+
+        print(f"\n▶️ Replaying {len(entries)} sessions at {self.speed:g}× speed...")
+        start = self.tester.clock()
+        with ThreadPoolExecutor(max_workers=min(len(entries), MAX_REPLAY_SESSIONS)) as pool:
+            futures = [pool.submit(self.replay_session, start, session, users[i % len(users)])
+                       for i, session in enumerate(entries)]
+        failed = [f.exception() for f in futures if f.exception()]
+        if failed:
+            print(f"   ⚠️ {len(failed)} sessions aborted, first error: {failed[0]}")
+        print(f"   Skipped {self.skipped} auth requests (replaced by harness logins)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay real client sessions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="run a recording proxy in front of the backend")
+    record.add_argument("--upstream", default=UPSTREAM_URL)
+    record.add_argument("--port", type=int, default=PROXY_PORT)
+    record.add_argument("--output", default=DEFAULT_RECORDING)
+
+    replay = subparsers.add_parser("replay", help="replay a recording against the backend")
+    replay.add_argument("--recording", default=DEFAULT_RECORDING)
+    replay.add_argument("--speed", type=float, default=1.0, help="time scale, e.g. 10 for 10× speed")
+    replay.add_argument("--users", type=int, help="harness users to log in (default: one per session)")
+    replay.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        TrafficRecorder(args.upstream, args.output).serve(args.port)
+        return
+
+    sessions = load_recording(args.recording)
+    if not sessions:
+        print(f"❌ No sessions in {args.recording}")
+        return
+
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting Traffic Replay")
+    print("=" * 70)
+    print("\n📋 Setting up virtual users...")
+    if not tester.setup_users(args.users or min(len(sessions), MAX_REPLAY_SESSIONS)):
+        print("❌ No virtual users available, aborting replay")
+        return
+
+    tester.reset_records()
+    TrafficReplayer(tester, sessions, args.speed).run()
+    tester.print_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+TTL Expiry Sweep Impact Benchmark
+Gives large story and message cohorts clustered expiry times and measures feed latency while MongoDB's TTL monitor deletes them
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from load_test import BASE_URL, LoadTester
+from resource_sampler import ResourceSampler
+from teardown import mongodb_uri
+
+# Configuration
+DEFAULT_PAIRS = 10
+DEFAULT_STORIES = 100
+DEFAULT_MESSAGES = 100
+DEFAULT_CONCURRENCY = 16
+DEFAULT_LEAD = 20.0
+DEFAULT_SPREAD = 5.0
+DEFAULT_OBSERVE = 150.0
+WINDOW = 2.0
+PROBE_SAMPLE = 5
+PROBE_INTERVAL = 1.0
+SAMPLE_INTERVAL = 0.5
+TTL_MONITOR_INTERVAL = 60.0  # mongod ttlMonitorSleepSecs default
+SWEEP_MARGIN = 30.0
+VISIBILITY_BOUND = 2.0
+DISTURBANCE_LIMIT = 2.0
+
+STORIES_ROUTE = "GET /stories/following-stories"
+CONVERSATIONS_ROUTE = "GET /messages/conversations"
+FOREGROUND_ROUTES = [STORIES_ROUTE, CONVERSATIONS_ROUTE]
+PROBE_ROUTE = "GET /stories/:storyId/viewers"
+
+# Neither create route accepts expiresAt, so the cohort's expiry is pulled in directly once both TTL indexes exist
+EXPIRY_SCRIPT = """
+const names = ["stories", "messages"];
+const missing = names.filter(name => !db.getCollection(name).getIndexes().some(
+  index => index.key.expiresAt === 1 && index.expireAfterSeconds !== undefined));
+if (missing.length) {
+  print("missing " + missing.join(","));
+  quit();
+}
+const at = new Date(%(at_ms)d);
+for (const name of names) {
+  const result = db.getCollection(name).updateMany(
+    { text: %(marker)r },
+    [{ $set: { expiresAt: { $add: [at, { $floor: { $multiply: [{ $rand: {} }, %(spread_ms)d] } }] } } }]
+  );
+  print(name + " " + result.modifiedCount);
+}
+"""
+
+
+def parse_time(value):
+    """Epoch seconds from an ISO timestamp as the API serializes dates"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class TtlExpiryTester:
+    def __init__(self, tester, concurrency=DEFAULT_CONCURRENCY):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.marker = f"ttl-cohort {tester.run_id}"
+        # Offset from the tester's clock to wall time, which is what expiresAt is compared against
+        self.wall_offset = time.time() - tester.clock()
+        self.lock = threading.Lock()
+        self.pairs = []
+        self.stories = {}
+        self.messages = set()
+        self.expires = None
+        self.story_seen = {}
+        self.conversations_seen = {}
+        self.probe_alive = set()
+        self.probe_deleted = {}
+        self.result = None
+
+    def setup(self, pair_count, stories_per_user, messages_per_pair):
+        """Each creator posts a story cohort and messages its viewer, who follows it"""
+        users = self.tester.setup_users(2 * pair_count, self.concurrency)
+        self.pairs = [(users[i], users[i + 1]) for i in range(0, len(users) - 1, 2)]
+        for creator, viewer in self.pairs:
+            self.tester.request("POST", "POST /users/follow/:userId", f"/users/follow/{self.tester.object_id(creator)}",
+                                user=viewer)
+
+        def create(task):
+            kind, creator, viewer = task
+            if kind == "stories":
+                response = self.tester.request("POST", "POST /stories/create", "/stories/create", user=creator,
+                                               json={"content": "text", "text": self.marker, "textColor": "#FFFFFF",
+                                                     "backgroundColor": "#4ECDC4", "privacy": "public"})
+            else:
+                response = self.tester.request("POST", "POST /messages/send", "/messages/send", user=creator,
+                                               json={"recipientId": self.tester.object_id(viewer), "text": self.marker})
+            if response is None or response.status_code != 201:
+                return kind, None, creator
+            return kind, response.json().get("data", {}).get("id"), creator
+
+        tasks = ([("stories", c, v) for c, v in self.pairs for _ in range(stories_per_user)]
+                 + [("messages", c, v) for c, v in self.pairs for _ in range(messages_per_pair)])
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for kind, entity_id, creator in pool.map(create, tasks):
+                if entity_id and kind == "stories":
+                    self.stories[entity_id] = creator
+                elif entity_id:
+                    self.messages.add(entity_id)
+        self.tester.log_result("TTL Expiry - Setup", len(self.stories) + len(self.messages) == len(tasks),
+                               f"{len(self.stories)} stories and {len(self.messages)} messages in "
+                               f"{len(self.pairs)} creator/viewer pairs")
+        return self.stories or self.messages
+
+    def set_expiry(self, uri, lead, spread):
+        """Move the whole cohort's expiresAt into [now + lead, now + lead + spread]; False if mongosh failed"""
+        at = time.time() + lead
+        script = EXPIRY_SCRIPT % {"at_ms": int(at * 1000), "marker": self.marker, "spread_ms": int(spread * 1000)}
+        with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False) as f:
+            f.write(script)
+        try:
+            output = subprocess.run(["mongosh", uri, "--quiet", f.name], capture_output=True, text=True,
+                                    check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Could not set cohort expiry with mongosh: {getattr(e, 'stderr', None) or e}")
+            return False
+        finally:
+            os.unlink(f.name)
+        updated = dict(line.split() for line in output.splitlines() if len(line.split()) == 2)
+        if "missing" in updated:
+            # Story.js declares { expiresAt: 1 } twice with different options, so its TTL index may never have been built
+            print(f"❌ No expireAfterSeconds index on expiresAt in: {updated['missing']}; nothing would be swept")
+            return False
+        self.expires = (at - self.wall_offset, at + spread - self.wall_offset)
+        print(f"   {updated.get('stories', 0)} stories and {updated.get('messages', 0)} messages expire "
+              f"{lead:.0f}-{lead + spread:.0f}s from now")
+        return True
+
+    def read(self, viewer, deadline):
+        """Load the stories tray and inbox back-to-back, noting which cohort entities each response still shows"""
+        creator_ids = {self.tester.object_id(c) for c, _ in self.pairs}
+        while self.tester.clock() < deadline:
+            # The server filters on its clock after the request is sent, so sightings are timed from the send
+            sent = self.tester.clock()
+            response = self.tester.request("GET", STORIES_ROUTE, "/stories/following-stories", user=viewer)
+            if response is not None and response.status_code == 200:
+                for group in response.json().get("storiesGroups") or []:
+                    for story in group.get("stories") or []:
+                        if story.get("id") in self.stories and story.get("expiresAt"):
+                            with self.lock:
+                                self.story_seen[story["id"]] = (sent, parse_time(story["expiresAt"]) - self.wall_offset)
+
+            response = self.tester.request("GET", CONVERSATIONS_ROUTE, "/messages/conversations", user=viewer)
+            now = self.tester.clock()
+            if response is not None and response.status_code == 200:
+                for conversation in response.json().get("conversations") or []:
+                    peer = (conversation.get("user") or {}).get("_id")
+                    last = (conversation.get("lastMessage") or {}).get("id")
+                    if peer in creator_ids and last in self.messages:
+                        with self.lock:
+                            self.conversations_seen[(self.tester.object_id(viewer), peer)] = now
+
+    def probe(self, deadline):
+        """Poll GET /stories/:id/viewers for a sample of cohort stories; a 403 → 404 transition marks the TTL delete
+
+        The route looks the story up without the expiresAt filter. Its creator check compares the String creator
+        with the ObjectId user id, so a live story answers 403 and a deleted one 404.
+        """
+        sample = list(self.stories.items())[:PROBE_SAMPLE]
+        while self.tester.clock() < deadline and len(self.probe_deleted) < len(sample):
+            for story_id, creator in sample:
+                if story_id in self.probe_deleted:
+                    continue
+                response = self.tester.request("GET", PROBE_ROUTE, f"/stories/{story_id}/viewers", user=creator)
+                if response is None:
+                    continue
+                if response.status_code in (200, 403):
+                    self.probe_alive.add(story_id)
+                elif response.status_code == 404 and story_id in self.probe_alive:
+                    self.probe_deleted[story_id] = self.tester.clock()
+            time.sleep(PROBE_INTERVAL)
+
+    def server_cpu(self, start, end):
+        """Mean server CPU % between two points on the tester's timeline, or None without sampling"""
+        sampler = self.tester.sampler
+        window = [s["cpu"] for s in (sampler.samples if sampler else []) if start < s["t"] <= end]
+        return sum(window) / len(window) if window else None
+
+    def observe(self, duration):
+        """Keep foreground reads and deletion probes running through expiry and the TTL sweep"""
+        start = self.tester.clock()
+        deadline = self.expires[1] + duration
+        viewers = [viewer for _, viewer in self.pairs]
+        print(f"\n👀 {self.concurrency} readers on {', '.join(FOREGROUND_ROUTES)} for {deadline - start:.0f}s...")
+        probe = threading.Thread(target=self.probe, args=(deadline,))
+        probe.start()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(lambda i: self.read(viewers[i % len(viewers)], deadline), range(self.concurrency)))
+        probe.join()
+        return self.analyze(start, deadline)
+
+    def analyze(self, start, end):
+        """Compare foreground latency before expiry with latency while the sweep deletes the cohort"""
+        expire_from = self.expires[0]
+        # A conversation stays listed until every cohort message in it is deleted; its last sighting bounds the sweep
+        gone = [t for t in self.conversations_seen.values() if t < end - WINDOW]
+        deletions = sorted(t for t in [*gone, *self.probe_deleted.values()] if t >= expire_from)
+        sweep = (deletions[0], deletions[-1]) if deletions else None
+
+        records = self.tester.records.select(since=start, until=end)
+        routes = {}
+        for route in FOREGROUND_ROUTES:
+            route_records = records.select(route=route)
+            before = route_records.select(until=expire_from).summary()
+            during = route_records.select(since=sweep[0] - WINDOW, until=sweep[1] + WINDOW).summary() if sweep else None
+            routes[route] = {
+                "before": before,
+                "during": during,
+                "ratio": during["p99_ms"] / before["p99_ms"] if during and before["p99_ms"] else None
+            }
+        # Windows share one origin so both routes line up in the timeline
+        windows = []
+        t = start
+        while t < end:
+            windows.append((t, {route: records.select(route=route, since=t, until=t + WINDOW).summary()
+                                for route in FOREGROUND_ROUTES}))
+            t += WINDOW
+
+        lags = [seen - expires for seen, expires in self.story_seen.values() if seen > expires]
+        self.result = {
+            "routes": routes,
+            "windows": windows,
+            "sweep": sweep,
+            "cpu_before": self.server_cpu(start, expire_from),
+            "cpu_during": self.server_cpu(sweep[0] - WINDOW, sweep[1] + WINDOW) if sweep else None,
+            "stories_seen": len(self.story_seen),
+            "conversations_seen": len(self.conversations_seen),
+            "visible_after_expiry": len(lags),
+            "max_visibility_lag": max(lags, default=0.0),
+            "still_visible": sum(1 for seen, _ in self.story_seen.values() if seen > end - WINDOW)
+        }
+        return self.result
+
+    def print_summary(self):
+        """Print the latency timeline around expiry and the visibility and sweep checks"""
+        r = self.result
+        expire_from, expire_to = self.expires
+        print("\n" + "=" * 70)
+        print("📊 TTL EXPIRY SUMMARY")
+        print("=" * 70)
+        print(f"{'t (s)':>7} {'Stories p99':>12} {'Inbox p99':>10} {'Req':>6}  Phase")
+        for start, stats in r["windows"]:
+            phase = ("expiry" if expire_from - WINDOW < start <= expire_to else
+                     "sweep" if r["sweep"] and r["sweep"][0] - WINDOW < start <= r["sweep"][1] else "")
+            stories, inbox = (stats[route] for route in FOREGROUND_ROUTES)
+            print(f"{start - expire_from:>7.0f} {stories['p99_ms']:>12.1f} {inbox['p99_ms']:>10.1f} "
+                  f"{stories['count'] + inbox['count']:>6}  {phase}")
+        print("t is relative to the first cohort expiry.")
+
+        if r["sweep"]:
+            print(f"\nTTL sweep observed {r['sweep'][0] - expire_to:.0f}-{r['sweep'][1] - expire_to:.0f}s after the last "
+                  f"expiry" + (f", server CPU {r['cpu_before']:.0f}% before vs {r['cpu_during']:.0f}% during"
+                               if r["cpu_before"] is not None and r["cpu_during"] is not None else ""))
+        for route, data in r["routes"].items():
+            before, during = data["before"], data["during"]
+            if during is None or not during["count"]:
+                self.tester.log_result(f"TTL Expiry - {route}", False, "no requests overlapped an observed TTL sweep")
+                continue
+            self.tester.log_result(f"TTL Expiry - {route}", data["ratio"] is not None and data["ratio"] <= DISTURBANCE_LIMIT,
+                                   f"p99 {before['p99_ms']:.1f} ms before expiry, {during['p99_ms']:.1f} ms during the "
+                                   f"sweep (×{data['ratio'] or 0:.1f}), {during['errors']} errors")
+
+        # Feed queries filter on expiresAt, so stories should vanish at expiry rather than when the TTL monitor runs
+        if not r["stories_seen"]:
+            self.tester.log_result("TTL Expiry - Story Visibility", False,
+                                   "inconclusive: no cohort story ever appeared in /stories/following-stories")
+        else:
+            self.tester.log_result("TTL Expiry - Story Visibility",
+                                   r["max_visibility_lag"] <= VISIBILITY_BOUND and not r["still_visible"],
+                                   f"{r['visible_after_expiry']}/{r['stories_seen']} stories seen after their expiry, "
+                                   f"at most {r['max_visibility_lag']:.1f}s late (bound {VISIBILITY_BOUND:.0f}s), "
+                                   f"{r['still_visible']} still visible at the end")
+        if not r["conversations_seen"]:
+            self.tester.log_result("TTL Expiry - Message Sweep", False,
+                                   "inconclusive: no cohort conversation ever appeared in /messages/conversations")
+        bound = TTL_MONITOR_INTERVAL + SWEEP_MARGIN
+        self.tester.log_result("TTL Expiry - Sweep", bool(r["sweep"]) and r["sweep"][1] - expire_to <= bound,
+                               f"cohort deleted {r['sweep'][1] - expire_to:.0f}s after the last expiry (bound {bound:.0f}s)"
+                               if r["sweep"] else "no TTL deletion observed before the run ended")
+        print("\n🎯 TTL EXPIRY BENCHMARK COMPLETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure feed latency while MongoDB's TTL monitor deletes an expiring cohort")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS, help="creator/viewer pairs")
+    parser.add_argument("--stories", type=int, default=DEFAULT_STORIES, help="cohort stories per creator")
+    parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="cohort messages per pair")
+    parser.add_argument("--lead", type=float, default=DEFAULT_LEAD, help="seconds of foreground traffic before expiry")
+    parser.add_argument("--spread", type=float, default=DEFAULT_SPREAD, help="seconds the cohort's expiry times span")
+    parser.add_argument("--observe", type=float, default=DEFAULT_OBSERVE,
+                        help="seconds to keep observing after the last expiry (the TTL monitor runs every 60s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--mongodb-uri", default=mongodb_uri(), help="default: MONGODB_URI or node_backend/.env")
+    parser.add_argument("--server-pid", type=int, help="Node server PID (default: process listening on the API port)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    if not args.mongodb_uri:
+        print("❌ No MongoDB URI; pass --mongodb-uri or set MONGODB_URI")
+        return
+    tester = LoadTester(args.base_url)
+    print("🚀 Starting TTL Expiry Benchmark")
+    print("=" * 70)
+
+    benchmark = TtlExpiryTester(tester, args.concurrency)
+    print("\n📋 Creating the expiring cohort...")
+    if not benchmark.setup(args.pairs, args.stories, args.messages):
+        print("❌ No cohort created, aborting TTL expiry benchmark")
+        return
+    if not benchmark.set_expiry(args.mongodb_uri, args.lead, args.spread):
+        return
+
+    tester.sampler = ResourceSampler(tester.clock, args.base_url, pid=args.server_pid, interval=SAMPLE_INTERVAL)
+    tester.sampler.start()
+    try:
+        benchmark.observe(args.observe)
+    finally:
+        tester.sampler.stop()
+    benchmark.print_summary()
+
+
+if __name__ == "__main__":
+    main()